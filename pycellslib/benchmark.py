@@ -0,0 +1,140 @@
+"""
+Este modulo mide el tiempo por generacion de los motores de actualizacion,
+se ejecuta con
+
+    python -m pycellslib.benchmark --size 2000 --generations 20 --workers 1 2 4
+
+y reporta el tiempo del motor que escoge el automata (en un solo hilo), del
+motor con hilos y del motor paralelo con cada numero de hilos y procesos,
+junto con la aceleracion. La aceleracion del motor con hilos es respecto al
+motor en un solo hilo, y la del motor paralelo es respecto al motor paralelo
+con un solo proceso, ya que los procesos calculan sus bloques por regiones y
+no con el mismo camino que el motor serial
+"""
+
+import argparse
+import functools
+import time
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from pycellslib.cells import LifeLikeCell
+from pycellslib.core import Automaton
+from pycellslib.core.parallel import ParallelEngine, ThreadedEngine
+from pycellslib.twodimensional.rules import BSNotationRule
+from pycellslib.twodimensional.topologies import FinitePlaneTopology
+
+
+def measure(
+    rule: BSNotationRule,
+    size: int,
+    generations: int,
+    engine: Optional[Callable] = None,
+    threads: int = 1,
+    seed: int = 0,
+) -> float:
+    """
+    Esta funcion mide el tiempo por generacion de un automata con una
+    configuracion inicial aleatoria
+
+    Parameters
+    ----------
+    rule(BSNotationRule): regla de transicion del automata
+    size(int): alto y ancho del plano
+    generations(int): numero de generaciones que se miden
+    engine(callable|None): motor del automata (ver Automaton)
+    threads(int): numero de hilos del automata (ver Automaton)
+    seed(int): semilla de la configuracion inicial
+
+    Returns
+    -------
+    out(float): tiempo por generacion en segundos
+    """
+    topology = FinitePlaneTopology(0, size, size, rule.radius, rule.radius)
+    topology.set_values_from_configuration(
+        np.random.default_rng(seed).integers(0, 2, (size, size))
+    )
+    automaton = Automaton(
+        LifeLikeCell(), rule, topology, engine=engine, threads=threads
+    )
+
+    try:
+        # la primera generacion no se mide
+        automaton.next_step()
+
+        start = time.perf_counter()
+        automaton.run(generations)
+        automaton.synchronize()
+        elapsed = time.perf_counter() - start
+    finally:
+        if isinstance(automaton.engine, (ParallelEngine, ThreadedEngine)):
+            automaton.engine.close()
+
+    return elapsed / generations
+
+
+def main(arguments: Optional[List[str]] = None) -> None:
+    """
+    Esta funcion lee los argumentos de la linea de comandos y muestra los
+    tiempos por generacion
+
+    Parameters
+    ----------
+    arguments(list(str)|None): argumentos, por defecto los de sys.argv
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size", type=int, default=1000, help="lado del plano")
+    parser.add_argument(
+        "--generations", type=int, default=20, help="generaciones medidas"
+    )
+    parser.add_argument("-B", type=int, nargs="*", default=[3], help="lista B")
+    parser.add_argument("-S", type=int, nargs="*", default=[2, 3], help="lista S")
+    parser.add_argument("--radius", type=int, default=1, help="radio de la vecindad")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="*",
+        default=[1, 2, 4],
+        help="numeros de procesos del motor paralelo",
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        nargs="*",
+        default=[2, 4],
+        help="numeros de hilos del motor con hilos",
+    )
+    arguments = parser.parse_args(arguments)
+
+    rule = BSNotationRule(arguments.B, arguments.S, arguments.radius)
+
+    reference = measure(rule, arguments.size, arguments.generations)
+    print(f"{'motor':<20}{'s/generacion':>15}{'aceleracion':>15}")
+    print(f"{'serial':<20}{reference:>15.6f}{1.0:>15.2f}")
+
+    for threads in arguments.threads:
+        elapsed = measure(rule, arguments.size, arguments.generations, threads=threads)
+        name = f"hilos ({threads})"
+        print(f"{name:<20}{elapsed:>15.6f}{reference / elapsed:>15.2f}")
+
+    # el motor paralelo se compara con el mismo motor en un solo proceso, que
+    # siempre se mide aunque no se pida
+    workers_numbers = sorted({1, *arguments.workers})
+    times = {
+        workers: measure(
+            rule,
+            arguments.size,
+            arguments.generations,
+            functools.partial(ParallelEngine, workers=workers),
+        )
+        for workers in workers_numbers
+    }
+
+    for workers in workers_numbers:
+        name = f"paralelo ({workers})"
+        print(f"{name:<20}{times[workers]:>15.6f}{times[1] / times[workers]:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,7 @@ En este modulo se implementan las celulas mas comunes (celula del juego de la
 vida, ...) usadas en automatas celulares
 """
 
-from typing import Iterable, List, Optional, Union
+from typing import Iterable, List, Optional, Tuple, Union
 
 import numpy as np
 import numpy.typing as npt
@@ -144,3 +144,92 @@ class LifeLikeCell(StandardCell):
 
     def __init__(self) -> None:
         super().__init__([0, 1], name_of_states=["Dead", "Alive"])
+
+
+class AttributesCell(StandardCell):
+    """
+    Esta clase representa una celula con atributos con nombre, cada atributo
+    tiene su propio tipo (entero o real), y en las topologias finitas se
+    almacena en un arreglo contiguo de ese tipo (ver FiniteNGridTopology)
+
+    Parameters
+    ----------
+    attributes(list(tuple(str, dtype))): nombre y tipo de cada atributo, por
+        ejemplo [("energia", np.float32), ("edad", np.uint8)]
+    start(int|list(int)|tuple(int)|ndarray(int)): posibles estados (ver
+        StandardCell)
+    end(int|None): ver StandardCell
+    step(int|None): ver StandardCell
+    default_state(int|None): valor por defecto que se usa para los estados
+    name_of_states(list(str)|tuple(str)|None): nombre de cada estado
+    default_value_of_attributes(list|None): valor por defecto de cada
+        atributo, si es None los atributos valen 0 por defecto
+    """
+
+    def __init__(
+        self,
+        attributes: Iterable[Tuple[str, npt.DTypeLike]],
+        start: Union[int, Iterable[int], npt.NDArray[np.int]] = 2,
+        end: Optional[int] = None,
+        step: Optional[int] = None,
+        default_state: Optional[int] = None,
+        name_of_states: List[str] = None,
+        default_value_of_attributes: Optional[List[float]] = None,
+    ) -> None:
+        super().__init__(start, end, step, default_state, name_of_states)
+
+        self.attributes = [(name, np.dtype(dtype)) for name, dtype in attributes]
+        if default_value_of_attributes is None:
+            default_value_of_attributes = [0] * len(self.attributes)
+        self.default_value_of_attributes = default_value_of_attributes
+
+    def get_number_of_attributes(self) -> int:
+        """
+        Este metodo retorna el numero de atributos que tiene una celula
+
+        Returns
+        -------
+        out(int): numero de atributos de una celula
+        """
+        return len(self.attributes)
+
+    def get_default_value_of_attributes(self) -> List[float]:
+        """
+        Este metodo retorna los valores que tiene una celula por defecto en
+        cada atributo
+
+        Returns
+        -------
+        out(list): valores por defecto de los atributos de la celula
+        """
+        return self.default_value_of_attributes
+
+    def get_name_of_attributes(self, index: int) -> str:
+        """
+        Este metodo retorna el nombre del atributo asociado a un indice, el
+        indice cuenta desde cero
+
+        Parameters
+        ----------
+        index(int): indice que corresponde al atributo
+
+        Returns
+        -------
+        out(str): nombre del atributo
+        """
+        return self.attributes[index][0]
+
+    def get_dtype_of_attributes(self, index: int) -> np.dtype:
+        """
+        Este metodo retorna el tipo del atributo asociado a un indice, el
+        indice cuenta desde cero
+
+        Parameters
+        ----------
+        index(int): indice que corresponde al atributo
+
+        Returns
+        -------
+        out(dtype): tipo del atributo
+        """
+        return self.attributes[index][1]
@@ -11,7 +11,12 @@ entre si (con el objeto Automata)
 from pycellslib.core.automaton import Automaton
 from pycellslib.core.cell_information import CellInformation
 from pycellslib.core.rule import Rule
-from pycellslib.core.topology import Topology, FiniteNGridTopology
+from pycellslib.core.topology import (
+    Topology,
+    FiniteNGridTopology,
+    SparseTopology,
+    UnboundedNGridTopology,
+)
 from pycellslib.core.neighborhood import Neighborhood
 
 __all__ = [
@@ -20,5 +25,7 @@ __all__ = [
     "Rule",
     "Topology",
     "FiniteNGridTopology",
-    "Neighborhood"
+    "SparseTopology",
+    "UnboundedNGridTopology",
+    "Neighborhood",
 ]
@@ -1,6 +1,15 @@
+import itertools
+from typing import List, Optional, Union
+
+import numpy as np
+import numpy.typing as npt
+
 from pycellslib.core.cell_information import CellInformation
+from pycellslib.core.engine import select_engine
+from pycellslib.core.parallel import ThreadedEngine, get_threads
 from pycellslib.core.rule import Rule
-from pycellslib.core.topology import Topology
+from pycellslib.core.topology import FiniteNGridTopology, Topology
+from pycellslib.errors import InvalidParameterError
 
 
 class Automaton:
@@ -9,6 +18,36 @@ class Automaton:
     se encarga de coordinar las clases Cells, Topology y Rules, y ofrece
     metodos para la extraccion de informacion (densidades o de estados o de
     atributos, flujos, ...) del automata
+
+    Parameters
+    ----------
+    cell_information(CellInformation): informacion de las celulas
+    rule(Rule): regla de transicion del automata
+    topology(Topology): topologia del automata
+    name(str): nombre del automata
+    engine(type|None): clase (o cualquier callable que reciba la regla y la
+        topologia) del motor usado para calcular las generaciones. Si es None
+        se escoge automaticamente: si la regla tiene un motor especializado
+        se usa ese motor, si la topologia es dispersa solo se evaluan las
+        celulas cercanas a las celulas almacenadas, si implementa
+        get_transition_function y numba esta instalado se compila la regla,
+        si implementa apply_rule_batch se evaluan bloques de celulas, si
+        es determinista (ver Rule.deterministic), tiene pocos estados y una
+        vecindad pequena se tabula (ver TableEngine), y en caso contrario se
+        evalua celula por celula
+    threads(int|None): numero de hilos usados para calcular cada generacion
+        cuando el motor se escoge automaticamente (ver ThreadedEngine). Si es
+        None se usa el numero de procesadores en espacios grandes con motores
+        vectorizados o por bloques, y un solo hilo en caso contrario. Los
+        motores que no se pueden usar en varios hilos (ver is_threadable)
+        usan un solo hilo aunque se pidan varios
+
+    Si la topologia es FiniteNGridTopology y no se especifico el tipo de sus
+    estados, los estados se almacenan en el menor tipo entero que contiene
+    los estados de las celulas (ver FiniteNGridTopology.compact_states), y
+    si no se especifico el tipo de sus atributos, cada atributo se almacena
+    en un arreglo del tipo que indican las celulas (ver
+    CellInformation.get_dtype_of_attributes)
     """
 
     def __init__(
@@ -17,6 +56,8 @@ class Automaton:
         rule: Rule,
         topology: Topology,
         name: str = "",
+        engine=None,
+        threads: Optional[int] = None,
     ) -> None:
         self.cell_information = cell_information
         self.rule = rule
@@ -27,6 +68,40 @@ class Automaton:
         self.mask = neighborhood.get_mask()
         self.offset = neighborhood.get_offset()
 
+        # los estados se almacenan en el menor tipo entero que contiene los
+        # estados de las celulas, antes de que el motor use los buffers
+        if isinstance(self.topology, FiniteNGridTopology):
+            self.topology.compact_states(self.cell_information.get_states())
+
+            number = self.cell_information.get_number_of_attributes()
+            if number != 0:
+                self.topology.set_attributes_fields(
+                    [
+                        self.cell_information.get_name_of_attributes(index)
+                        for index in range(number)
+                    ],
+                    [
+                        self.cell_information.get_dtype_of_attributes(index)
+                        for index in range(number)
+                    ],
+                )
+
+        if engine is None:
+            self.engine = select_engine(
+                self.rule, self.topology, self.cell_information.get_states()
+            )
+
+            threads = get_threads(self.engine, threads)
+            if threads > 1:
+                self.engine = ThreadedEngine(
+                    self.rule, self.topology, threads, self.engine
+                )
+        else:
+            self.engine = engine(self.rule, self.topology)
+
+        # numero de generaciones calculadas
+        self.generation = 0
+
     def load_configuration(self, directory):
         """
         Este metodo debe cargar la informacion del automata desde un directorio
@@ -38,45 +113,238 @@ class Automaton:
         reinstanciacion del automata en cualquier sistema
         """
 
-    def get_density_of_state(self, state):
+    def get_density_of_state(self, state: int) -> float:
         """
         Este metodo obtiene la densidad de algun estado en todo el espacio
+
+        Parameters
+        ----------
+        state(int): valor del estado
+
+        Returns
+        -------
+        out(float): fraccion de las celulas que tienen el estado
         """
+        states = self.get_states()
+
+        return np.count_nonzero(states == state) / states.size
 
-    def get_densities_of_states(self):
+    def get_densities_of_states(self) -> List[float]:
         """
         Este metodo obtiene las densidades de todos los estados en todo el
         espacio
+
+        Returns
+        -------
+        out(list(float)): fraccion de las celulas que tienen cada estado, en
+            el orden de CellInformation.get_states
         """
+        states = self.get_states()
+        values, counts = np.unique(states, return_counts=True)
+        densities = dict(zip(values.tolist(), (counts / states.size).tolist()))
 
-    def get_average_of_attribute(self, index):
+        return [
+            densities.get(state, 0.0) for state in self.cell_information.get_states()
+        ]
+
+    def get_average_of_attribute(self, index: Union[int, str]) -> float:
         """
         Este metodo obtiene el promedio del atributo especificado (por medio
-        del indice) en todo el espacio
+        del indice o del nombre) en todo el espacio, solo se recorre el
+        arreglo de ese atributo
+
+        Parameters
+        ----------
+        index(int|str): indice o nombre del atributo
+
+        Returns
+        -------
+        out(float): promedio del atributo
         """
+        if self.topology.attributes_number == 0:
+            raise InvalidParameterError("las celulas no tienen atributos")
+
+        # el promedio se acumula en float64, de esta forma no se pierde
+        # precision con atributos de tipo float32 o enteros pequenos
+        return float(np.mean(self.get_attributes(index), dtype=np.float64))
 
-    def get_averages_of_attributes(self):
+    def get_averages_of_attributes(self) -> List[float]:
         """
         Este metodo obtiene el promedio de todos los atributos en todo el
         espacio
+
+        Returns
+        -------
+        out(list(float)): promedio de cada atributo
         """
+        return [
+            self.get_average_of_attribute(index)
+            for index in range(self.topology.attributes_number)
+        ]
 
     def next_step(self) -> None:
         """
         Este metodo itera un paso en la ejecucion del automata
         """
-        # en el paso anterior, la nueva informacion se escribio en el buffer
-        # de escritura, para usarla en el paso de actualizacion, el buffer
-        # debe ser cambiado a uno de lectura
+        self.engine.advance(1)
+        self.engine.synchronize()
+
+        self.generation += 1
+
+    def run(self, generations: int, every: int = 1, callback=None) -> None:
+        """
+        Este metodo itera varios pasos en la ejecucion del automata. El motor
+        puede mantener su estado interno entre generaciones (por ejemplo
+        buffers empaquetados), por lo que los arreglos de la topologia solo se
+        actualizan cuando se llama al callback, o a los metodos synchronize o
+        get_states. Antes de modificar la topologia directamente se debe
+        llamar al metodo synchronize
+
+        Parameters
+        ----------
+        generations(int): numero de generaciones
+        every(int): numero de generaciones entre cada llamada al callback
+        callback(callable|None): funcion que recibe el automata, se llama
+            cada every generaciones (con la topologia actualizada)
+        """
+        if every < 1:
+            raise InvalidParameterError("every debe ser un entero positivo")
+
+        if callback is None:
+            self.engine.advance(generations)
+            self.generation += generations
+            return
+
+        for _ in range(generations // every):
+            self.engine.advance(every)
+            self.generation += every
+
+            self.synchronize()
+            callback(self)
+
+        # generaciones restantes, despues de la ultima llamada al callback
+        self.engine.advance(generations % every)
+        self.generation += generations % every
+
+    def iter_generations(
+        self, generations: Optional[int] = None, every: int = 1, copy: bool = False
+    ):
+        """
+        Este metodo itera varios pasos en la ejecucion del automata y retorna
+        (de forma perezosa) los estados cada every generaciones, de esta forma
+        se pueden procesar las generaciones una a una sin guardar toda la
+        historia en memoria
+
+        Parameters
+        ----------
+        generations(int|None): numero de generaciones, si es None se itera
+            indefinidamente
+        every(int): numero de generaciones entre cada arreglo retornado
+        copy(bool): si es True se retornan copias de los estados, en caso
+            contrario se retornan vistas de solo lectura de la topologia, que
+            son validas hasta la siguiente iteracion
+
+        Returns
+        -------
+        out(generator): generador de arreglos con los estados de las
+            generaciones (sin tener en cuenta la frontera), en el tipo de dato
+            de la topologia (ver get_states)
+        """
+        if every < 1:
+            raise InvalidParameterError("every debe ser un entero positivo")
+
+        steps = (
+            itertools.count() if generations is None else range(generations // every)
+        )
+        for _ in steps:
+            self.engine.advance(every)
+            self.generation += every
+
+            states = self.get_states()
+            if copy:
+                yield states.copy()
+            else:
+                states = states.view()
+                states.flags.writeable = False
+                yield states
+
+        if generations is not None:
+            # generaciones restantes, despues del ultimo arreglo retornado
+            self.engine.advance(generations % every)
+            self.generation += generations % every
+
+    def synchronize(self) -> None:
+        """
+        Este metodo escribe en la topologia el estado interno del motor
+        """
+        self.engine.synchronize()
+
+    def get_states(self):
+        """
+        Este metodo retorna los estados de la generacion mas reciente (sin
+        tener en cuenta la frontera)
+
+        Los estados se retornan en el tipo de dato de la topologia, que para
+        FiniteNGridTopology es el entero mas pequeno que contiene todos los
+        estados de la celula (por ejemplo uint8). Las operaciones aritmeticas
+        sobre el arreglo pueden dar la vuelta, por lo que se debe convertir
+        con astype antes de operar si se necesita un rango mayor
+
+        Returns
+        -------
+        out(ndarray(int)): arreglo con los estados de las celulas
+        """
+        self.synchronize()
+
+        # la generacion mas reciente esta en el buffer de escritura
+        self.topology.flip()
+        states = self.topology.get_states()
         self.topology.flip()
 
-        for position in self.topology:
-            mask_position = tuple(
-                position[i] + self.offset[i] for i in range(len(position))
+        return states
+
+    def get_attributes(
+        self, attribute: Optional[Union[int, str]] = None
+    ) -> Optional[npt.NDArray]:
+        """
+        Este metodo retorna los atributos de la generacion mas reciente (sin
+        tener en cuenta la frontera)
+
+        Parameters
+        ----------
+        attribute(int|str|None): indice o nombre de un atributo (ver
+            CellInformation.get_name_of_attributes), si es None se retornan
+            todos los atributos
+
+        Returns
+        -------
+        out(ndarray|None): arreglo con los valores del atributo dado, o con
+            todos los atributos en la ultima dimension. None en caso de que
+            las celulas no tengan atributos
+        """
+        if isinstance(attribute, str):
+            names = [
+                self.cell_information.get_name_of_attributes(index)
+                for index in range(self.cell_information.get_number_of_attributes())
+            ]
+            if attribute not in names:
+                raise InvalidParameterError(
+                    f"las celulas no tienen el atributo {attribute!r}"
+                )
+            attribute = names.index(attribute)
+        elif attribute is not None and attribute not in range(
+            self.topology.attributes_number
+        ):
+            raise InvalidParameterError(
+                f"el indice del atributo debe estar entre 0 y "
+                f"{self.topology.attributes_number - 1}"
             )
 
-            cells, attributes = self.topology.apply_mask(mask_position, self.mask)
+        self.synchronize()
 
-            cell, attributes = self.rule.apply_rule(cells, attributes)
+        # la generacion mas reciente esta en el buffer de escritura
+        self.topology.flip()
+        attributes = self.topology.get_attributes(attribute)
+        self.topology.flip()
 
-            self.topology.update_cell(position, cell, attributes)
+        return attributes
@@ -99,3 +99,21 @@ class CellInformation(metaclass=ABCMeta):
         -------
         out(str|None): nombre del atributo, puede ser un string vacio
         """
+
+    # este metodo no es abstracto, las celulas que no lo implementan tienen
+    # atributos de tipo float
+    def get_dtype_of_attributes(self, index):
+        """
+        Este metodo retorna el tipo del atributo asociado a un indice, el
+        indice cuenta desde cero. En las topologias finitas cada atributo se
+        almacena en un arreglo contiguo de su tipo (ver FiniteNGridTopology)
+
+        Parameters
+        ----------
+        index(int): indice que corresponde al atributo
+
+        Returns
+        -------
+        out(dtype): tipo (entero o real) del atributo
+        """
+        return np.dtype(float)
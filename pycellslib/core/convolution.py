@@ -0,0 +1,643 @@
+"""
+En este modulo se implementan funciones que calculan, para todas las celulas
+de una region al mismo tiempo, la suma de los valores de sus vecindades. Estas
+sumas son la base de las reglas totalisticas (como las reglas en notacion B/S)
+y se calculan con operaciones sobre regiones desplazadas del espacio, de esta
+forma el costo no depende de llamadas por celula. Con vecindades grandes
+(reglas Larger than Life) se usan tablas de sumas acumuladas, con las que el
+costo por celula no depende del tamano de la vecindad
+
+Las vecindades con pesos (enteros o reales) se suman con correlaciones, de
+forma directa (una region desplazada por cada peso distinto de 0) con
+nucleos pequenos, y con la transformada rapida de Fourier con nucleos
+grandes (ver correlate)
+"""
+
+import functools
+import itertools
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from pycellslib.core.plan_cache import PlanCache
+
+
+def get_sum_dtype(dtype: npt.DTypeLike, terms: int) -> np.dtype:
+    """
+    Esta funcion retorna el menor tipo entero con signo (de al menos 16 bits)
+    en el que se puede acumular la suma de un numero de valores de un tipo
+    entero (o bool). Acumular en tipos pequenos reduce la memoria que se
+    recorre al contar vecinos. Las sumas con tablas de sumas acumuladas y
+    sumas diagonales pueden desbordar el tipo en los resultados intermedios,
+    pero como solo suman y restan, y el resultado cabe en el tipo, el
+    resultado es exacto (la aritmetica entera es modular)
+
+    Parameters
+    ----------
+    dtype(dtype): tipo de los valores
+    terms(int): numero maximo de valores que se suman
+
+    Returns
+    -------
+    out(dtype): tipo de las sumas
+    """
+    dtype = np.dtype(dtype)
+    if dtype == bool:
+        bound = terms
+    else:
+        info = np.iinfo(dtype)
+        bound = max(-int(info.min), int(info.max)) * terms
+
+    for candidate in (np.int16, np.int32):
+        if bound <= np.iinfo(candidate).max:
+            return np.dtype(candidate)
+
+    return np.dtype(np.int64)
+
+
+def expand_region(
+    region: Tuple[slice, ...], offset: Iterable[int], shape: Iterable[int]
+) -> Tuple[slice, ...]:
+    """
+    Esta funcion retorna la region que cubren las vecindades de las celulas de
+    una region
+
+    Parameters
+    ----------
+    region(tuple(slice)): region de las celulas
+    offset(tuple(int)|list(int)|ndarray(int)): offset de la vecindad
+    shape(tuple(int)): dimensiones de la vecindad
+
+    Returns
+    -------
+    out(tuple(slice)): region que cubren las vecindades
+    """
+    return tuple(
+        slice(axis.start + start, axis.stop + start + size - 1)
+        for axis, start, size in zip(region, offset, shape)
+    )
+
+
+def box_sum(
+    array: npt.NDArray,
+    offset: Iterable[int],
+    shape: Tuple[int, ...],
+    region: Tuple[slice, ...],
+    dtype: npt.DTypeLike = np.int64,
+) -> npt.NDArray:
+    """
+    Esta funcion calcula la suma de los valores de una vecindad rectangular
+    (por ejemplo la vecindad de Moore) para cada celula de una region. La
+    suma es separable, esto es, se suma a lo largo de cada eje por separado,
+    asi el costo por celula es proporcional a la suma de las dimensiones de la
+    vecindad y no a su producto
+
+    Parameters
+    ----------
+    array(ndarray): arreglo con los valores, debe incluir la frontera
+    offset(tuple(int)|list(int)|ndarray(int)): offset de la vecindad
+    shape(tuple(int)): dimensiones de la vecindad
+    region(tuple(slice)): region de las celulas en coordenadas de array
+    dtype(dtype): tipo usado para acumular las sumas
+
+    Returns
+    -------
+    out(ndarray): arreglo con las dimensiones de la region con las sumas
+    """
+    result = array[expand_region(region, offset, shape)].astype(dtype)
+
+    for axis, size in enumerate(shape):
+        length = result.shape[axis] - size + 1
+
+        total = result[_axis_slice(axis, 0, length)].copy()
+        for start in range(1, size):
+            total += result[_axis_slice(axis, start, start + length)]
+
+        result = total
+
+    return result
+
+
+def mask_sum(
+    array: npt.NDArray,
+    mask: npt.NDArray,
+    offset: Iterable[int],
+    region: Tuple[slice, ...],
+    dtype: npt.DTypeLike = np.int64,
+) -> npt.NDArray:
+    """
+    Esta funcion calcula la suma de los valores de una vecindad arbitraria
+    (representada por una mascara) para cada celula de una region, por cada
+    componente True de la mascara se suma una region desplazada del arreglo
+
+    Parameters
+    ----------
+    array(ndarray): arreglo con los valores, debe incluir la frontera
+    mask(ndarray(bool)): mascara que representa la vecindad
+    offset(tuple(int)|list(int)|ndarray(int)): offset de la vecindad
+    region(tuple(slice)): region de las celulas en coordenadas de array
+    dtype(dtype): tipo usado para acumular las sumas
+
+    Returns
+    -------
+    out(ndarray): arreglo con las dimensiones de la region con las sumas
+    """
+    total = np.zeros(tuple(axis.stop - axis.start for axis in region), dtype=dtype)
+
+    for index in np.argwhere(mask):
+        total += array[
+            tuple(
+                slice(axis.start + start + i, axis.stop + start + i)
+                for axis, start, i in zip(region, offset, index)
+            )
+        ]
+
+    return total
+
+
+def summed_area_table(
+    array: npt.NDArray, dtype: npt.DTypeLike = np.int64
+) -> npt.NDArray:
+    """
+    Esta funcion calcula la tabla de sumas acumuladas (imagen integral) de un
+    arreglo, la componente p de la tabla es la suma de los valores del
+    arreglo en las posiciones menores que p en todos los ejes
+
+    Parameters
+    ----------
+    array(ndarray): arreglo con los valores
+    dtype(dtype): tipo usado para acumular las sumas
+
+    Returns
+    -------
+    out(ndarray): tabla con una componente mas que array en cada eje, la
+        primera componente de cada eje es 0
+    """
+    table = np.zeros(tuple(size + 1 for size in array.shape), dtype=dtype)
+    table[(slice(1, None),) * array.ndim] = array
+
+    for axis in range(array.ndim):
+        np.cumsum(table, axis=axis, out=table)
+
+    return table
+
+
+def integral_box_sum(
+    array: npt.NDArray,
+    offset: Iterable[int],
+    shape: Tuple[int, ...],
+    region: Tuple[slice, ...],
+    dtype: npt.DTypeLike = np.int64,
+) -> npt.NDArray:
+    """
+    Esta funcion calcula la suma de los valores de una vecindad rectangular
+    para cada celula de una region (igual que box_sum) con una tabla de sumas
+    acumuladas, cada suma se obtiene de las 2 ** d esquinas de la caja en la
+    tabla, por lo que el costo por celula no depende del tamano de la
+    vecindad
+
+    Parameters
+    ----------
+    array(ndarray): arreglo con los valores, debe incluir la frontera
+    offset(tuple(int)|list(int)|ndarray(int)): offset de la vecindad
+    shape(tuple(int)): dimensiones de la vecindad
+    region(tuple(slice)): region de las celulas en coordenadas de array
+    dtype(dtype): tipo usado para acumular las sumas
+
+    Returns
+    -------
+    out(ndarray): arreglo con las dimensiones de la region con las sumas
+    """
+    table = summed_area_table(array[expand_region(region, offset, shape)], dtype)
+    lengths = [axis.stop - axis.start for axis in region]
+
+    result = np.zeros(lengths, dtype=dtype)
+    for corner in itertools.product((0, 1), repeat=len(lengths)):
+        # las esquinas superiores suman y las inferiores restan, segun el
+        # principio de inclusion-exclusion
+        sign = (-1) ** (len(lengths) - sum(corner))
+        window = tuple(
+            slice(size * upper, size * upper + length)
+            for upper, size, length in zip(corner, shape, lengths)
+        )
+        if sign > 0:
+            result += table[window]
+        else:
+            result -= table[window]
+
+    return result
+
+
+# numero maximo de filas de los bloques en los que se divide una region al
+# calcular sumas sobre rombos, limita la memoria de las sumas diagonales
+DIAMOND_BLOCK = 256
+
+
+def diamond_sum(
+    array: npt.NDArray,
+    radius: int,
+    region: Tuple[slice, slice],
+    dtype: npt.DTypeLike = np.int64,
+) -> npt.NDArray:
+    """
+    Esta funcion calcula la suma de los valores de la vecindad de Neumann (el
+    rombo |dx| + |dy| <= radius) para cada celula de una region
+    bidimensional, con un costo por celula que no depende del radio
+
+    El rombo es la suma, fila por fila, de segmentos de filas, y cada segmento
+    es la diferencia de dos sumas acumuladas de la fila. Los extremos de los
+    segmentos recorren las 4 diagonales del rombo, por lo que la suma de los
+    extremos de cada lado se obtiene de sumas acumuladas a lo largo de las
+    diagonales (rotadas 45 grados) de las sumas acumuladas de las filas
+
+    La region se divide en bloques de a lo mas DIAMOND_BLOCK filas para
+    limitar la memoria de las sumas diagonales
+
+    Parameters
+    ----------
+    array(ndarray): arreglo bidimensional con los valores, debe incluir la
+        frontera
+    radius(int): radio de la vecindad
+    region(tuple(slice)): region de las celulas en coordenadas de array
+    dtype(dtype): tipo usado para acumular las sumas
+
+    Returns
+    -------
+    out(ndarray): arreglo con las dimensiones de la region con las sumas
+    """
+    rows, columns = region
+    width = columns.stop - columns.start
+    result = np.empty((rows.stop - rows.start, width), dtype=dtype)
+
+    for row in range(rows.start, rows.stop, DIAMOND_BLOCK):
+        block = (slice(row, min(row + DIAMOND_BLOCK, rows.stop)), columns)
+        height = block[0].stop - block[0].start
+        window = array[expand_region(block, (-radius, -radius), (2 * radius + 1,) * 2)]
+
+        # sumas acumuladas de las filas, prefix[x + 1, y] es la suma de las
+        # primeras y celulas de la fila x, la fila 0 vale 0
+        prefix = np.zeros((window.shape[0] + 1, window.shape[1] + 1), dtype=dtype)
+        np.cumsum(window, axis=1, out=prefix[1:, 1:])
+
+        # sumas acumuladas hacia arriba a lo largo de las diagonales (1, 1) y
+        # (1, -1)
+        down_right = _diagonal_cumsum(prefix[:, ::-1])[:, ::-1]
+        down_left = _diagonal_cumsum(prefix)
+
+        def shifted(array, row_shift, column_shift):
+            # valores de array para las celulas del bloque desplazadas, la
+            # celula (i, j) del bloque esta en la posicion (i + radius + 1,
+            # j + radius) de las sumas acumuladas
+            return array[
+                row_shift + 1 : row_shift + 1 + height,
+                column_shift : column_shift + width,
+            ]
+
+        # extremos derechos de los segmentos de la mitad superior e inferior
+        # menos los extremos izquierdos de la mitad superior e inferior
+        total = shifted(down_right, radius, 2 * radius + 1).copy()
+        total -= shifted(down_right, -1, radius)
+        total += shifted(down_left, 2 * radius, radius + 1)
+        total -= shifted(down_left, radius, 2 * radius + 1)
+        total -= shifted(down_left, radius, 0)
+        total += shifted(down_left, -1, radius + 1)
+        total -= shifted(down_right, 2 * radius, radius)
+        total += shifted(down_right, radius, 0)
+
+        result[block[0].start - rows.start : block[0].stop - rows.start] = total
+
+    return result
+
+
+# numero minimo de celulas a lo largo de algun eje de una vecindad
+# rectangular para sumarla con una tabla de sumas acumuladas, en vecindades
+# mas pequenas las sumas separables son mas rapidas
+INTEGRAL_SIZE = 7
+
+# radio minimo de la vecindad de Neumann para sumarla con sumas diagonales
+DIAMOND_RADIUS = 5
+
+
+def neighborhood_sum(
+    array: npt.NDArray,
+    mask: npt.NDArray,
+    offset: Iterable[int],
+    region: Tuple[slice, ...],
+    dtype: npt.DTypeLike = np.int64,
+) -> npt.NDArray:
+    """
+    Esta funcion calcula la suma de los valores de una vecindad para cada
+    celula de una region, escogiendo el metodo mas rapido para la vecindad:
+    tablas de sumas acumuladas para vecindades rectangulares grandes (reglas
+    Larger than Life), sumas separables para vecindades rectangulares
+    pequenas, sumas diagonales para vecindades de Neumann grandes, y en los
+    demas casos la transformada de Fourier o sumas de regiones desplazadas
+    (ver get_correlation_method)
+
+    Parameters
+    ----------
+    array(ndarray): arreglo con los valores, debe incluir la frontera
+    mask(ndarray(bool)): mascara que representa la vecindad
+    offset(tuple(int)|list(int)|ndarray(int)): offset de la vecindad
+    region(tuple(slice)): region de las celulas en coordenadas de array
+    dtype(dtype): tipo usado para acumular las sumas
+
+    Returns
+    -------
+    out(ndarray): arreglo con las dimensiones de la region con las sumas
+    """
+    if np.all(mask):
+        if max(mask.shape) >= INTEGRAL_SIZE:
+            return integral_box_sum(array, offset, mask.shape, region, dtype)
+
+        return box_sum(array, offset, mask.shape, region, dtype)
+
+    radius = mask.shape[0] // 2
+    if (
+        radius >= DIAMOND_RADIUS
+        and mask.shape == (2 * radius + 1, 2 * radius + 1)
+        and tuple(offset) == (-radius, -radius)
+    ):
+        x, y = np.indices(mask.shape) - radius
+        if np.array_equal(mask, np.abs(x) + np.abs(y) <= radius):
+            return diamond_sum(array, radius, region, dtype)
+
+    # las demas vecindades grandes (por ejemplo las circulares) se suman con
+    # la transformada de Fourier
+    if get_correlation_method(mask, region) == "fft":
+        return fft_correlate(array, mask, offset, region, dtype)
+
+    return mask_sum(array, mask, offset, region, dtype)
+
+
+# memoria maxima (en bytes) de los espectros almacenados en la cache del
+# proceso
+SPECTRUM_CACHE_MEMORY = 2**27
+
+# cache de los espectros de los nucleos, compartida por todos los motores del
+# proceso. Los espectros solo dependen del nucleo y de las dimensiones de la
+# transformada, por lo que en generaciones sucesivas sobre el mismo plano no
+# se vuelven a calcular
+spectrum_cache = PlanCache(SPECTRUM_CACHE_MEMORY)
+
+# costo de la transformada rapida de Fourier por celula y por nivel (log2 del
+# numero de celulas de la transformada), relativo al costo de sumar una
+# region desplazada por celula. Se usa para escoger entre la correlacion
+# directa y la correlacion con la transformada (ver get_correlation_method)
+FFT_COST = 1.0
+
+
+@functools.lru_cache(maxsize=None)
+def get_fft_shape(shape: Tuple[int, ...]) -> Tuple[int, ...]:
+    """
+    Esta funcion retorna las dimensiones de la transformada de Fourier que se
+    usa para correlacionar un arreglo, esto es, para cada eje la menor
+    longitud mayor o igual a la del arreglo cuyos unicos factores primos son
+    2, 3 y 5 (con estas longitudes la transformada es mas rapida). Las
+    dimensiones se calculan una sola vez por cada forma del arreglo
+
+    Parameters
+    ----------
+    shape(tuple(int)): dimensiones del arreglo
+
+    Returns
+    -------
+    out(tuple(int)): dimensiones de la transformada
+    """
+    fft_shape = []
+    for length in shape:
+        while True:
+            remainder = length
+            for factor in (2, 3, 5):
+                while remainder % factor == 0:
+                    remainder //= factor
+
+            if remainder == 1:
+                break
+            length += 1
+
+        fft_shape.append(length)
+
+    return tuple(fft_shape)
+
+
+def get_spectrum(weights: npt.NDArray, shape: Tuple[int, ...]) -> npt.NDArray:
+    """
+    Esta funcion retorna el conjugado de la transformada de Fourier (real) de
+    un nucleo, con las dimensiones dadas. Los espectros se almacenan en la
+    cache del proceso (spectrum_cache)
+
+    Parameters
+    ----------
+    weights(ndarray): nucleo (pesos de la vecindad)
+    shape(tuple(int)): dimensiones de la transformada
+
+    Returns
+    -------
+    out(ndarray(complex)): espectro de solo lectura
+    """
+    key = (
+        "spectrum",
+        tuple(shape),
+        weights.shape,
+        weights.dtype.str,
+        weights.tobytes(),
+    )
+
+    return spectrum_cache.get(key, lambda: np.conj(np.fft.rfftn(weights, shape)))
+
+
+def direct_correlate(
+    array: npt.NDArray,
+    weights: npt.NDArray,
+    offset: Iterable[int],
+    region: Tuple[slice, ...],
+    dtype: npt.DTypeLike = np.int64,
+) -> npt.NDArray:
+    """
+    Esta funcion calcula la suma ponderada de los valores de una vecindad
+    para cada celula de una region, por cada peso distinto de 0 se suma una
+    region desplazada del arreglo multiplicada por el peso. El costo por
+    celula es proporcional al numero de pesos distintos de 0
+
+    Parameters
+    ----------
+    array(ndarray): arreglo con los valores, debe incluir la frontera
+    weights(ndarray): nucleo (pesos de la vecindad)
+    offset(tuple(int)|list(int)|ndarray(int)): offset de la vecindad
+    region(tuple(slice)): region de las celulas en coordenadas de array
+    dtype(dtype): tipo usado para acumular las sumas
+
+    Returns
+    -------
+    out(ndarray): arreglo con las dimensiones de la region con las sumas
+    """
+    shape = tuple(axis.stop - axis.start for axis in region)
+    total = np.zeros(shape, dtype=dtype)
+    product = np.empty(shape, dtype=dtype)
+
+    for index in np.argwhere(weights):
+        shifted = array[
+            tuple(
+                slice(axis.start + start + i, axis.stop + start + i)
+                for axis, start, i in zip(region, offset, index)
+            )
+        ]
+
+        weight = weights[tuple(index)]
+        if weight == 1:
+            total += shifted
+        else:
+            # el producto se calcula en el tipo de las sumas, con estados de
+            # tipos pequenos (por ejemplo uint8) no hay desbordamiento
+            np.multiply(shifted, weight, out=product, dtype=dtype, casting="unsafe")
+            total += product
+
+    return total
+
+
+def fft_correlate(
+    array: npt.NDArray,
+    weights: npt.NDArray,
+    offset: Iterable[int],
+    region: Tuple[slice, ...],
+    dtype: npt.DTypeLike = np.int64,
+) -> npt.NDArray:
+    """
+    Esta funcion calcula la suma ponderada de los valores de una vecindad
+    para cada celula de una region (igual que direct_correlate) con la
+    transformada rapida de Fourier, el costo por celula es proporcional al
+    logaritmo del numero de celulas y no depende del tamano del nucleo
+
+    Solo se transforma la region que cubren las vecindades, como la
+    transformada tiene al menos las dimensiones de esa region, las sumas de
+    la region no se ven afectadas por la periodicidad de la transformada. Con
+    tipos enteros las sumas se redondean al entero mas cercano
+
+    Parameters
+    ----------
+    array(ndarray): arreglo con los valores, debe incluir la frontera
+    weights(ndarray): nucleo (pesos de la vecindad)
+    offset(tuple(int)|list(int)|ndarray(int)): offset de la vecindad
+    region(tuple(slice)): region de las celulas en coordenadas de array
+    dtype(dtype): tipo de las sumas
+
+    Returns
+    -------
+    out(ndarray): arreglo con las dimensiones de la region con las sumas
+    """
+    window = array[expand_region(region, offset, weights.shape)]
+    shape = get_fft_shape(window.shape)
+
+    spectrum = np.fft.rfftn(window, shape)
+    spectrum *= get_spectrum(weights, shape)
+    result = np.fft.irfftn(spectrum, shape)
+    result = result[tuple(slice(0, axis.stop - axis.start) for axis in region)]
+
+    if np.issubdtype(dtype, np.integer):
+        result = np.rint(result)
+
+    return result.astype(dtype)
+
+
+def get_correlation_method(weights: npt.NDArray, region: Tuple[slice, ...]) -> str:
+    """
+    Esta funcion escoge el metodo mas rapido para correlacionar una region
+    con un nucleo, comparando el costo de la correlacion directa (numero de
+    pesos distintos de 0 por numero de celulas) con el de la transformada
+    rapida de Fourier (FFT_COST por numero de celulas de la transformada por
+    su logaritmo)
+
+    Parameters
+    ----------
+    weights(ndarray): nucleo (pesos de la vecindad)
+    region(tuple(slice)): region de las celulas
+
+    Returns
+    -------
+    out(str): "direct" o "fft"
+    """
+    shape = tuple(axis.stop - axis.start for axis in region)
+    window = tuple(size + length - 1 for size, length in zip(shape, weights.shape))
+    cells = int(np.prod(get_fft_shape(window)))
+
+    direct_cost = np.count_nonzero(weights) * int(np.prod(shape))
+    fft_cost = FFT_COST * cells * np.log2(max(cells, 2))
+
+    return "fft" if fft_cost < direct_cost else "direct"
+
+
+def correlate(
+    array: npt.NDArray,
+    weights: npt.NDArray,
+    offset: Iterable[int],
+    region: Tuple[slice, ...],
+    dtype: Optional[npt.DTypeLike] = None,
+    method: Optional[str] = None,
+) -> npt.NDArray:
+    """
+    Esta funcion calcula la suma ponderada de los valores de una vecindad
+    para cada celula de una region, de forma directa con nucleos pequenos y
+    con la transformada rapida de Fourier con nucleos grandes (ver
+    get_correlation_method)
+
+    Parameters
+    ----------
+    array(ndarray): arreglo con los valores, debe incluir la frontera
+    weights(ndarray): nucleo (pesos de la vecindad), de tipo bool, entero o
+        real
+    offset(tuple(int)|list(int)|ndarray(int)): offset de la vecindad
+    region(tuple(slice)): region de las celulas en coordenadas de array
+    dtype(dtype|None): tipo de las sumas, por defecto int64 si el arreglo y
+        el nucleo son enteros (o bool), y el tipo real comun en caso
+        contrario
+    method(str|None): "direct", "fft", o None para escogerlo
+        automaticamente
+
+    Returns
+    -------
+    out(ndarray): arreglo con las dimensiones de la region con las sumas
+    """
+    weights = np.asarray(weights)
+
+    if dtype is None:
+        dtype = np.result_type(array, weights)
+        if not np.issubdtype(dtype, np.inexact):
+            dtype = np.int64
+
+    if method is None:
+        method = get_correlation_method(weights, region)
+
+    if method == "fft":
+        return fft_correlate(array, weights, offset, region, dtype)
+
+    return direct_correlate(array, weights, offset, region, dtype)
+
+
+def _diagonal_cumsum(array: npt.NDArray) -> npt.NDArray:
+    """
+    Esta funcion calcula las sumas acumuladas de un arreglo bidimensional a lo
+    largo de las diagonales (1, -1), esto es, la componente (x, y) del
+    resultado es la suma de array[x - t, y + t] para t >= 0. Cada fila se
+    desplaza una posicion mas que la anterior (usando una vista del arreglo
+    con filas de una componente menos), asi las diagonales son columnas
+    """
+    height, width = array.shape
+
+    buffer = np.zeros((height, width + height), dtype=array.dtype)
+    buffer[:, :width] = array
+
+    sheared = buffer.reshape(-1)[: height * (width + height - 1)]
+    sheared = sheared.reshape(height, width + height - 1)
+    np.cumsum(sheared, axis=0, out=sheared)
+
+    return buffer[:, :width]
+
+
+def _axis_slice(axis: int, start: int, stop: int) -> Tuple[slice, ...]:
+    """
+    Esta funcion retorna la tupla de slices que selecciona [start, stop) en un
+    eje y todos los elementos en los ejes anteriores
+    """
+    return (slice(None),) * axis + (slice(start, stop),)
@@ -0,0 +1,875 @@
+"""
+Un motor (engine) encapsula la manera en la que se calcula una generacion del
+automata, esto es, como se recorren las celulas de la topologia, como se
+extraen las vecindades y como se aplica la funcion de transicion. El objeto
+Automaton delega en un motor el paso de actualizacion, de esta forma reglas
+y topologias particulares pueden ofrecer implementaciones mas eficientes sin
+modificar la interfaz del automata
+"""
+
+import itertools
+from abc import ABCMeta, abstractmethod
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from pycellslib.core.jit import JIT_AVAILABLE, compile_kernel, is_jit_compatible
+from pycellslib.core.rule import Rule
+from pycellslib.core.topology import (
+    FiniteNGridTopology,
+    SparseTopology,
+    Topology,
+    UnboundedNGridTopology,
+)
+from pycellslib.errors import InvalidParameterError
+from pycellslib.utils import pack_bits, unpack_bits
+
+# numero aproximado de celulas que se procesan en cada bloque en los motores
+# vectorizados, limita la memoria usada al extraer las vecindades
+BATCH_SIZE = 2**18
+
+# numero maximo de configuraciones de la vecindad para que una regla se
+# tabule, cada configuracion requiere una llamada a apply_rule al crear la
+# tabla
+TABLE_SIZE = 2**16
+
+
+class Engine(metaclass=ABCMeta):
+    """
+    Esta es la clase base de los motores de actualizacion. Un motor calcula
+    una generacion leyendo del buffer de lectura de la topologia y escribiendo
+    en el buffer de escritura, el intercambio de los buffers (metodo flip) lo
+    realiza el automata antes de llamar al metodo step
+
+    Parameters
+    ----------
+    rule(Rule): regla de transicion del automata
+    topology(Topology): topologia del automata
+    """
+
+    def __init__(self, rule: Rule, topology: Topology) -> None:
+        self.rule = rule
+        self.topology = topology
+
+        neighborhood = self.rule.get_neighborhood()
+        self.mask = neighborhood.get_mask()
+        self.offset = neighborhood.get_offset()
+
+    @abstractmethod
+    def step(self):
+        """
+        Este metodo calcula una generacion del automata
+        """
+
+    def advance(self, generations: int) -> None:
+        """
+        Este metodo calcula varias generaciones del automata. Los motores
+        pueden mantener un estado interno entre generaciones, por lo que los
+        arreglos de la topologia solo estan actualizados despues de llamar al
+        metodo synchronize
+
+        Parameters
+        ----------
+        generations(int): numero de generaciones
+        """
+        for _ in range(generations):
+            # en el paso anterior, la nueva informacion se escribio en el
+            # buffer de escritura, para usarla en el paso de actualizacion, el
+            # buffer debe ser cambiado a uno de lectura
+            self.topology.flip()
+
+            self.step()
+
+    def synchronize(self) -> None:
+        """
+        Este metodo escribe en la topologia el estado interno del motor, los
+        motores que calculan directamente sobre la topologia no necesitan
+        hacer nada
+        """
+
+
+class CellByCellEngine(Engine):
+    """
+    Este motor aplica la regla celula por celula usando el metodo apply_rule,
+    es el motor por defecto y funciona con cualquier regla y topologia. En
+    las topologias FiniteNGridTopology las vecindades de un bloque de filas
+    se extraen con el plan de recoleccion de la topologia (ver
+    get_gather_plan) y los nuevos valores se escriben en una sola operacion
+
+    Parameters
+    ----------
+    rule(Rule): regla de transicion del automata
+    topology(Topology): topologia del automata
+    batch_size(int): numero aproximado de celulas que se procesan en cada
+        bloque
+    """
+
+    def __init__(
+        self, rule: Rule, topology: Topology, batch_size: int = BATCH_SIZE
+    ) -> None:
+        super().__init__(rule, topology)
+
+        # regiones de los bloques de filas, None si la topologia no es una
+        # malla finita
+        self.batches = None
+        if isinstance(self.topology, FiniteNGridTopology):
+            self.batches = get_row_batches(self.topology, batch_size)
+
+    def step(self) -> None:
+        """
+        Este metodo calcula una generacion del automata
+        """
+        if self.batches is None:
+            self.step_positions()
+            return
+
+        for region in self.batches:
+            states, attributes = self.topology.gather_neighborhoods(
+                region, self.mask, self.offset
+            )
+
+            if attributes is None:
+                results = [self.rule.apply_rule(cells, None) for cells in states]
+            else:
+                results = [
+                    self.rule.apply_rule(cells, cells_attributes)
+                    for cells, cells_attributes in zip(states, attributes)
+                ]
+
+            new_attributes = None
+            if attributes is not None:
+                new_attributes = np.array([result[1] for result in results])
+
+            self.topology.update_cells(
+                region, np.array([result[0] for result in results]), new_attributes
+            )
+
+    def step_positions(self) -> None:
+        """
+        Este metodo calcula una generacion del automata recorriendo las
+        posiciones de la topologia
+        """
+        for position in self.topology:
+            mask_position = tuple(
+                position[i] + self.offset[i] for i in range(len(position))
+            )
+
+            cells, attributes = self.topology.apply_mask(mask_position, self.mask)
+
+            cell, attributes = self.rule.apply_rule(cells, attributes)
+
+            self.topology.update_cell(position, cell, attributes)
+
+
+class BatchEngine(Engine):
+    """
+    Este motor aplica la regla a bloques de celulas usando el metodo
+    apply_rule_batch. Las vecindades de un bloque de filas (a lo largo del
+    primer eje) se extraen en un unico arreglo, de esta forma se hace una
+    llamada a la regla por bloque y no por celula
+
+    Parameters
+    ----------
+    rule(Rule): regla de transicion del automata, debe implementar el metodo
+        apply_rule_batch
+    topology(FiniteNGridTopology): topologia del automata
+    batch_size(int): numero aproximado de celulas que se procesan en cada
+        bloque
+    """
+
+    def __init__(
+        self, rule: Rule, topology: FiniteNGridTopology, batch_size: int = BATCH_SIZE
+    ) -> None:
+        super().__init__(rule, topology)
+
+        self.batch_size = batch_size
+
+    def get_batches(self) -> List[Tuple[slice, ...]]:
+        """
+        Este metodo divide el espacio actualizable en bloques de filas
+
+        Returns
+        -------
+        out(list(tuple(slice))): regiones (en coordenadas que tienen en cuenta
+            la frontera) de cada bloque
+        """
+        return get_row_batches(self.topology, self.batch_size)
+
+    def step(self) -> None:
+        """
+        Este metodo calcula una generacion del automata
+        """
+        for region in self.get_batches():
+            states, attributes = self.topology.apply_mask_batch(
+                region, self.mask, self.offset
+            )
+
+            states, attributes = self.rule.apply_rule_batch(states, attributes)
+
+            self.topology.update_cells(region, states, attributes)
+
+
+class ArrayEngine(Engine):
+    """
+    Esta es la clase base de los motores vectorizados, esto es, aquellos que
+    calculan los nuevos estados de una region completa del espacio a partir de
+    los arreglos de la topologia (incluyendo la frontera), sin extraer la
+    vecindad de cada celula
+
+    Como los nuevos estados solo dependen de la vecindad, en cada paso solo
+    se calculan los bloques (tiles) de la topologia que tienen en su vecindad
+    alguna celula que cambio en la generacion anterior, las demas celulas
+    conservan su estado
+
+    Parameters
+    ----------
+    rule(Rule): regla de transicion del automata
+    topology(FiniteNGridTopology): topologia del automata
+    """
+
+    # indica si se omiten los bloques cuya vecindad no cambio
+    skip_tiles = True
+    # indica si las regiones del espacio se pueden calcular en hilos
+    # separados (ver ThreadedEngine)
+    threadable = True
+
+    def __init__(self, rule: Rule, topology: FiniteNGridTopology) -> None:
+        super().__init__(rule, topology)
+
+        # se revisa que la frontera sea suficiente para aplicar la mascara
+        self.topology.get_windows_region(self.mask, self.offset)
+
+        # distancia maxima a lo largo de cada eje entre una celula y su
+        # vecindad
+        self.halo = [
+            max(0, -start, start + size - 1)
+            for start, size in zip(self.offset, self.mask.shape)
+        ]
+
+        # numero de bloques calculados y omitidos
+        self.computed_tiles = 0
+        self.skipped_tiles = 0
+
+    @abstractmethod
+    def compute(self, states, attributes, region):
+        """
+        Este metodo calcula los nuevos valores de las celulas de una region
+
+        Parameters
+        ----------
+        states(ndarray(int)): arreglo con los estados de las celulas,
+            incluyendo la frontera
+        attributes(list(ndarray)|None): lista con un arreglo por atributo
+            con los valores de las celulas, incluyendo la frontera, o None en
+            caso de que las celulas no tengan atributos
+        region(tuple(slice)): region de las celulas que se actualizan, en
+            coordenadas de los arreglos
+
+        Returns
+        -------
+        out(tuple): tupla cuya primera componente es un arreglo con los
+            nuevos estados de la region, y la segunda componente un arreglo
+            de dimensiones (*region, a) con los nuevos atributos, o None
+        """
+
+    def get_regions(self) -> List[Tuple[slice, ...]]:
+        """
+        Este metodo retorna las regiones que se deben calcular en el paso
+        actual, y actualiza los contadores de bloques calculados y omitidos
+
+        Returns
+        -------
+        out(list(tuple(slice))): regiones (en coordenadas que tienen en cuenta
+            la frontera)
+        """
+        if not self.skip_tiles:
+            return [self.topology.subshape]
+
+        active = self.topology.get_active_tiles(self.halo)
+
+        computed = int(np.count_nonzero(active))
+        self.computed_tiles += computed
+        self.skipped_tiles += active.size - computed
+
+        if computed == active.size:
+            return [self.topology.subshape]
+
+        return self.topology.get_tiles_regions(active)
+
+    def get_skipped_fraction(self) -> float:
+        """
+        Este metodo retorna la fraccion de bloques omitidos en todos los pasos
+        calculados por el motor
+
+        Returns
+        -------
+        out(float): fraccion de bloques omitidos
+        """
+        total = self.computed_tiles + self.skipped_tiles
+
+        return self.skipped_tiles / total if total != 0 else 0.0
+
+    def step(self) -> None:
+        """
+        Este metodo calcula una generacion del automata
+        """
+        states = self.topology.states[self.topology.read_buffer]
+        attributes = None
+        if self.topology.attributes is not None:
+            attributes = self.topology.attributes[self.topology.read_buffer]
+
+        regions = self.get_regions()
+
+        # los cambios de esta generacion se registran en update_cells
+        self.topology.reset_changes()
+
+        for region in regions:
+            new_states, new_attributes = self.compute(states, attributes, region)
+
+            self.topology.update_cells(region, new_states, new_attributes)
+
+
+class PackedEngine(ArrayEngine):
+    """
+    Esta es la clase base de los motores que trabajan con estados binarios
+    (0/1) empaquetados, 64 celulas por palabra (uint64) a lo largo del ultimo
+    eje. Cuando se calculan varias generaciones, los dos buffers se mantienen
+    empaquetados y solo se escriben en la topologia al llamar al metodo
+    synchronize
+
+    Parameters
+    ----------
+    rule(Rule): regla de transicion del automata
+    topology(FiniteNGridTopology): topologia del automata
+    """
+
+    # las palabras empaquetadas se calculan completas, por lo que no se
+    # omiten bloques
+    skip_tiles = False
+
+    def __init__(self, rule: Rule, topology: FiniteNGridTopology) -> None:
+        super().__init__(rule, topology)
+
+        # buffers empaquetados, None si la topologia esta actualizada
+        self.packed = None
+
+        # palabras con los bits de las columnas que no son frontera
+        columns = np.zeros(self.topology.real_dimensions[-1], dtype=bool)
+        columns[self.topology.subshape[-1]] = True
+        self.interior = pack_bits(columns)
+
+    @abstractmethod
+    def compute_packed(self, words, region):
+        """
+        Este metodo calcula los nuevos estados de una region a partir del
+        buffer de lectura empaquetado
+
+        Parameters
+        ----------
+        words(ndarray(uint64)): buffer de lectura empaquetado, incluyendo la
+            frontera
+        region(tuple(slice)): region de las celulas que se actualizan, en
+            coordenadas de los arreglos (sin empaquetar)
+
+        Returns
+        -------
+        out(ndarray(uint64)): palabras con los nuevos estados de las filas de
+            la region, alineadas con words. Los bits de las columnas que no
+            estan en la region se ignoran
+        """
+
+    def compute(self, states, attributes, region):
+        """
+        Este metodo calcula los nuevos valores de las celulas de una region
+
+        Parameters
+        ----------
+        states(ndarray(int)): arreglo con los estados de las celulas,
+            incluyendo la frontera
+        attributes(None): las celulas de estas reglas no tienen atributos
+        region(tuple(slice)): region de las celulas que se actualizan, en
+            coordenadas de los arreglos
+
+        Returns
+        -------
+        out(tuple): tupla cuya primera componente es un arreglo con los
+            nuevos estados de la region, y la segunda componente es None
+        """
+        words = self.compute_packed(pack_bits(states), region)
+        new_states = unpack_bits(words, states.shape[-1])[..., region[-1]]
+
+        return new_states.astype(states.dtype), None
+
+    def step(self) -> None:
+        """
+        Este metodo calcula una generacion del automata
+        """
+        self.synchronize()
+
+        super().step()
+
+    def advance(self, generations: int) -> None:
+        """
+        Este metodo calcula varias generaciones del automata sobre los buffers
+        empaquetados, cada buffer conserva los valores de su frontera. Si la
+        frontera se calcula a partir de las celulas se calcula generacion por
+        generacion sobre la topologia
+
+        Parameters
+        ----------
+        generations(int): numero de generaciones
+        """
+        if self.topology.boundary != "constant":
+            super().advance(generations)
+            return
+
+        if self.packed is None:
+            self.packed = [pack_bits(states) for states in self.topology.states]
+
+        region = self.topology.subshape
+        for _ in range(generations):
+            self.topology.flip()
+
+            words = self.compute_packed(self.packed[self.topology.read_buffer], region)
+
+            # solo se modifican los bits que no son frontera
+            target = self.packed[self.topology.write_buffer][region[:-1]]
+            target ^= (target ^ words) & self.interior
+
+    def synchronize(self) -> None:
+        """
+        Este metodo escribe los buffers empaquetados en la topologia
+        """
+        if self.packed is None:
+            return
+
+        for states, words in zip(self.topology.states, self.packed):
+            states[...] = unpack_bits(words, states.shape[-1])
+
+        self.packed = None
+        self.topology.mark_changes()
+
+
+class SparseEngine(Engine):
+    """
+    Este motor calcula las generaciones sobre una topologia dispersa
+    (SparseTopology), solo se visitan las celulas que tienen en su vecindad
+    alguna celula almacenada, y a cada una se le aplica el metodo apply_rule.
+    La regla debe transformar una vecindad con valores por defecto en una
+    celula con valores por defecto
+
+    Parameters
+    ----------
+    rule(Rule): regla de transicion del automata
+    topology(SparseTopology): topologia del automata
+    """
+
+    def step(self) -> None:
+        """
+        Este metodo calcula una generacion del automata
+        """
+        # las celulas que no se visitan toman el valor por defecto
+        self.topology.clear()
+
+        for position in self.topology.get_candidates(self.mask, self.offset):
+            mask_position = tuple(
+                position[i] + self.offset[i] for i in range(len(position))
+            )
+
+            cells, attributes = self.topology.apply_mask(mask_position, self.mask)
+
+            cell, attributes = self.rule.apply_rule(cells, attributes)
+
+            self.topology.update_cell(position, cell, attributes)
+
+
+class ChunkedEngine(Engine):
+    """
+    Este motor calcula las generaciones sobre una topologia no acotada
+    (UnboundedNGridTopology). Cada bloque, extendido con las celulas vecinas
+    de los bloques adyacentes, se copia en una topologia finita con las
+    dimensiones del bloque, y se calcula con el motor que escoge
+    select_engine para esa topologia, de esta forma se aprovechan los motores
+    vectorizados de las reglas
+
+    Parameters
+    ----------
+    rule(Rule): regla de transicion del automata
+    topology(UnboundedNGridTopology): topologia del automata
+    """
+
+    def __init__(self, rule: Rule, topology: UnboundedNGridTopology) -> None:
+        super().__init__(rule, topology)
+
+        # distancia maxima a lo largo de cada eje entre una celula y su
+        # vecindad
+        self.halo = [
+            max(0, -start, start + size - 1)
+            for start, size in zip(self.offset, self.mask.shape)
+        ]
+
+        # topologia en la que se calcula cada bloque, la frontera contiene
+        # las celulas de los bloques vecinos
+        self.chunk_topology = FiniteNGridTopology(
+            topology.attributes_number, topology.chunk_shape, self.halo
+        )
+        self.engine = select_engine(rule, self.chunk_topology)
+
+    def step(self) -> None:
+        """
+        Este metodo calcula una generacion del automata
+        """
+        chunk_topology = self.chunk_topology
+
+        for index in self.topology.get_active_chunks(self.halo):
+            states, attributes = self.topology.get_padded_chunk(index, self.halo)
+
+            chunk_topology.states[chunk_topology.read_buffer][...] = states
+            if attributes is not None:
+                chunk_topology.assign_attributes(
+                    chunk_topology.read_buffer, (...,), attributes
+                )
+            chunk_topology.mark_changes()
+
+            self.engine.step()
+
+            attributes = None
+            if chunk_topology.attributes_number != 0:
+                attributes = chunk_topology.stack_attributes(
+                    chunk_topology.write_buffer, chunk_topology.subshape
+                )
+
+            self.topology.set_chunk(
+                index,
+                chunk_topology.states[chunk_topology.write_buffer][
+                    chunk_topology.subshape
+                ],
+                attributes,
+            )
+
+        self.topology.release_chunks()
+
+
+class JitEngine(Engine):
+    """
+    Este motor calcula las generaciones con la funcion de transicion de la
+    regla y el recorrido de las celulas compilados con numba, cada
+    generacion se calcula con una sola llamada a codigo nativo
+
+    Parameters
+    ----------
+    rule(Rule): regla de transicion del automata, debe implementar el metodo
+        get_transition_function
+    topology(FiniteNGridTopology): topologia del automata, sin atributos
+    """
+
+    def __init__(self, rule: Rule, topology: FiniteNGridTopology) -> None:
+        if not JIT_AVAILABLE:
+            raise InvalidParameterError("el motor compilado necesita numba")
+
+        if not is_jit_compatible(rule, topology):
+            raise InvalidParameterError(
+                "la regla debe implementar get_transition_function y la "
+                "topologia debe ser FiniteNGridTopology sin atributos"
+            )
+
+        super().__init__(rule, topology)
+
+        self.kernel = compile_kernel(rule.get_transition_function())
+
+        self.displacements = topology.get_flat_displacements(self.mask, self.offset)
+        # posiciones de las celulas actualizables en el arreglo aplanado, es
+        # el plan de recoleccion de una vecindad con una sola celula
+        dimensions_number = topology.dimensions.size
+        self.cells = topology.get_gather_plan(
+            np.ones((1,) * dimensions_number, dtype=bool),
+            np.zeros(dimensions_number, dtype=int),
+        )[0]
+
+        # se revisa que la frontera sea suficiente para aplicar la mascara
+        topology.get_windows_region(self.mask, self.offset)
+
+    def step(self) -> None:
+        """
+        Este metodo calcula una generacion del automata
+        """
+        self.kernel(
+            self.topology.states[self.topology.read_buffer].reshape(-1),
+            self.topology.states[self.topology.write_buffer].reshape(-1),
+            self.cells,
+            self.displacements,
+        )
+
+        self.topology.mark_changes()
+
+
+class TableEngine(ArrayEngine):
+    """
+    Este motor calcula las generaciones con una tabla de busqueda que
+    contiene el nuevo estado para cada configuracion posible de la vecindad.
+    La tabla se crea una sola vez evaluando la regla en todas las
+    configuraciones (con apply_rule_batch si la regla lo implementa, o con
+    apply_rule en caso contrario), y en cada generacion se calcula el indice
+    de la configuracion de cada celula y se leen los nuevos estados de la
+    tabla
+
+    Solo se pueden tabular reglas deterministas (ver Rule.deterministic) sin
+    atributos, y cuyo numero de configuraciones (estados ** celulas de la
+    vecindad) no supera el tamano maximo de la tabla
+
+    Parameters
+    ----------
+    rule(Rule): regla de transicion del automata
+    topology(FiniteNGridTopology): topologia del automata, sin atributos
+    states(tuple(int)|list(int)|ndarray(int)): posibles estados de las
+        celulas (ver CellInformation.get_states)
+    max_size(int): numero maximo de configuraciones de la tabla
+    """
+
+    def __init__(
+        self,
+        rule: Rule,
+        topology: FiniteNGridTopology,
+        states: Iterable[int],
+        max_size: int = TABLE_SIZE,
+    ) -> None:
+        super().__init__(rule, topology)
+
+        if not is_tabulable(rule, topology, states, max_size):
+            raise InvalidParameterError(
+                "la regla debe ser determinista, las celulas no deben tener "
+                "atributos y el numero de configuraciones de la vecindad no "
+                "debe superar el tamano maximo de la tabla"
+            )
+
+        self.states = np.unique(np.asarray(states, dtype=int))
+        # si los estados son 0, 1, ..., n - 1 no es necesario codificarlos
+        self.identity = np.array_equal(self.states, np.arange(self.states.size))
+
+        # posiciones de la vecindad respecto a cada celula, en el mismo orden
+        # que retorna apply_mask
+        self.displacements = np.argwhere(self.mask) + self.offset
+
+        self.table = self.get_table()
+
+    def get_table(self) -> np.ndarray:
+        """
+        Este metodo evalua la regla en todas las configuraciones de la
+        vecindad
+
+        Returns
+        -------
+        out(ndarray(int)): arreglo con el nuevo estado de cada configuracion,
+            el indice de una configuracion es el numero cuyos digitos (en
+            base al numero de estados) son los codigos de los estados de la
+            vecindad, la primera celula es el digito mas significativo
+        """
+        configurations = np.array(
+            list(itertools.product(self.states, repeat=len(self.displacements))),
+            dtype=int,
+        ).reshape(-1, len(self.displacements))
+
+        if implements_batch(self.rule):
+            table, _ = self.rule.apply_rule_batch(configurations, None)
+        else:
+            table = [
+                self.rule.apply_rule(configuration, None)[0]
+                for configuration in configurations
+            ]
+
+        return np.asarray(table, dtype=int)
+
+    def compute(self, states, attributes, region):
+        """
+        Este metodo calcula los nuevos valores de las celulas de una region
+
+        Parameters
+        ----------
+        states(ndarray(int)): arreglo con los estados de las celulas,
+            incluyendo la frontera
+        attributes(None): las celulas de las reglas tabuladas no tienen
+            atributos
+        region(tuple(slice)): region de las celulas que se actualizan, en
+            coordenadas de los arreglos
+
+        Returns
+        -------
+        out(tuple): tupla cuya primera componente es un arreglo con los
+            nuevos estados de la region, y la segunda componente es None
+        """
+        # solo se codifican las celulas de la region y su vecindad
+        lower = np.minimum(self.displacements.min(axis=0), 0)
+        upper = np.maximum(self.displacements.max(axis=0), 0)
+        window = tuple(
+            slice(axis.start + low, axis.stop + high)
+            for axis, low, high in zip(region, lower, upper)
+        )
+        codes = states[window]
+        if not self.identity:
+            codes = np.searchsorted(self.states, codes)
+
+        # searchsorted asigna a un estado desconocido el codigo de un estado
+        # vecino, por lo que se comprueba que todos los estados esten en la
+        # tabla
+        if not np.array_equal(self.states.take(codes, mode="clip"), states[window]):
+            raise InvalidParameterError(
+                "los estados de las celulas deben ser estados de la tabla"
+            )
+
+        shape = tuple(axis.stop - axis.start for axis in region)
+        indices = np.zeros(shape, dtype=np.intp)
+        for displacement in self.displacements:
+            shifted = tuple(
+                slice(d - low, d - low + size)
+                for d, low, size in zip(displacement, lower, shape)
+            )
+            indices *= self.states.size
+            indices += codes[shifted]
+
+        return self.table[indices].astype(states.dtype), None
+
+
+def get_row_batches(
+    topology: FiniteNGridTopology, batch_size: int
+) -> List[Tuple[slice, ...]]:
+    """
+    Esta funcion divide el espacio actualizable de una topologia en bloques
+    de filas (a lo largo del primer eje)
+
+    Parameters
+    ----------
+    topology(FiniteNGridTopology): topologia del automata
+    batch_size(int): numero aproximado de celulas de cada bloque
+
+    Returns
+    -------
+    out(list(tuple(slice))): regiones (en coordenadas que tienen en cuenta la
+        frontera) de cada bloque
+    """
+    # numero de filas que se procesan en cada bloque
+    row_size = int(np.prod(topology.dimensions[1:]))
+    rows_per_batch = max(1, batch_size // max(1, row_size))
+
+    start, stop = topology.subshape[0].start, topology.subshape[0].stop
+
+    return [
+        (slice(row, min(row + rows_per_batch, stop)),) + topology.subshape[1:]
+        for row in range(start, stop, rows_per_batch)
+    ]
+
+
+def prewarm_plans(
+    rule: Rule, topology: FiniteNGridTopology, batch_size: int = BATCH_SIZE
+) -> None:
+    """
+    Esta funcion calcula y almacena en la cache del proceso (ver plan_cache)
+    los planes de recoleccion que usa CellByCellEngine con una regla y una
+    topologia, de esta forma los automatas que se crean despues con la misma
+    geometria no calculan los planes
+
+    Parameters
+    ----------
+    rule(Rule): regla de transicion del automata
+    topology(FiniteNGridTopology): topologia con la geometria del automata
+    batch_size(int): numero aproximado de celulas que se procesan en cada
+        bloque
+    """
+    neighborhood = rule.get_neighborhood()
+    mask, offset = neighborhood.get_mask(), neighborhood.get_offset()
+
+    topology.get_flat_displacements(mask)
+    for region in get_row_batches(topology, batch_size):
+        topology.get_gather_plan(mask, offset, region)
+
+
+def implements_batch(rule: Rule) -> bool:
+    """
+    Esta funcion indica si una regla sobreescribe el metodo opcional
+    apply_rule_batch
+
+    Parameters
+    ----------
+    rule(Rule): regla de transicion
+
+    Returns
+    -------
+    out(bool): True si la regla implementa apply_rule_batch
+    """
+    return type(rule).apply_rule_batch is not Rule.apply_rule_batch
+
+
+def is_tabulable(
+    rule: Rule,
+    topology: Topology,
+    states: Iterable[int],
+    max_size: int = TABLE_SIZE,
+) -> bool:
+    """
+    Esta funcion indica si una regla puede tabularse para una topologia (ver
+    TableEngine)
+
+    Parameters
+    ----------
+    rule(Rule): regla de transicion del automata
+    topology(Topology): topologia del automata
+    states(tuple(int)|list(int)|ndarray(int)): posibles estados de las
+        celulas
+    max_size(int): numero maximo de configuraciones de la tabla
+
+    Returns
+    -------
+    out(bool): True si la regla es determinista, la topologia es
+        FiniteNGridTopology sin atributos, y el numero de configuraciones de
+        la vecindad no supera max_size
+    """
+    if not rule.deterministic or not isinstance(topology, FiniteNGridTopology):
+        return False
+
+    if topology.attributes is not None:
+        return False
+
+    neighbors = int(np.count_nonzero(rule.get_neighborhood().get_mask()))
+    # se compara con enteros de python para evitar desbordamientos
+    return len(np.unique(np.asarray(states))) ** neighbors <= max_size
+
+
+def select_engine(
+    rule: Rule, topology: Topology, states: Optional[Iterable[int]] = None
+) -> Engine:
+    """
+    Esta funcion escoge el motor mas eficiente disponible para una regla y una
+    topologia
+
+    Parameters
+    ----------
+    rule(Rule): regla de transicion del automata
+    topology(Topology): topologia del automata
+    states(tuple(int)|list(int)|ndarray(int)|None): posibles estados de las
+        celulas, si se especifican, las reglas que solo implementan
+        apply_rule se tabulan cuando es posible (ver TableEngine)
+
+    Returns
+    -------
+    out(Engine): motor usado para calcular las generaciones
+    """
+    engine = rule.get_engine(topology)
+    if engine is not None:
+        return engine
+
+    if isinstance(topology, SparseTopology):
+        return SparseEngine(rule, topology)
+
+    if isinstance(topology, UnboundedNGridTopology):
+        return ChunkedEngine(rule, topology)
+
+    # si numba no esta instalado se usan los motores genericos
+    if is_jit_compatible(rule, topology):
+        return JitEngine(rule, topology)
+
+    if implements_batch(rule) and isinstance(topology, FiniteNGridTopology):
+        return BatchEngine(rule, topology)
+
+    if states is not None and is_tabulable(rule, topology, states):
+        return TableEngine(rule, topology, states)
+
+    return CellByCellEngine(rule, topology)
@@ -0,0 +1,83 @@
+"""
+Este modulo implementa la compilacion (JIT) de las reglas definidas por el
+usuario con numba. Numba es una dependencia opcional, si no esta instalado
+las reglas se evaluan con los motores genericos, sin ningun aviso
+
+Una regla puede compilarse si implementa el metodo get_transition_function
+de la clase Rule, esto es, si su funcion de transicion es una funcion pura
+de los estados de la vecindad (ver Rule.get_transition_function). El motor
+que usa las funciones compiladas es JitEngine (ver pycellslib.core.engine)
+"""
+
+from typing import Callable
+
+import numpy as np
+
+from pycellslib.core.rule import Rule
+from pycellslib.core.topology import FiniteNGridTopology, Topology
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# indica si numba esta instalado
+JIT_AVAILABLE = numba is not None
+
+
+def compile_kernel(transition: Callable) -> Callable:
+    """
+    Esta funcion compila la funcion de transicion de una regla junto con el
+    recorrido de las celulas de la topologia
+
+    Parameters
+    ----------
+    transition(callable): funcion de transicion de la regla (ver
+        Rule.get_transition_function)
+
+    Returns
+    -------
+    out(callable): funcion compilada que recibe el buffer de lectura y el de
+        escritura aplanados, las posiciones de las celulas actualizables en
+        el arreglo aplanado y las distancias (ver
+        FiniteNGridTopology.get_flat_displacements) de la vecindad, y
+        escribe los nuevos estados
+    """
+    transition = numba.njit(transition)
+
+    @numba.njit(nogil=True)
+    def kernel(states, new_states, cells, displacements):
+        # la vecindad se copia a int64, de esta forma la funcion de
+        # transicion no depende del tipo de los estados de la topologia
+        neighborhood = np.empty(displacements.size, dtype=np.int64)
+
+        for cell in cells:
+            for i in range(displacements.size):
+                neighborhood[i] = states[cell + displacements[i]]
+
+            new_states[cell] = transition(neighborhood)
+
+    return kernel
+
+
+def is_jit_compatible(rule: Rule, topology: Topology) -> bool:
+    """
+    Esta funcion indica si una regla puede compilarse para una topologia
+
+    Parameters
+    ----------
+    rule(Rule): regla de transicion del automata
+    topology(Topology): topologia del automata
+
+    Returns
+    -------
+    out(bool): True si numba esta instalado, la regla implementa
+        get_transition_function, y la topologia es FiniteNGridTopology sin
+        atributos
+    """
+    return (
+        JIT_AVAILABLE
+        and isinstance(topology, FiniteNGridTopology)
+        and topology.attributes is None
+        and rule.get_transition_function() is not None
+    )
@@ -32,3 +32,19 @@ class Neighborhood(metaclass=ABCMeta):
         out(tuple(int)|list(int)|ndarray(int)): valor que indica el offset en
             cada eje de la mascara
         """
+
+    # este metodo no es abstracto, en las vecindades sin pesos todas las
+    # celulas de la mascara tienen peso 1
+    def get_weights(self):
+        """
+        Este metodo retorna los pesos de las celulas de la vecindad, las
+        reglas que suman los valores de la vecindad (por ejemplo las reglas
+        totalisticas) multiplican el valor de cada celula por su peso. Los
+        pesos tienen las mismas dimensiones que la mascara y son 0 fuera de
+        ella
+
+        Returns
+        -------
+        out(ndarray(int)|ndarray(float)): pesos de la vecindad
+        """
+        return self.get_mask().astype(int)
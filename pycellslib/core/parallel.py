@@ -0,0 +1,661 @@
+"""
+Este modulo implementa el calculo de generaciones en varios procesos o en
+varios hilos. El espacio de una topologia FiniteNGridTopology se divide en
+bloques de filas (a lo largo del primer eje) y cada proceso (o hilo) calcula
+uno de los bloques. Los procesos comparten los buffers de la topologia por
+medio de memoria compartida; los hilos escriben directamente en el buffer de
+escritura, sin bloqueos, ya que las regiones de los bloques son disjuntas, y
+dependen de que numpy libere el GIL en las operaciones sobre arreglos grandes
+"""
+
+import copy
+import multiprocessing
+import os
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from pycellslib.core.engine import (
+    ArrayEngine,
+    BatchEngine,
+    Engine,
+    PackedEngine,
+    select_engine,
+)
+from pycellslib.core.rule import Rule
+from pycellslib.core.topology import FiniteNGridTopology
+from pycellslib.errors import InvalidParameterError
+
+# numero minimo de celulas para que el automata use varios hilos por defecto,
+# en espacios pequenos el costo de coordinar los hilos supera la ganancia
+THREADS_MIN_CELLS = 2**18
+
+
+def get_slabs(topology: FiniteNGridTopology, workers: int) -> List[Tuple[slice, ...]]:
+    """
+    Esta funcion divide el espacio actualizable de una topologia en bloques
+    de filas (a lo largo del primer eje) de tamanos similares
+
+    Parameters
+    ----------
+    topology(FiniteNGridTopology): topologia del automata
+    workers(int): numero de bloques
+
+    Returns
+    -------
+    out(list(tuple(slice))): regiones (en coordenadas que tienen en cuenta la
+        frontera) de cada bloque, no se retornan bloques vacios
+    """
+    start, stop = topology.subshape[0].start, topology.subshape[0].stop
+    edges = np.linspace(start, stop, min(workers, stop - start) + 1).astype(int)
+
+    return [
+        (slice(first, last),) + topology.subshape[1:]
+        for first, last in zip(edges[:-1], edges[1:])
+    ]
+
+
+def compute_region(
+    engine: Engine, topology: FiniteNGridTopology, region: Tuple[slice, ...]
+) -> None:
+    """
+    Esta funcion calcula los nuevos valores de las celulas de una region,
+    leyendo del buffer de lectura y escribiendo en el buffer de escritura
+
+    Parameters
+    ----------
+    engine(ArrayEngine|BatchEngine): motor usado para calcular la region
+    topology(FiniteNGridTopology): topologia del automata
+    region(tuple(slice)): region (en coordenadas que tienen en cuenta la
+        frontera) de las celulas
+    """
+    attributes = None
+
+    if isinstance(engine, ArrayEngine):
+        # solo se pasan al motor las filas de la region y su vecindad
+        rows = slice(
+            max(0, region[0].start - engine.halo[0]),
+            min(topology.real_dimensions[0], region[0].stop + engine.halo[0]),
+        )
+        local_region = (
+            slice(region[0].start - rows.start, region[0].stop - rows.start),
+        ) + region[1:]
+
+        states = topology.states[topology.read_buffer][rows]
+        if topology.attributes is not None:
+            attributes = [
+                field[rows] for field in topology.attributes[topology.read_buffer]
+            ]
+
+        new_states, new_attributes = engine.compute(states, attributes, local_region)
+    else:
+        states, attributes = topology.apply_mask_batch(
+            region, engine.mask, engine.offset
+        )
+        new_states, new_attributes = engine.rule.apply_rule_batch(states, attributes)
+
+    target = topology.states[topology.write_buffer][region]
+    target[...] = np.reshape(new_states, target.shape)
+
+    if topology.attributes is not None and new_attributes is not None:
+        topology.assign_attributes(
+            topology.write_buffer,
+            region,
+            np.reshape(new_attributes, (*target.shape, topology.attributes_number)),
+        )
+
+
+def compute_regions(
+    engine: Engine, topology: FiniteNGridTopology, regions: List[Tuple[slice, ...]]
+) -> List[Tuple[Tuple[slice, ...], np.ndarray]]:
+    """
+    Esta funcion calcula los nuevos valores de las celulas de varias
+    regiones, y retorna las celulas que cambiaron en cada region
+
+    Parameters
+    ----------
+    engine(ArrayEngine|BatchEngine): motor usado para calcular las regiones
+    topology(FiniteNGridTopology): topologia del automata
+    regions(list(tuple(slice))): regiones (en coordenadas que tienen en
+        cuenta la frontera) de las celulas
+
+    Returns
+    -------
+    out(list(tuple)): lista de tuplas con la region y un arreglo que indica
+        que celulas de la region cambiaron
+    """
+    changes = []
+
+    for region in regions:
+        compute_region(engine, topology, region)
+
+        changed = (
+            topology.states[topology.write_buffer][region]
+            != topology.states[topology.read_buffer][region]
+        )
+        if topology.attributes is not None:
+            for field, previous in zip(
+                topology.attributes[topology.write_buffer],
+                topology.attributes[topology.read_buffer],
+            ):
+                changed |= field[region] != previous[region]
+
+        changes.append((region, changed))
+
+    return changes
+
+
+def split_regions(
+    regions: List[Tuple[slice, ...]], slabs: List[Tuple[slice, ...]]
+) -> List[List[Tuple[slice, ...]]]:
+    """
+    Esta funcion divide varias regiones entre los bloques de filas
+
+    Parameters
+    ----------
+    regions(list(tuple(slice))): regiones (en coordenadas que tienen en
+        cuenta la frontera)
+    slabs(list(tuple(slice))): regiones de los bloques de filas (ver
+        get_slabs)
+
+    Returns
+    -------
+    out(list(list(tuple(slice)))): para cada bloque, las partes no vacias de
+        las regiones que estan en sus filas
+    """
+    bands = []
+
+    for slab in slabs:
+        band = []
+        for region in regions:
+            rows = slice(
+                max(slab[0].start, region[0].start), min(slab[0].stop, region[0].stop)
+            )
+            if rows.start < rows.stop:
+                band.append((rows,) + region[1:])
+        bands.append(band)
+
+    return bands
+
+
+def is_threadable(engine: Engine) -> bool:
+    """
+    Esta funcion indica si un motor puede calcular las generaciones por
+    bloques de filas en varios hilos. Solo los motores vectorizados
+    (ArrayEngine) o por bloques (BatchEngine) sobre FiniteNGridTopology
+    calculan regiones independientes. Los motores empaquetados (PackedEngine)
+    no se dividen, ya que con hilos pierden los buffers empaquetados entre
+    generaciones, al igual que los motores que calculan todo el espacio con
+    una sola operacion (ver ArrayEngine.threadable)
+
+    Parameters
+    ----------
+    engine(Engine): motor escogido para la regla y la topologia
+
+    Returns
+    -------
+    out(bool): True si el motor se puede usar en varios hilos
+    """
+    if not isinstance(engine, (ArrayEngine, BatchEngine)) or not isinstance(
+        engine.topology, FiniteNGridTopology
+    ):
+        return False
+
+    return not isinstance(engine, PackedEngine) and getattr(engine, "threadable", True)
+
+
+def get_threads(engine: Engine, threads: Optional[int] = None) -> int:
+    """
+    Esta funcion retorna el numero de hilos usados para calcular las
+    generaciones con un motor, los motores que no se pueden usar en varios
+    hilos (ver is_threadable) usan un solo hilo aunque se pida un numero
+    mayor
+
+    Parameters
+    ----------
+    engine(Engine): motor escogido para la regla y la topologia
+    threads(int|None): numero de hilos pedido, si es None se usa el numero
+        de procesadores cuando el espacio tiene al menos THREADS_MIN_CELLS
+        celulas, y un solo hilo en caso contrario
+
+    Returns
+    -------
+    out(int): numero de hilos
+    """
+    if not is_threadable(engine):
+        return 1
+
+    if threads is not None:
+        return threads
+
+    if np.prod(engine.topology.dimensions) < THREADS_MIN_CELLS:
+        return 1
+
+    return os.cpu_count() or 1
+
+
+def attach_array(
+    name: str, shape: Tuple[int, ...], dtype: np.dtype
+) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    """
+    Esta funcion retorna un arreglo almacenado en un bloque de memoria
+    compartida existente
+
+    Parameters
+    ----------
+    name(str): nombre del bloque de memoria compartida
+    shape(tuple(int)): dimensiones del arreglo
+    dtype(dtype): tipo de los elementos del arreglo
+
+    Returns
+    -------
+    out(tuple): tupla con el bloque de memoria compartida y el arreglo
+    """
+    memory = shared_memory.SharedMemory(name=name)
+
+    return memory, np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+
+
+def run_worker(
+    index, rule, engine_class, topology, buffers, region, command, barriers
+) -> None:
+    """
+    Esta funcion es ejecutada por cada proceso, en cada orden del proceso
+    principal calcula varias generaciones de su bloque de filas. Despues de
+    cada generacion los procesos se sincronizan, de esta forma las filas
+    vecinas de cada bloque (calculadas por otros procesos) estan completas
+    antes de la siguiente generacion
+
+    Parameters
+    ----------
+    index(int): indice del proceso
+    rule(Rule): regla de transicion del automata
+    engine_class(type): clase del motor usado para calcular el bloque
+    topology(FiniteNGridTopology): copia de la topologia sin buffers
+    buffers(list(tuple)): nombre, dimensiones y tipo de los bloques de
+        memoria compartida de los estados y los atributos
+    region(tuple(slice)): region del bloque de filas del proceso
+    command(RawArray): orden del proceso principal, numero de generaciones
+        (negativo para terminar), buffer de lectura y si se intercambian los
+        buffers antes de la primera generacion
+    barriers(tuple(Barrier)): barreras de inicio y fin de cada orden (con el
+        proceso principal) y de cada generacion (solo entre los procesos)
+    """
+    start_barrier, step_barrier, done_barrier = barriers
+    memories = []
+
+    try:
+        for name, shape, dtype in buffers:
+            memory, array = attach_array(name, shape, dtype)
+            memories.append(memory)
+
+            if len(memories) <= 2:
+                topology.states[len(memories) - 1] = array
+            else:
+                # los atributos de cada buffer se comparten por separado
+                buffer, field = divmod(len(memories) - 3, topology.attributes_number)
+                topology.attributes[buffer][field] = array
+
+        engine = engine_class(rule, topology)
+
+        while True:
+            start_barrier.wait()
+
+            generations, read_buffer, flip = command[:]
+            if generations < 0:
+                break
+
+            topology.read_buffer, topology.write_buffer = read_buffer, 1 - read_buffer
+
+            for _ in range(generations):
+                if flip:
+                    topology.read_buffer, topology.write_buffer = (
+                        topology.write_buffer,
+                        topology.read_buffer,
+                    )
+
+                    # un solo proceso calcula la frontera del buffer de
+                    # lectura
+                    if topology.boundary != "constant":
+                        if index == 0:
+                            topology.refresh_border()
+                        step_barrier.wait()
+
+                compute_region(engine, topology, region)
+                step_barrier.wait()
+
+                flip = True
+
+            done_barrier.wait()
+    except Exception:
+        # se liberan los procesos que esperan en las barreras
+        for barrier in barriers:
+            barrier.abort()
+        raise
+    finally:
+        topology.states, topology.attributes = None, None
+        for memory in memories:
+            try:
+                memory.close()
+            except BufferError:
+                pass
+
+
+def shutdown(processes, command, start_barrier, memories) -> None:
+    """
+    Esta funcion termina los procesos y libera la memoria compartida
+
+    Parameters
+    ----------
+    processes(list(Process)): procesos
+    command(RawArray): orden de los procesos
+    start_barrier(Barrier): barrera de inicio de cada orden
+    memories(list(SharedMemory)): bloques de memoria compartida
+    """
+    command[0] = -1
+    try:
+        start_barrier.wait(timeout=1)
+    except Exception:
+        pass
+
+    for process in processes:
+        process.join(timeout=1)
+        if process.is_alive():
+            process.terminate()
+
+    for memory in memories:
+        try:
+            memory.close()
+        except BufferError:
+            # aun existen arreglos que usan la memoria, la memoria se libera
+            # cuando se eliminan
+            pass
+        memory.unlink()
+
+
+class ParallelEngine(Engine):
+    """
+    Este motor calcula las generaciones en varios procesos, cada proceso
+    calcula un bloque de filas del espacio con el motor vectorizado
+    (ArrayEngine) o por bloques (BatchEngine) que escoge select_engine. Los
+    buffers de la topologia se mueven a memoria compartida, y los procesos se
+    sincronizan con una barrera despues de cada generacion
+
+    Cuando no se va a usar mas el motor se debe llamar al metodo close, que
+    termina los procesos y devuelve los buffers a la memoria del proceso
+
+    Parameters
+    ----------
+    rule(Rule): regla de transicion del automata
+    topology(FiniteNGridTopology): topologia del automata
+    workers(int|None): numero de procesos, por defecto el numero de
+        procesadores
+    context(str|None): metodo de inicio de los procesos (ver
+        multiprocessing.get_context)
+    """
+
+    def __init__(
+        self,
+        rule: Rule,
+        topology: FiniteNGridTopology,
+        workers: Optional[int] = None,
+        context: Optional[str] = None,
+    ) -> None:
+        super().__init__(rule, topology)
+
+        if not isinstance(topology, FiniteNGridTopology):
+            raise InvalidParameterError(
+                "el motor paralelo solo funciona con topologias FiniteNGridTopology"
+            )
+
+        engine = select_engine(rule, topology)
+        if not isinstance(engine, (ArrayEngine, BatchEngine)):
+            raise InvalidParameterError(
+                "la regla debe tener un motor vectorizado o implementar "
+                "apply_rule_batch"
+            )
+
+        if workers is None:
+            workers = os.cpu_count()
+        self.slabs = get_slabs(topology, workers)
+
+        # los buffers de la topologia se mueven a memoria compartida
+        self.memories = []
+        buffers = []
+        topology.states = [
+            self.share_array(array, buffers) for array in topology.states
+        ]
+        if topology.attributes is not None:
+            topology.attributes = [
+                [self.share_array(array, buffers) for array in fields]
+                for fields in topology.attributes
+            ]
+
+        # copia de la topologia que se envia a los procesos, sin los buffers
+        worker_topology = copy.copy(topology)
+        worker_topology.states = [None, None]
+        worker_topology.attributes = None
+        if topology.attributes is not None:
+            worker_topology.attributes = [
+                [None] * topology.attributes_number for _ in range(2)
+            ]
+
+        context = multiprocessing.get_context(context)
+        self.command = context.RawArray("q", 3)
+        # barreras de inicio de cada orden, de cada generacion y de fin de
+        # cada orden, el proceso principal debe mantener todas las barreras
+        self.barriers = (
+            context.Barrier(len(self.slabs) + 1),
+            context.Barrier(len(self.slabs)),
+            context.Barrier(len(self.slabs) + 1),
+        )
+
+        self.processes = [
+            context.Process(
+                target=run_worker,
+                args=(
+                    index,
+                    rule,
+                    type(engine),
+                    worker_topology,
+                    buffers,
+                    region,
+                    self.command,
+                    self.barriers,
+                ),
+                daemon=True,
+            )
+            for index, region in enumerate(self.slabs)
+        ]
+        for process in self.processes:
+            process.start()
+
+        self.finalizer = weakref.finalize(
+            self,
+            shutdown,
+            self.processes,
+            self.command,
+            self.barriers[0],
+            self.memories,
+        )
+
+    def share_array(self, array: np.ndarray, buffers: list) -> np.ndarray:
+        """
+        Este metodo copia un arreglo en un nuevo bloque de memoria compartida
+
+        Parameters
+        ----------
+        array(ndarray): arreglo que se copia
+        buffers(list(tuple)): lista en la que se agrega el nombre, las
+            dimensiones y el tipo del bloque
+
+        Returns
+        -------
+        out(ndarray): arreglo almacenado en la memoria compartida
+        """
+        memory = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+        self.memories.append(memory)
+        buffers.append((memory.name, array.shape, array.dtype))
+
+        shared = np.ndarray(array.shape, dtype=array.dtype, buffer=memory.buf)
+        shared[...] = array
+
+        return shared
+
+    def execute(self, generations: int, flip: bool) -> None:
+        """
+        Este metodo ordena a los procesos calcular varias generaciones, y
+        espera a que terminen
+
+        Parameters
+        ----------
+        generations(int): numero de generaciones
+        flip(bool): indica si se intercambian los buffers antes de la
+            primera generacion
+        """
+        if not self.finalizer.alive:
+            raise InvalidParameterError("el motor paralelo ya fue cerrado")
+
+        self.command[:] = (generations, self.topology.read_buffer, int(flip))
+
+        start_barrier, _, done_barrier = self.barriers
+        start_barrier.wait()
+        done_barrier.wait()
+
+        # la topologia no lleva la cuenta de los cambios de los procesos
+        self.topology.mark_changes()
+
+    def step(self) -> None:
+        """
+        Este metodo calcula una generacion del automata
+        """
+        self.execute(1, False)
+
+    def advance(self, generations: int) -> None:
+        """
+        Este metodo calcula varias generaciones del automata, los procesos
+        intercambian los buffers antes de cada generacion
+
+        Parameters
+        ----------
+        generations(int): numero de generaciones
+        """
+        if generations <= 0:
+            return
+
+        self.execute(generations, True)
+
+        # la frontera del buffer de lectura ya fue calculada por los procesos
+        if generations % 2 == 1:
+            self.topology.read_buffer, self.topology.write_buffer = (
+                self.topology.write_buffer,
+                self.topology.read_buffer,
+            )
+
+    def close(self) -> None:
+        """
+        Este metodo termina los procesos, copia los buffers de la topologia a
+        la memoria del proceso y libera la memoria compartida
+        """
+        if not self.finalizer.alive:
+            return
+
+        self.topology.states = [np.array(array) for array in self.topology.states]
+        if self.topology.attributes is not None:
+            self.topology.attributes = [
+                [np.array(array) for array in fields]
+                for fields in self.topology.attributes
+            ]
+
+        self.finalizer()
+
+
+class ThreadedEngine(Engine):
+    """
+    Este motor calcula cada generacion en varios hilos, cada hilo calcula un
+    bloque de filas del espacio con el motor vectorizado (ArrayEngine) o por
+    bloques (BatchEngine) que escoge select_engine. Los hilos escriben en el
+    buffer de escritura de la topologia sin bloqueos, ya que los bloques son
+    disjuntos, y los cambios se registran en la topologia al terminar todos
+    los hilos. Si el motor es vectorizado, solo se calculan los bloques
+    (tiles) cuya vecindad cambio. Si el motor no se puede usar en varios
+    hilos (ver is_threadable), las generaciones se calculan con el motor en
+    el hilo principal
+
+    Parameters
+    ----------
+    rule(Rule): regla de transicion del automata
+    topology(FiniteNGridTopology): topologia del automata
+    threads(int|None): numero de hilos, por defecto el numero de
+        procesadores
+    engine(Engine|None): motor que calcula cada bloque, por defecto el que
+        escoge select_engine
+    """
+
+    def __init__(
+        self,
+        rule: Rule,
+        topology: FiniteNGridTopology,
+        threads: Optional[int] = None,
+        engine: Optional[Engine] = None,
+    ) -> None:
+        super().__init__(rule, topology)
+
+        if not isinstance(topology, FiniteNGridTopology):
+            raise InvalidParameterError(
+                "el motor con hilos solo funciona con topologias FiniteNGridTopology"
+            )
+
+        if engine is None:
+            engine = select_engine(rule, topology)
+        self.engine = engine
+
+        self.threadable = is_threadable(engine)
+        if threads is None:
+            threads = os.cpu_count() or 1
+        if not self.threadable:
+            threads = 1
+        self.slabs = get_slabs(topology, threads)
+
+        self.executor = ThreadPoolExecutor(max_workers=len(self.slabs))
+        self.finalizer = weakref.finalize(self, self.executor.shutdown, wait=False)
+
+    def step(self) -> None:
+        """
+        Este metodo calcula una generacion del automata
+        """
+        if not self.finalizer.alive:
+            raise InvalidParameterError("el motor con hilos ya fue cerrado")
+
+        if not self.threadable:
+            self.engine.step()
+            return
+
+        if isinstance(self.engine, ArrayEngine):
+            regions = self.engine.get_regions()
+        else:
+            regions = [self.topology.subshape]
+
+        bands = split_regions(regions, self.slabs)
+        results = self.executor.map(
+            compute_regions,
+            [self.engine] * len(bands),
+            [self.topology] * len(bands),
+            bands,
+        )
+
+        # los cambios se registran en el hilo principal, los bloques de
+        # cambios pueden ser compartidos por dos bloques de filas
+        self.topology.reset_changes()
+        for changes in list(results):
+            for region, changed in changes:
+                self.topology.mark_changes(region, changed)
+
+    def close(self) -> None:
+        """
+        Este metodo termina los hilos
+        """
+        self.finalizer()
@@ -0,0 +1,169 @@
+"""
+Este modulo implementa la cache de los planes de recoleccion de vecindades
+(ver FiniteNGridTopology.get_gather_plan). Los planes solo dependen de la
+geometria de la topologia y de la vecindad, por lo que se comparten entre
+todas las topologias del proceso
+"""
+
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterable, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+# memoria maxima (en bytes) de los planes almacenados en la cache del proceso
+PLAN_CACHE_MEMORY = 2**28
+
+
+class PlanCache:
+    """
+    Esta clase representa una cache de planes de recoleccion con un limite
+    de memoria, cuando se supera el limite se eliminan los planes usados hace
+    mas tiempo (LRU). Los planes almacenados son de solo lectura
+
+    Parameters
+    ----------
+    max_memory(int): memoria maxima (en bytes) de los planes almacenados
+    """
+
+    def __init__(self, max_memory: int = PLAN_CACHE_MEMORY) -> None:
+        self.max_memory = max_memory
+
+        self.plans = OrderedDict()
+        # memoria usada por los planes almacenados
+        self.memory = 0
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self, key: Hashable, build: Callable[[], npt.NDArray[np.int]]
+    ) -> npt.NDArray[np.int]:
+        """
+        Este metodo retorna el plan asociado a una llave, si no esta en la
+        cache se calcula y se almacena
+
+        Parameters
+        ----------
+        key(hashable): llave del plan
+        build(callable): funcion sin parametros que calcula el plan
+
+        Returns
+        -------
+        out(ndarray(int)): plan de solo lectura
+        """
+        plan = self.plans.get(key)
+
+        if plan is not None:
+            self.hits += 1
+            self.plans.move_to_end(key)
+            return plan
+
+        self.misses += 1
+        plan = build()
+        plan.setflags(write=False)
+
+        # los planes que no caben en la cache no se almacenan
+        if plan.nbytes <= self.max_memory:
+            self.plans[key] = plan
+            self.memory += plan.nbytes
+            self.evict()
+
+        return plan
+
+    def evict(self) -> None:
+        """
+        Este metodo elimina los planes usados hace mas tiempo hasta que la
+        memoria usada no supera el limite
+        """
+        while self.memory > self.max_memory:
+            _, plan = self.plans.popitem(last=False)
+            self.memory -= plan.nbytes
+
+    def set_max_memory(self, max_memory: int) -> None:
+        """
+        Este metodo cambia la memoria maxima de la cache
+
+        Parameters
+        ----------
+        max_memory(int): memoria maxima (en bytes) de los planes almacenados
+        """
+        self.max_memory = max_memory
+        self.evict()
+
+    def clear(self) -> None:
+        """
+        Este metodo elimina todos los planes y reinicia los contadores
+        """
+        self.plans.clear()
+        self.memory = 0
+
+        self.hits = 0
+        self.misses = 0
+
+    def get_statistics(self) -> dict:
+        """
+        Este metodo retorna estadisticas del uso de la cache
+
+        Returns
+        -------
+        out(dict): diccionario con el numero de planes (plans), la memoria
+            usada y la maxima en bytes (memory, max_memory), los aciertos
+            (hits) y fallos (misses) de la cache y la tasa de aciertos
+            (hit_rate)
+        """
+        lookups = self.hits + self.misses
+
+        return {
+            "plans": len(self.plans),
+            "memory": self.memory,
+            "max_memory": self.max_memory,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups != 0 else 0.0,
+        }
+
+
+# cache compartida por todas las topologias del proceso
+plan_cache = PlanCache()
+
+
+def get_plan_key(
+    kind: str,
+    real_dimensions: Iterable[int],
+    border_widths: Iterable[int],
+    mask: npt.NDArray[np.bool_],
+    offset: Iterable[int],
+    region: Optional[Tuple[slice, ...]] = None,
+) -> Tuple:
+    """
+    Esta funcion retorna la llave de un plan en la cache
+
+    Parameters
+    ----------
+    kind(str): tipo de plan ("displacements" o "gather")
+    real_dimensions(tuple(int)|list(int)|ndarray(int)): dimensiones del
+        espacio incluyendo la frontera
+    border_widths(tuple(int)|list(int)|ndarray(int)): dimensiones de la
+        frontera
+    mask(ndarray(bool)): arreglo que representa alguna vecindad
+    offset(tuple(int)|list(int)|ndarray(int)): offset de la mascara
+    region(tuple(slice)|None): region de celulas del plan
+
+    Returns
+    -------
+    out(tuple): llave del plan
+    """
+    if region is not None:
+        region = tuple((axis.start, axis.stop) for axis in region)
+
+    return (
+        kind,
+        tuple(int(i) for i in real_dimensions),
+        tuple(int(i) for i in border_widths),
+        mask.shape,
+        np.asarray(mask, dtype=bool).tobytes(),
+        tuple(int(i) for i in offset),
+        np.dtype(np.intp).str,
+        region,
+    )
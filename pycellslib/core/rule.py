@@ -8,6 +8,12 @@ class Rule(metaclass=ABCMeta):
     vecindad
     """
 
+    # indica si apply_rule depende unicamente de los estados y atributos de
+    # la vecindad, solo las reglas que asignan True se pueden tabular (ver
+    # TableEngine), por defecto es False para no tabular reglas aleatorias o
+    # con estado interno
+    deterministic = False
+
     @abstractmethod
     def get_neighborhood(self):
         """
@@ -28,7 +34,9 @@ class Rule(metaclass=ABCMeta):
         ----------
         cell_states(ndarray(int)): arreglo que representa los estados de la
             vecindad de una celula (es retornado por el metodo apply_mask de
-            la clase topology)
+            la clase topology), es de tipo int64 aunque la topologia almacene
+            los estados en un tipo menor (ver
+            FiniteNGridTopology.compact_states)
         cell_attributes(ndarray(float)): arreglo que representa los atributos
             de la vecindad de una celula (es retornado por el metodo apply_mask
             de la clase topology)
@@ -41,3 +49,80 @@ class Rule(metaclass=ABCMeta):
             componente debe ser el valor del estado y las demas componentes,
             los valores de los atributos
         """
+
+    # este metodo no es abstracto, las reglas que no lo implementan se
+    # evaluan celula por celula usando el metodo apply_rule
+    def apply_rule_batch(self, cell_states, cell_attributes):
+        """
+        Este metodo aplica las reglas de transicion a un bloque de vecindades,
+        su implementacion es opcional. Cuando una regla lo implementa, el
+        automata lo usa en lugar de apply_rule, de esta forma se evita una
+        llamada por celula
+
+        Parameters
+        ----------
+        cell_states(ndarray(int)): arreglo de tipo int64 y dimensiones
+            (n, k) donde cada fila son los estados de la vecindad de una
+            celula (en el mismo orden que retorna el metodo apply_mask de la
+            clase topology)
+        cell_attributes(ndarray(float)|None): arreglo de dimensiones
+            (n, k, a) con los atributos de las vecindades, si las celulas no
+            tienen atributos se pasa None
+
+        Returns
+        -------
+        out(tuple): tupla cuya primera componente es un arreglo de dimension n
+            con los nuevos estados de las celulas, y la segunda componente un
+            arreglo de dimensiones (n, a) con los nuevos atributos, o None en
+            caso de que las celulas no tengan atributos
+        """
+        raise NotImplementedError
+
+    # este metodo no es abstracto, las reglas que no lo implementan no se
+    # compilan
+    def get_transition_function(self):
+        """
+        Este metodo retorna la funcion de transicion de la regla como una
+        funcion pura que puede compilarse con numba, su implementacion es
+        opcional. Cuando numba esta instalado, el automata compila la funcion
+        junto con el recorrido de las celulas (ver pycellslib.core.jit), en
+        caso contrario se usa apply_rule
+
+        La funcion debe cumplir el siguiente contrato:
+            - recibe unicamente un arreglo unidimensional de enteros con los
+              estados de la vecindad (en el mismo orden que retorna el metodo
+              apply_mask de la clase topology) y retorna el nuevo estado
+              (int) de la celula
+            - no depende de los atributos de las celulas, ni de la posicion
+              de la celula, ni de self u otro estado mutable, los parametros
+              de la regla deben capturarse como constantes (por ejemplo en
+              una clausura)
+            - no modifica el arreglo que recibe
+            - produce el mismo estado que apply_rule para cualquier vecindad
+
+        Returns
+        -------
+        out(callable|None): funcion de transicion, o None en caso de que la
+            regla no pueda compilarse
+        """
+        return None
+
+    # este metodo no es abstracto, las reglas que no lo implementan usan los
+    # motores genericos
+    def get_engine(self, topology):
+        """
+        Este metodo retorna un motor especializado para calcular las
+        generaciones de esta regla sobre una topologia, su implementacion es
+        opcional. El automata usa este motor, en caso de existir, en lugar de
+        los motores genericos
+
+        Parameters
+        ----------
+        topology(Topology): topologia del automata
+
+        Returns
+        -------
+        out(Engine|None): motor especializado, o None en caso de que la regla
+            no tenga un motor para la topologia dada
+        """
+        return None
@@ -1,10 +1,31 @@
+import itertools
 from abc import ABCMeta, abstractmethod
 from typing import Iterable, List, Optional, Tuple, Union
 
 import numpy as np
 import numpy.typing as npt
 
-from pycellslib.utils import PositionIterator
+from pycellslib.core.plan_cache import get_plan_key, plan_cache
+from pycellslib.errors import InvalidParameterError
+from pycellslib.utils import (
+    PositionIterator,
+    get_states_dtype,
+    get_windows,
+    unique_rows,
+)
+
+# numero de celulas por eje de los bloques (tiles) en los que se divide el
+# espacio para llevar la cuenta de los cambios
+TILE_SIZE = 32
+
+# numero de celulas por eje de los bloques (chunks) de UnboundedNGridTopology
+CHUNK_SIZE = 64
+
+# tipos de frontera de FiniteNGridTopology: en la frontera constante las
+# celulas tienen el valor asignado con set_border_values, en la periodica
+# (toroidal) el espacio se cierra sobre si mismo y en la reflectiva la
+# frontera es el reflejo de las celulas cercanas al borde
+BOUNDARY_MODES = ("constant", "periodic", "reflective")
 
 
 class Topology(metaclass=ABCMeta):
@@ -91,11 +112,16 @@ class Topology(metaclass=ABCMeta):
         """
 
     @abstractmethod
-    def get_attributes(self):
+    def get_attributes(self, attribute=None):
         """
         Este metodo retorna los atributos de las celulas, no se tiene en cuenta
         la frontera
 
+        Parameters
+        ----------
+        attribute(int|None): indice de un atributo, si es None se retornan
+            todos los atributos
+
         Returns
         -------
         out(list(float)|tuple(float)|ndarray(float)): atributos de las celulas
@@ -194,6 +220,18 @@ class FiniteNGridTopology(Topology):
     dimensions(tuple(int)|list(int)|ndarray(int)): dimensiones del espacio
     border_widths(tuple(int)|list(int)|ndarray(int)): dimensiones de la
         frontera. Estas dimensiones se le suman a las dimensiones del espacio
+    boundary(str): tipo de frontera, alguno de BOUNDARY_MODES. En las
+        fronteras periodica y reflectiva los valores de la frontera se
+        calculan en cada generacion (ver refresh_border)
+    attributes_dtype(dtype|list(dtype)|None): tipo (entero o real) de los
+        atributos, o una lista con el tipo de cada atributo. Cada atributo se
+        almacena en un arreglo contiguo de su tipo, con float32 o uint8 los
+        buffers de atributos ocupan menos memoria. Si es None los atributos
+        son de tipo float y el automata usa los tipos de sus celulas (ver
+        set_attributes_fields)
+    states_dtype(dtype|None): tipo entero de los estados, si es None el
+        automata usa el menor tipo que contiene los estados de sus celulas
+        (ver compact_states)
     """
 
     def __init__(
@@ -201,9 +239,23 @@ class FiniteNGridTopology(Topology):
         attributes_number: int,
         dimensions: Union[Iterable[int], npt.NDArray[np.int]],
         border_widths: Union[Iterable[int], npt.NDArray[np.int]],
+        boundary: str = "constant",
+        attributes_dtype: Optional[
+            Union[npt.DTypeLike, Iterable[npt.DTypeLike]]
+        ] = None,
+        states_dtype: Optional[npt.DTypeLike] = None,
     ) -> None:
         # numero de atributos de cada celula en el espacio
         self.attributes_number = attributes_number
+        # nombre de cada atributo, los atributos se pueden seleccionar por
+        # indice o por nombre (ver get_attribute_index)
+        self.attributes_names = [""] * attributes_number
+        # tipo de cada atributo, solo se modifica (ver set_attributes_fields)
+        # si no se especifica
+        self.fixed_attributes_dtypes = attributes_dtype is not None
+        self.attributes_dtypes = self.check_attributes_dtypes(
+            float if attributes_dtype is None else attributes_dtype
+        )
         # dimensiones del espacio sin tener en cuenta la frontera
         self.dimensions = np.array(dimensions, dtype=int)
         # dimensiones de la frontera
@@ -218,19 +270,70 @@ class FiniteNGridTopology(Topology):
             for i in range(self.dimensions.size)
         )
 
+        if boundary not in BOUNDARY_MODES:
+            raise InvalidParameterError(f"tipo de frontera desconocido: {boundary}")
+
+        if boundary != "constant" and np.any(self.border_widths > self.dimensions):
+            raise InvalidParameterError("la frontera no puede ser mayor que el espacio")
+        self.boundary = boundary
+
+        # regiones disjuntas que cubren la frontera, y las copias que calculan
+        # la frontera a partir de las celulas, se calculan una sola vez
+        self.border_regions = []
+        self.border_copies = []
+        for axis, (dimension, border) in enumerate(
+            zip(self.dimensions, self.border_widths)
+        ):
+            if border == 0:
+                continue
+
+            low, high = slice(0, border), slice(border + dimension, None)
+            # en cada eje se excluye la frontera de los ejes anteriores
+            self.border_regions.append((*self.subshape[:axis], low))
+            self.border_regions.append((*self.subshape[:axis], high))
+
+            if boundary == "periodic":
+                low_source = slice(dimension, dimension + border)
+                high_source = slice(border, 2 * border)
+            else:
+                low_source = slice(2 * border - 1, border - 1, -1)
+                high_source = slice(dimension + border - 1, dimension - 1, -1)
+
+            # las copias incluyen la frontera de los demas ejes, de esta forma
+            # tambien se calculan las esquinas
+            full = (slice(None),) * axis
+            self.border_copies.append(((*full, low), (*full, low_source)))
+            self.border_copies.append(((*full, high), (*full, high_source)))
+
+        # distancia, en el arreglo aplanado, entre celulas consecutivas a lo
+        # largo de cada eje
+        self.flat_strides = np.cumprod((1, *self.real_dimensions[:0:-1]))[::-1]
+
+        # tipo de los estados, solo se reduce (ver compact_states) si no se
+        # especifica
+        self.fixed_states_dtype = states_dtype is not None
+        self.states_dtype = np.dtype(int if states_dtype is None else states_dtype)
+        if not np.issubdtype(self.states_dtype, np.integer):
+            raise InvalidParameterError("los estados deben ser de tipo entero")
+
         # el indice 0 corresponde al buffer 1 y el indice 1 corresponde al
         # buffer 2
         self.states = [
-            np.zeros(self.real_dimensions, dtype=int),
-            np.zeros(self.real_dimensions, dtype=int),
+            np.zeros(self.real_dimensions, dtype=self.states_dtype),
+            np.zeros(self.real_dimensions, dtype=self.states_dtype),
         ]
 
-        # si se tienen 0 atributos, entonces no hace falta crear un array
-        self.attributes = []
+        # cada atributo se almacena en un arreglo contiguo de su tipo, esto
+        # es, self.attributes[buffer][k] son los valores del atributo k. Si se
+        # tienen 0 atributos, entonces no hace falta crear los arreglos
+        self.attributes = None
         if attributes_number != 0:
             self.attributes = [
-                np.zeros((*self.real_dimensions, attributes_number), dtype=float),
-                np.zeros((*self.real_dimensions, attributes_number), dtype=float),
+                [
+                    np.zeros(self.real_dimensions, dtype=dtype)
+                    for dtype in self.attributes_dtypes
+                ]
+                for _ in range(2)
             ]
 
         # estos atributos llevan la cuenta de que buffer se usa para lectura y
@@ -238,6 +341,174 @@ class FiniteNGridTopology(Topology):
         self.write_buffer = 0
         self.read_buffer = 1
 
+        # el espacio se divide en bloques, y se lleva la cuenta de los bloques
+        # que cambiaron en la ultima generacion (ver set_tile_shape)
+        self.set_tile_shape((TILE_SIZE,) * self.dimensions.size)
+        # indica si la frontera de los 2 buffers es distinta, en ese caso la
+        # vecindad de las celulas cercanas a la frontera cambia en cada paso
+        self.border_differs = False
+
+    def compact_states(self, states: Iterable[int]) -> None:
+        """
+        Este metodo reduce el tipo de los estados al menor tipo entero que
+        contiene los estados dados y los valores actuales de los buffers
+        (incluyendo la frontera), de esta forma los motores vectorizados
+        recorren menos memoria en cada generacion (con 2 estados, 8 veces
+        menos que con int64). Si el tipo se especifico al crear la topologia
+        no se modifica. Los valores que se asignen despues deben caber en el
+        nuevo tipo
+
+        Parameters
+        ----------
+        states(tuple(int)|list(int)|ndarray(int)): posibles estados de las
+            celulas (ver CellInformation.get_states)
+        """
+        if self.fixed_states_dtype:
+            return
+
+        values = [*states]
+        for buffer in self.states:
+            values.extend((buffer.min(), buffer.max()))
+
+        dtype = get_states_dtype(values)
+        if dtype != self.states_dtype:
+            self.states = [buffer.astype(dtype) for buffer in self.states]
+            self.states_dtype = dtype
+
+    def check_attributes_dtypes(
+        self, dtypes: Union[npt.DTypeLike, Iterable[npt.DTypeLike]]
+    ) -> List[np.dtype]:
+        """
+        Este metodo revisa los tipos de los atributos
+
+        Parameters
+        ----------
+        dtypes(dtype|list(dtype)): tipo de todos los atributos, o una lista
+            con el tipo de cada atributo
+
+        Returns
+        -------
+        out(list(dtype)): tipo de cada atributo
+        """
+        if isinstance(dtypes, (list, tuple)):
+            dtypes = [np.dtype(dtype) for dtype in dtypes]
+        else:
+            dtypes = [np.dtype(dtypes)] * self.attributes_number
+
+        if len(dtypes) != self.attributes_number:
+            raise InvalidParameterError("se debe especificar un tipo por atributo")
+
+        if not all(
+            np.issubdtype(dtype, np.integer) or np.issubdtype(dtype, np.floating)
+            for dtype in dtypes
+        ):
+            raise InvalidParameterError("los atributos deben ser de tipo entero o real")
+
+        return dtypes
+
+    def set_attributes_fields(
+        self,
+        names: Iterable[Optional[str]],
+        dtypes: Optional[Iterable[npt.DTypeLike]] = None,
+    ) -> None:
+        """
+        Este metodo establece el nombre y el tipo de cada atributo, los
+        valores actuales de los buffers se convierten a los nuevos tipos. Si
+        los tipos se especificaron al crear la topologia no se modifican
+
+        Parameters
+        ----------
+        names(list(str|None)): nombre de cada atributo (ver
+            CellInformation.get_name_of_attributes)
+        dtypes(list(dtype)|None): tipo de cada atributo (ver
+            CellInformation.get_dtype_of_attributes), si es None no se
+            modifican los tipos
+        """
+        names = [name or "" for name in names]
+        if len(names) != self.attributes_number:
+            raise InvalidParameterError("se debe especificar un nombre por atributo")
+        self.attributes_names = names
+
+        if dtypes is None or self.fixed_attributes_dtypes or self.attributes is None:
+            return
+
+        self.attributes_dtypes = self.check_attributes_dtypes(list(dtypes))
+        self.attributes = [
+            [
+                field.astype(dtype)
+                for field, dtype in zip(fields, self.attributes_dtypes)
+            ]
+            for fields in self.attributes
+        ]
+
+    def get_attribute_index(self, attribute: Union[int, str]) -> int:
+        """
+        Este metodo retorna el indice de un atributo
+
+        Parameters
+        ----------
+        attribute(int|str): indice o nombre del atributo
+
+        Returns
+        -------
+        out(int): indice del atributo
+        """
+        if isinstance(attribute, str):
+            if attribute == "" or attribute not in self.attributes_names:
+                raise InvalidParameterError(
+                    f"las celulas no tienen el atributo {attribute!r}"
+                )
+
+            return self.attributes_names.index(attribute)
+
+        if not 0 <= attribute < self.attributes_number:
+            raise InvalidParameterError(
+                f"las celulas no tienen el atributo {attribute}"
+            )
+
+        return int(attribute)
+
+    def stack_attributes(self, buffer: int, index: Tuple = (...,)) -> npt.NDArray:
+        """
+        Este metodo retorna los atributos de las celulas de una region de un
+        buffer en un unico arreglo, cuya ultima dimension recorre los
+        atributos. El arreglo es una copia, del tipo comun de los atributos
+
+        Parameters
+        ----------
+        buffer(int): indice del buffer
+        index(tuple): posicion o region de las celulas, por defecto todas
+            las celulas incluyendo la frontera
+
+        Returns
+        -------
+        out(ndarray): arreglo de dimensiones (*region, a) con los atributos
+        """
+        return np.stack([field[index] for field in self.attributes[buffer]], axis=-1)
+
+    def assign_attributes(
+        self,
+        buffer: int,
+        index: Tuple,
+        values: Union[List[float], npt.NDArray],
+    ) -> None:
+        """
+        Este metodo asigna los atributos de las celulas de una region de un
+        buffer, cada atributo se convierte al tipo de su arreglo
+
+        Parameters
+        ----------
+        buffer(int): indice del buffer
+        index(tuple): posicion o region de las celulas
+        values(list(float)|ndarray): valores de los atributos, la ultima
+            dimension recorre los atributos (con una sola dimension se asignan
+            los mismos valores a todas las celulas)
+        """
+        values = np.asarray(values)
+
+        for k, field in enumerate(self.attributes[buffer]):
+            field[index] = values[..., k]
+
     def get_offset(self) -> npt.NDArray[np.int]:
         """
         Este metodo debe retornar el offset que se le hacen a las posiciones
@@ -272,6 +543,26 @@ class FiniteNGridTopology(Topology):
         self.write_buffer %= 2
         self.read_buffer %= 2
 
+        # la frontera del nuevo buffer de lectura depende de sus celulas
+        self.refresh_border()
+
+    def refresh_border(self) -> None:
+        """
+        Este metodo calcula la frontera del buffer de lectura a partir de sus
+        celulas cuando la frontera es periodica o reflectiva, con una copia
+        por cada lado de cada eje. En la frontera constante no hace nada
+        """
+        if self.boundary == "constant":
+            return
+
+        arrays = [self.states[self.read_buffer]]
+        if self.attributes is not None:
+            arrays.extend(self.attributes[self.read_buffer])
+
+        for array in arrays:
+            for target, source in self.border_copies:
+                array[target] = array[source]
+
     def get_cell(
         self, position: Tuple[int]
     ) -> Tuple[int, Optional[npt.NDArray[np.float]]]:
@@ -295,7 +586,7 @@ class FiniteNGridTopology(Topology):
 
         attributes = None
         if self.attributes is not None:
-            attributes = self.attributes[self.read_buffer][position]
+            attributes = self.stack_attributes(self.read_buffer, position)
 
         return state, attributes
 
@@ -310,16 +601,32 @@ class FiniteNGridTopology(Topology):
         """
         return self.states[self.read_buffer][self.subshape]
 
-    def get_attributes(self) -> npt.NDArray[np.float]:
+    def get_attributes(
+        self, attribute: Optional[Union[int, str]] = None
+    ) -> Optional[npt.NDArray]:
         """
         Este metodo retorna los atributos de las celulas, no se tiene en cuenta
         la frontera
 
+        Parameters
+        ----------
+        attribute(int|str|None): indice o nombre de un atributo, si es None
+            se retornan todos los atributos
+
         Returns
         -------
-        out(ndarray(float)): atributos de las celulas
+        out(ndarray|None): vista con los valores del atributo dado, o copia
+            de dimensiones (*dimensions, a) con todos los atributos. None en
+            caso de que las celulas no tengan atributos
         """
-        return self.attributes[self.read_buffer][self.subshape]
+        if self.attributes is None:
+            return None
+
+        if attribute is None:
+            return self.stack_attributes(self.read_buffer, self.subshape)
+
+        index = self.get_attribute_index(attribute)
+        return self.attributes[self.read_buffer][index][self.subshape]
 
     def update_cell(
         self,
@@ -342,8 +649,22 @@ class FiniteNGridTopology(Topology):
         """
         self.states[self.write_buffer][position] = cell_state
 
-        if self.attributes is not None:
-            self.attributes[self.write_buffer][position] = cell_attributes
+        if self.attributes is not None and cell_attributes is not None:
+            self.assign_attributes(self.write_buffer, position, cell_attributes)
+
+        if all(
+            axis.start <= position[i] < axis.stop
+            for i, axis in enumerate(self.subshape)
+        ):
+            tile = tuple(
+                (position[i] - self.border_widths[i]) // self.tile_shape[i]
+                for i in range(self.dimensions.size)
+            )
+            self.changed_tiles[tile] = True
+        else:
+            # la celula esta en la frontera
+            self.border_differs = True
+            self.mark_changes()
 
     def set_border_values(
         self,
@@ -351,7 +672,8 @@ class FiniteNGridTopology(Topology):
         cell_attributes: Optional[Union[List[float], npt.NDArray[np.float]]] = None,
     ) -> None:
         """
-        Este metodo establece el valor en los bordes
+        Este metodo establece el valor en los bordes, solo se permite con la
+        frontera constante
 
         Parameters
         ----------
@@ -360,14 +682,28 @@ class FiniteNGridTopology(Topology):
             de los atributos en los bordes, cada elemento de la lista
             especifica un atributo
         """
-        # se crea mascara para establecer el valor en los bordes
-        mask = np.ones(self.real_dimensions, dtype=bool)
-        # el subshape no hace parte de la frontera
-        mask[self.subshape] = 0
-        self.states[self.write_buffer][mask] = cell_state
+        if self.boundary != "constant":
+            raise InvalidParameterError(
+                "los valores de la frontera se calculan a partir de las celulas"
+            )
+
+        for region in self.border_regions:
+            self.states[self.write_buffer][region] = cell_state
 
+            if self.attributes is not None and cell_attributes is not None:
+                self.assign_attributes(self.write_buffer, region, cell_attributes)
+
+        arrays = [self.states]
         if self.attributes is not None:
-            self.attributes[self.write_buffer][mask] = cell_attributes
+            arrays.extend(zip(*self.attributes))
+
+        self.border_differs = any(
+            np.any(first[region] != second[region])
+            for first, second in arrays
+            for region in self.border_regions
+        )
+        # la vecindad de las celulas cercanas a la frontera cambio
+        self.mark_changes()
 
     def set_values_from(
         self,
@@ -386,8 +722,10 @@ class FiniteNGridTopology(Topology):
         """
         self.states[self.write_buffer][self.subshape] = cell_state
 
-        if self.attributes is not None:
-            self.attributes[self.write_buffer][self.subshape] = cell_attributes
+        if self.attributes is not None and cell_attributes is not None:
+            self.assign_attributes(self.write_buffer, self.subshape, cell_attributes)
+
+        self.mark_changes()
 
     def set_values_from_configuration(
         self,
@@ -408,8 +746,10 @@ class FiniteNGridTopology(Topology):
         """
         self.states[self.write_buffer][self.subshape] = cell_states
 
-        if self.attributes is not None:
-            self.attributes[self.write_buffer][self.subshape] = cell_attributes
+        if self.attributes is not None and cell_attributes is not None:
+            self.assign_attributes(self.write_buffer, self.subshape, cell_attributes)
+
+        self.mark_changes()
 
     def apply_mask(
         self, position: Tuple[int, int], mask: npt.NDArray[np.int]
@@ -427,21 +767,1520 @@ class FiniteNGridTopology(Topology):
 
         Returns
         ------
-        out(tuple): Tupla donde la primera componente es un array con los
-            estados de las celulas que representan la vecindad, y la segunda
-            componente un array con los atributos de cada celula, si las
+        out(tuple): Tupla donde la primera componente es un array de tipo
+            int64 con los estados de las celulas que representan la vecindad,
+            y la segunda componente un array con los atributos de cada celula,
+            si las celulas no tienen atributos se retorna None
+        """
+        # posicion de la celula en el arreglo aplanado
+        start = sum(
+            int(position[i]) * self.flat_strides[i] for i in range(len(position))
+        )
+        indices = self.get_flat_displacements(mask) + start
+
+        # los estados se retornan en int64 sin importar el tipo del buffer
+        # (ver compact_states), de esta forma las reglas pueden restar estados
+        # sin desbordamientos
+        states = self.states[self.read_buffer].ravel()[indices].astype(np.int64)
+
+        attributes = None
+        if self.attributes is not None:
+            attributes = np.stack(
+                [field.ravel()[indices] for field in self.attributes[self.read_buffer]],
+                axis=-1,
+            )
+
+        return states, attributes
+
+    def get_flat_displacements(
+        self,
+        mask: npt.NDArray[np.bool_],
+        offset: Optional[Union[Iterable[int], npt.NDArray[np.int]]] = None,
+    ) -> npt.NDArray[np.int]:
+        """
+        Este metodo retorna la distancia, en el arreglo aplanado, entre una
+        celula y cada una de las componentes True de la mascara
+
+        Parameters
+        ----------
+        mask(ndarray(bool)): arreglo que representa alguna vecindad
+        offset(tuple(int)|list(int)|ndarray(int)|None): offset de la mascara,
+            por defecto es 0
+
+        Returns
+        -------
+        out(ndarray(int)): arreglo de dimensiones (k,) con las distancias, en
+            el mismo orden que retorna apply_mask
+        """
+        if offset is None:
+            offset = np.zeros(mask.ndim, dtype=int)
+
+        key = get_plan_key(
+            "displacements", self.real_dimensions, self.border_widths, mask, offset
+        )
+
+        def build():
+            displacements = (np.argwhere(mask) + offset) @ self.flat_strides
+            return displacements.astype(np.intp)
+
+        return plan_cache.get(key, build)
+
+    def get_gather_plan(
+        self,
+        mask: npt.NDArray[np.bool_],
+        offset: Union[Iterable[int], npt.NDArray[np.int]],
+        region: Optional[Tuple[slice, ...]] = None,
+    ) -> npt.NDArray[np.int]:
+        """
+        Este metodo retorna el plan de recoleccion de las vecindades de las
+        celulas de una region, esto es, por cada componente True de la
+        mascara, un arreglo con los indices en el arreglo aplanado de esa
+        componente para cada celula. Los planes se almacenan en la cache del
+        proceso (ver plan_cache), y se comparten entre las topologias con la
+        misma geometria
+
+        Parameters
+        ----------
+        mask(ndarray(bool)): arreglo que representa alguna vecindad
+        offset(tuple(int)|list(int)|ndarray(int)): offset de la mascara
+        region(tuple(slice)|None): region de celulas (en coordenadas que
+            tienen en cuenta la frontera), si es None se usan todas las
+            celulas actualizables
+
+        Returns
+        -------
+        out(ndarray(int)): arreglo de dimensiones (k, n) con los indices de
+            las vecindades de las n celulas de la region (en el orden de los
+            indices)
+        """
+        if region is None:
+            region = self.subshape
+
+        # se revisa que la frontera sea suficiente para aplicar la mascara
+        self.get_windows_region(mask, offset, region)
+
+        key = get_plan_key(
+            "gather", self.real_dimensions, self.border_widths, mask, offset, region
+        )
+
+        def build():
+            # posiciones de las celulas de la region en el arreglo aplanado
+            cells = sum(
+                np.ix_(
+                    *(
+                        np.arange(axis.start, axis.stop, dtype=np.intp) * stride
+                        for axis, stride in zip(region, self.flat_strides)
+                    )
+                )
+            ).ravel()
+
+            displacements = self.get_flat_displacements(mask, offset)
+            return displacements[:, None] + cells
+
+        return plan_cache.get(key, build)
+
+    def get_windows_region(
+        self,
+        mask: npt.NDArray[np.bool_],
+        offset: Union[Iterable[int], npt.NDArray[np.int]],
+        region: Optional[Tuple[slice, ...]] = None,
+    ) -> Tuple[slice, ...]:
+        """
+        Este metodo retorna la region de las posiciones en las que empiezan
+        las vecindades de las celulas de una region, y revisa que la frontera
+        sea suficiente para aplicar la mascara en todas ellas
+
+        Parameters
+        ----------
+        mask(ndarray(bool)): arreglo que representa alguna vecindad
+        offset(tuple(int)|list(int)|ndarray(int)): offset de la mascara
+        region(tuple(slice)|None): region de celulas (en coordenadas que
+            tienen en cuenta la frontera), si es None se usan todas las
+            celulas actualizables
+
+        Returns
+        -------
+        out(tuple(slice)): region de las posiciones en las que empiezan las
+            vecindades
+        """
+        if region is None:
+            region = self.subshape
+
+        # la vecindad de la celula en la posicion p empieza en p + offset
+        windows_region = []
+        for i, (axis, size) in enumerate(zip(region, mask.shape)):
+            start, stop = axis.start + offset[i], axis.stop + offset[i]
+
+            if start < 0 or stop + size - 1 > self.real_dimensions[i]:
+                raise InvalidParameterError(
+                    "la frontera no es suficiente para aplicar la mascara"
+                )
+
+            windows_region.append(slice(start, stop))
+
+        return tuple(windows_region)
+
+    def get_neighborhoods_view(
+        self,
+        mask: npt.NDArray[np.bool_],
+        offset: Union[Iterable[int], npt.NDArray[np.int]],
+        region: Optional[Tuple[slice, ...]] = None,
+    ) -> Tuple[npt.NDArray[np.int], Optional[npt.NDArray[np.float]]]:
+        """
+        Este metodo retorna las vecindades de todas las celulas de una region
+        como una vista de solo lectura del buffer de lectura, esto es, no se
+        copia memoria. La vista contiene la region completa que cubre la
+        mascara, para quedarse solo con las componentes True de la mascara se
+        usa el metodo compact_neighborhoods
+
+        Parameters
+        ----------
+        mask(ndarray(bool)): arreglo que representa alguna vecindad
+        offset(tuple(int)|list(int)|ndarray(int)): offset de la mascara
+        region(tuple(slice)|None): region de celulas (en coordenadas que
+            tienen en cuenta la frontera) de las que se extraen las
+            vecindades, si es None se usan todas las celulas actualizables
+
+        Returns
+        -------
+        out(tuple): Tupla donde la primera componente es una vista de
+            dimensiones (*region, *mask.shape) con los estados de las
+            vecindades, y la segunda componente una lista con una vista de
+            dimensiones (*region, *mask.shape) por cada atributo, si las
+            celulas no tienen atributos se retorna None
+        """
+        windows_region = self.get_windows_region(mask, offset, region)
+
+        states = get_windows(self.states[self.read_buffer], mask.shape, windows_region)
+
+        attributes = None
+        if self.attributes is not None:
+            attributes = [
+                get_windows(field, mask.shape, windows_region)
+                for field in self.attributes[self.read_buffer]
+            ]
+
+        return states, attributes
+
+    def compact_neighborhoods(
+        self,
+        states: npt.NDArray[np.int],
+        attributes: Optional[npt.NDArray[np.float]],
+        mask: npt.NDArray[np.bool_],
+    ) -> Tuple[npt.NDArray[np.int], Optional[npt.NDArray[np.float]]]:
+        """
+        Este metodo se queda solo con las componentes True de la mascara en
+        las vecindades retornadas por get_neighborhoods_view
+
+        Parameters
+        ----------
+        states(ndarray(int)): vista de dimensiones (*region, *mask.shape) con
+            los estados de las vecindades
+        attributes(list(ndarray)|None): lista con una vista de dimensiones
+            (*region, *mask.shape) por cada atributo
+        mask(ndarray(bool)): arreglo que representa alguna vecindad
+
+        Returns
+        -------
+        out(tuple): Tupla donde la primera componente es un array de
+            dimensiones (*region, k) con los estados de las vecindades (en el
+            mismo orden que retorna apply_mask), y la segunda componente un
+            array de dimensiones (*region, k, a) con los atributos, si las
             celulas no tienen atributos se retorna None
         """
-        # se extrae la region en donde se aplicara la mascara
-        subshape = tuple(
-            slice(position[i], position[i] + mask.shape[i])
-            for i in range(len(mask.shape))
+        states = states[(..., mask)]
+
+        if attributes is not None:
+            attributes = np.stack([field[(..., mask)] for field in attributes], axis=-1)
+
+        return states, attributes
+
+    def apply_mask_batch(
+        self,
+        region: Tuple[slice, ...],
+        mask: npt.NDArray[np.bool_],
+        offset: Union[Iterable[int], npt.NDArray[np.int]],
+    ) -> Tuple[npt.NDArray[np.int], Optional[npt.NDArray[np.float]]]:
+        """
+        Este metodo retorna las vecindades de todas las celulas de una region
+        en un unico arreglo
+
+        Parameters
+        ----------
+        region(tuple(slice)): region de celulas (en coordenadas que tienen en
+            cuenta la frontera) de las que se extraen las vecindades
+        mask(ndarray(bool)): arreglo que representa alguna vecindad
+        offset(tuple(int)|list(int)|ndarray(int)): offset de la mascara
+
+        Returns
+        -------
+        out(tuple): Tupla donde la primera componente es un array de tipo
+            int64 y dimensiones (n, k) con los estados de las vecindades de
+            las n celulas de la region (en el orden de los indices), y la
+            segunda componente un array de dimensiones (n, k, a) con los
+            atributos, si las celulas no tienen atributos se retorna None
+        """
+        states, attributes = self.compact_neighborhoods(
+            *self.get_neighborhoods_view(mask, offset, region), mask
         )
 
-        states = self.states[self.read_buffer][subshape][mask]
+        neighbors = states.shape[-1]
+        if attributes is not None:
+            attributes = attributes.reshape(-1, neighbors, self.attributes_number)
+
+        # los estados se retornan en int64 (ver apply_mask)
+        return states.reshape(-1, neighbors).astype(np.int64, copy=False), attributes
+
+    def gather_neighborhoods(
+        self,
+        region: Tuple[slice, ...],
+        mask: npt.NDArray[np.bool_],
+        offset: Union[Iterable[int], npt.NDArray[np.int]],
+    ) -> Tuple[npt.NDArray[np.int], Optional[npt.NDArray[np.float]]]:
+        """
+        Este metodo retorna las vecindades de todas las celulas de una region
+        usando el plan de recoleccion de la region (ver get_gather_plan), a
+        diferencia de apply_mask_batch, las vecindades se almacenan por
+        componente de la mascara
+
+        Parameters
+        ----------
+        region(tuple(slice)): region de celulas (en coordenadas que tienen en
+            cuenta la frontera) de las que se extraen las vecindades
+        mask(ndarray(bool)): arreglo que representa alguna vecindad
+        offset(tuple(int)|list(int)|ndarray(int)): offset de la mascara
+
+        Returns
+        -------
+        out(tuple): Tupla donde la primera componente es un array de tipo
+            int64 y dimensiones (n, k) con los estados de las vecindades de
+            las n celulas de la region (en el orden de los indices), y la
+            segunda componente un array de dimensiones (n, k, a) con los
+            atributos, si las celulas no tienen atributos se retorna None
+        """
+        plan = self.get_gather_plan(mask, offset, region)
+
+        # los buffers son contiguos, por lo que ravel y reshape no copian
+        # memoria. Las vecindades se almacenan por componente de la mascara,
+        # asi las reducciones sobre la vecindad recorren arreglos contiguos.
+        # Los estados se retornan en int64 (ver apply_mask)
+        states = (
+            self.states[self.read_buffer].ravel()[plan].astype(np.int64, copy=False).T
+        )
 
         attributes = None
         if self.attributes is not None:
-            attributes = self.attributes[self.read_buffer][subshape][mask]
+            attributes = np.stack(
+                [field.ravel()[plan].T for field in self.attributes[self.read_buffer]],
+                axis=-1,
+            )
 
         return states, attributes
+
+    def update_cells(
+        self,
+        region: Tuple[slice, ...],
+        cell_states: npt.NDArray[np.int],
+        cell_attributes: Optional[npt.NDArray[np.float]] = None,
+    ) -> None:
+        """
+        Este metodo actualiza la informacion de todas las celulas de una
+        region, tanto estados como atributos
+
+        Parameters
+        ----------
+        region(tuple(slice)): region de celulas (en coordenadas que tienen en
+            cuenta la frontera) que seran actualizadas
+        cell_states(ndarray(int)): arreglo con los estados de las celulas de
+            la region, puede tener la forma de la region o ser unidimensional
+            (en el orden de los indices)
+        cell_attributes(ndarray(float)|None): arreglo con los atributos de las
+            celulas de la region. Si es None los atributos no se modifican
+        """
+        states = self.states[self.write_buffer][region]
+        cell_states = np.reshape(cell_states, states.shape)
+
+        # se marcan los bloques en los que alguna celula cambio respecto a la
+        # generacion anterior
+        changes = cell_states != self.states[self.read_buffer][region]
+
+        if self.attributes is not None and cell_attributes is not None:
+            cell_attributes = np.reshape(
+                cell_attributes, (*states.shape, self.attributes_number)
+            )
+
+            # los cambios se comparan despues de convertir cada atributo al
+            # tipo de su arreglo
+            for k, (field, previous) in enumerate(
+                zip(
+                    self.attributes[self.write_buffer],
+                    self.attributes[self.read_buffer],
+                )
+            ):
+                field[region] = cell_attributes[..., k]
+                changes |= field[region] != previous[region]
+
+        states[...] = cell_states
+        self.mark_changes(region, changes)
+
+    def set_tile_shape(self, tile_shape: Iterable[int]) -> None:
+        """
+        Este metodo establece las dimensiones de los bloques (tiles) en los
+        que se divide el espacio (sin tener en cuenta la frontera) para llevar
+        la cuenta de los cambios, todos los bloques se marcan como cambiados
+
+        Parameters
+        ----------
+        tile_shape(tuple(int)|list(int)|ndarray(int)): dimensiones de los
+            bloques
+        """
+        self.tile_shape = np.array(tile_shape, dtype=int)
+
+        tiles = -(-self.dimensions // self.tile_shape)
+        # bloques en los que alguna celula cambio en la ultima generacion
+        self.changed_tiles = np.ones(tiles, dtype=bool)
+
+    def mark_changes(
+        self,
+        region: Optional[Tuple[slice, ...]] = None,
+        changes: Optional[npt.NDArray[np.bool_]] = None,
+    ) -> None:
+        """
+        Este metodo marca como cambiados los bloques que contienen celulas
+        que cambiaron
+
+        Parameters
+        ----------
+        region(tuple(slice)|None): region (en coordenadas que tienen en
+            cuenta la frontera, sin incluirla) de las celulas. Si es None se
+            marcan todos los bloques
+        changes(ndarray(bool)|None): arreglo con las dimensiones de la region
+            que indica que celulas cambiaron. Si es None se considera que
+            todas las celulas de la region cambiaron
+        """
+        if region is None:
+            self.changed_tiles[...] = True
+            return
+
+        if any(axis.stop <= axis.start for axis in region):
+            return
+
+        tiles_region = []
+        for axis, (cells, size, border) in enumerate(
+            zip(region, self.tile_shape, self.border_widths)
+        ):
+            tiles = (np.arange(cells.start, cells.stop) - border) // size
+            tiles_region.append(slice(tiles[0], tiles[-1] + 1))
+
+            if changes is not None:
+                # se reducen las celulas de cada bloque a un solo valor
+                starts = np.flatnonzero(np.diff(tiles, prepend=tiles[0] - 1))
+                changes = np.logical_or.reduceat(changes, starts, axis=axis)
+
+        if changes is None:
+            self.changed_tiles[tuple(tiles_region)] = True
+        else:
+            self.changed_tiles[tuple(tiles_region)] |= changes
+
+    def reset_changes(self) -> None:
+        """
+        Este metodo marca todos los bloques como no cambiados, se usa al
+        inicio de una generacion en la que los cambios se registran con el
+        metodo update_cells
+        """
+        self.changed_tiles[...] = False
+
+    def get_active_tiles(self, halo: Iterable[int]) -> npt.NDArray[np.bool_]:
+        """
+        Este metodo retorna los bloques que se deben recalcular, esto es,
+        aquellos cuyas celulas tienen en la vecindad alguna celula que cambio
+        en la ultima generacion. Las demas celulas conservan su estado si la
+        regla solo depende de la vecindad
+
+        Parameters
+        ----------
+        halo(tuple(int)|list(int)|ndarray(int)): distancia maxima, a lo largo
+            de cada eje, entre una celula y las celulas de su vecindad
+
+        Returns
+        -------
+        out(ndarray(bool)): arreglo que indica que bloques se deben recalcular
+        """
+        active = self.changed_tiles.copy()
+
+        for axis, (cells, size, dimension) in enumerate(
+            zip(halo, self.tile_shape, self.dimensions)
+        ):
+            # numero de bloques que alcanza la vecindad
+            reach = -(-cells // size)
+
+            dilated = np.moveaxis(active.copy(), axis, 0)
+            source = np.moveaxis(active, axis, 0)
+            for shift in range(1, reach + 1):
+                dilated[shift:] |= source[:-shift]
+                dilated[:-shift] |= source[shift:]
+
+            if self.border_differs and cells > 0:
+                dilated[:reach] = True
+                dilated[max(0, dimension - cells) // size :] = True
+
+            if self.boundary == "periodic" and cells > 0:
+                # la vecindad de las celulas de un extremo incluye las
+                # celulas del otro extremo
+                edges = source[: reach + 1].any(axis=0) | source[-reach - 1 :].any(
+                    axis=0
+                )
+                dilated[: reach + 1] |= edges
+                dilated[-reach - 1 :] |= edges
+
+            active = np.moveaxis(dilated, 0, axis)
+
+        return active
+
+    def get_tiles_regions(
+        self, tiles: npt.NDArray[np.bool_]
+    ) -> List[Tuple[slice, ...]]:
+        """
+        Este metodo agrupa los bloques seleccionados en regiones, cada region
+        es una secuencia de bloques consecutivos a lo largo del ultimo eje
+
+        Parameters
+        ----------
+        tiles(ndarray(bool)): arreglo que indica los bloques seleccionados
+
+        Returns
+        -------
+        out(list(tuple(slice))): regiones (en coordenadas que tienen en cuenta
+            la frontera) que cubren los bloques seleccionados
+        """
+        regions = []
+
+        for index in np.ndindex(*tiles.shape[:-1]):
+            # inicios y finales de las secuencias de bloques seleccionados
+            edges = np.flatnonzero(np.diff(tiles[index], prepend=False, append=False))
+
+            for start, stop in zip(edges[::2], edges[1::2]):
+                regions.append(
+                    tuple(
+                        slice(
+                            border + first * size,
+                            border + min(last * size, dimension),
+                        )
+                        for first, last, size, border, dimension in zip(
+                            (*index, start),
+                            (*(i + 1 for i in index), stop),
+                            self.tile_shape,
+                            self.border_widths,
+                            self.dimensions,
+                        )
+                    )
+                )
+
+        return regions
+
+
+class SparseTopology(Topology):
+    """
+    Esta clase representa una topologia n-dimensional no acotada en la que
+    solo se almacenan las celulas que no tienen el valor por defecto (el
+    estado por defecto y atributos iguales a 0), cada buffer es un
+    diccionario indexado por las posiciones de las celulas. Es adecuada para
+    patrones con pocas celulas distribuidas en una region muy grande
+
+    La topologia no tiene frontera, todas las posiciones (con coordenadas
+    enteras arbitrarias) son validas. Los motores que la usan suponen que la
+    regla transforma una vecindad con valores por defecto en una celula con
+    valores por defecto
+
+    Parameters
+    ----------
+    attributes_number(int): numero de atributos de cada celula en el espacio
+    dimensions_number(int): numero de dimensiones del espacio
+    default_state(int): estado por defecto de las celulas
+    """
+
+    def __init__(
+        self, attributes_number: int, dimensions_number: int, default_state: int = 0
+    ) -> None:
+        self.attributes_number = attributes_number
+        self.dimensions_number = dimensions_number
+        self.default_state = default_state
+
+        # el indice 0 corresponde al buffer 1 y el indice 1 corresponde al
+        # buffer 2, cada buffer asocia a cada posicion almacenada una tupla
+        # con el estado y los atributos (o None) de la celula
+        self.cells = [{}, {}]
+
+        self.write_buffer = 0
+        self.read_buffer = 1
+
+    def get_offset(self) -> npt.NDArray[np.int]:
+        """
+        Este metodo retorna el offset de las posiciones, como la topologia no
+        tiene frontera el offset es 0 en todos los ejes
+        """
+        return np.zeros(self.dimensions_number, dtype=int)
+
+    def __iter__(self):
+        """
+        Este metodo retorna un iterador sobre las posiciones de las celulas
+        almacenadas en el buffer de lectura. Las celulas que pueden cambiar en
+        una generacion se obtienen con el metodo get_candidates
+
+        Returns
+        -------
+        out(iter(tuple(int))): iterador sobre las posiciones almacenadas
+        """
+        return iter(list(self.cells[self.read_buffer]))
+
+    def flip(self) -> None:
+        """
+        Este metodo cambia el papel (ser de lectura o ser de escritura) que
+        cumplen las 2 estructuras de datos en las que se almacenan la
+        informacion de estados y atributos de las celulas
+        """
+        self.write_buffer, self.read_buffer = self.read_buffer, self.write_buffer
+
+    def is_default(
+        self, cell_state: int, cell_attributes: Optional[npt.NDArray[np.float]]
+    ) -> bool:
+        """
+        Este metodo indica si una celula tiene el valor por defecto, en ese
+        caso no se almacena
+
+        Parameters
+        ----------
+        cell_state(int): estado de la celula
+        cell_attributes(ndarray(float)|None): atributos de la celula
+
+        Returns
+        -------
+        out(bool): True si la celula tiene el valor por defecto
+        """
+        return cell_state == self.default_state and (
+            cell_attributes is None or not np.any(cell_attributes)
+        )
+
+    def get_cell(
+        self, position: Union[Iterable[int], npt.NDArray[np.int]]
+    ) -> Tuple[int, Optional[npt.NDArray[np.float]]]:
+        """
+        Este metodo obtiene la informacion de una celula, tanto los estados
+        como los atributos
+
+        Parameters
+        ----------
+        position(tuple(int)|list(int)|ndarray(int)): representan la posicion de
+            la celula
+
+        Returns
+        -------
+        outs(tuple): tupla cuya primera componente es un entero con el valor
+            del estado de la celula asociada a la posicion dada, y la segunda
+            componente es un array con el valor de los atributos, o None, en
+            caso de que las celulas no tenga atributos
+        """
+        position = tuple(int(i) for i in position)
+        state, attributes = self.cells[self.read_buffer].get(
+            position, (self.default_state, None)
+        )
+
+        if self.attributes_number != 0 and attributes is None:
+            attributes = np.zeros(self.attributes_number, dtype=float)
+
+        return state, attributes
+
+    def get_bounds(self) -> Tuple[npt.NDArray[np.int], npt.NDArray[np.int]]:
+        """
+        Este metodo retorna la caja que contiene las celulas almacenadas en el
+        buffer de lectura
+
+        Returns
+        -------
+        out(tuple): tupla con la esquina inferior (incluida) y la esquina
+            superior (excluida) de la caja, si no hay celulas almacenadas la
+            caja es vacia
+        """
+        cells = self.cells[self.read_buffer]
+        if not cells:
+            origin = np.zeros(self.dimensions_number, dtype=int)
+            return origin, origin
+
+        positions = np.array(list(cells), dtype=np.int64)
+
+        return positions.min(axis=0), positions.max(axis=0) + 1
+
+    def get_states(self) -> npt.NDArray[np.int]:
+        """
+        Este metodo retorna los estados de las celulas en la caja que
+        contiene las celulas almacenadas (ver get_bounds)
+
+        Returns
+        -------
+        out(ndarray(int)): arreglo con los estados de las celulas
+        """
+        lower, upper = self.get_bounds()
+        states = np.full(upper - lower, self.default_state, dtype=int)
+
+        for position, (state, _) in self.cells[self.read_buffer].items():
+            states[tuple(np.subtract(position, lower))] = state
+
+        return states
+
+    def get_attributes(
+        self, attribute: Optional[int] = None
+    ) -> Optional[npt.NDArray[np.float]]:
+        """
+        Este metodo retorna los atributos de las celulas en la caja que
+        contiene las celulas almacenadas (ver get_bounds)
+
+        Parameters
+        ----------
+        attribute(int|None): indice de un atributo, si es None se retornan
+            todos los atributos
+
+        Returns
+        -------
+        out(ndarray(float)|None): arreglo con los atributos de las celulas, o
+            None en caso de que las celulas no tengan atributos
+        """
+        if self.attributes_number == 0:
+            return None
+
+        lower, upper = self.get_bounds()
+        attributes = np.zeros((*(upper - lower), self.attributes_number))
+
+        for position, (_, cell_attributes) in self.cells[self.read_buffer].items():
+            if cell_attributes is not None:
+                attributes[tuple(np.subtract(position, lower))] = cell_attributes
+
+        if attribute is not None:
+            return attributes[..., attribute]
+
+        return attributes
+
+    def update_cell(
+        self,
+        position: Union[Iterable[int], npt.NDArray[np.int]],
+        cell_state: int,
+        cell_attributes: Optional[Union[List[float], npt.NDArray[np.float]]],
+    ) -> None:
+        """
+        Este metodo actualiza la informacion de una celula, tanto estados como
+        atributos. Las celulas con el valor por defecto no se almacenan
+
+        Parameters
+        ----------
+        position(tuple(int)|list(int)|ndarray(int)): representa la posicion de
+            la celula que sera actualizada
+        cell_state(int): entero con el valor del estado de la celula
+        cell_attributes(list(float)|ndarray(float)|None): lista o arreglo con
+            los valores de los atributos. Si las celulas no tienen atributos
+            se pasa None
+        """
+        position = tuple(int(i) for i in position)
+        cells = self.cells[self.write_buffer]
+
+        if self.attributes_number == 0:
+            cell_attributes = None
+        elif cell_attributes is not None:
+            cell_attributes = np.array(cell_attributes, dtype=float)
+
+        if self.is_default(cell_state, cell_attributes):
+            cells.pop(position, None)
+        else:
+            cells[position] = (int(cell_state), cell_attributes)
+
+    def set_border_values(
+        self,
+        cell_state: int,
+        cell_attributes: Optional[Union[List[float], npt.NDArray[np.float]]] = None,
+    ) -> None:
+        """
+        Esta topologia no tiene frontera, por lo que este metodo no hace nada
+        """
+
+    def set_values_from(
+        self,
+        cell_state: int,
+        cell_attributes: Optional[Union[List[float], npt.NDArray[np.float]]] = None,
+    ) -> None:
+        """
+        Este metodo establece el valor de todas las celulas, como el espacio
+        no es acotado solo se permite el valor por defecto
+
+        Parameters
+        ----------
+        cell_state(int): entero con el valor de los estados de las celulas
+        cell_attributes(list(float)|ndarray(float)|None): especifica el valor
+            de los atributos, si la celula no tiene atributos se pasa None
+        """
+        if not self.is_default(cell_state, cell_attributes):
+            raise InvalidParameterError(
+                "en una topologia no acotada todas las celulas deben tener el "
+                "valor por defecto"
+            )
+
+        self.clear()
+
+    def set_values_from_configuration(
+        self,
+        cell_states: npt.NDArray[np.int],
+        cell_attributes: Optional[npt.NDArray[np.float]] = None,
+        origin: Optional[Iterable[int]] = None,
+    ) -> None:
+        """
+        Este metodo establece el valor de las celulas desde un arreglo de
+        estados y un arreglo de atributos, las celulas fuera del arreglo
+        toman el valor por defecto
+
+        Parameters
+        ----------
+        cell_states(ndarray(int)): arreglo con los valores de los estados de
+            cada celula
+        cell_attributes(ndarray(float)|None): arreglo con los valores de los
+            atributos de cada celula. Si las celulas no tienen atributos se
+            pasa None
+        origin(tuple(int)|list(int)|ndarray(int)|None): posicion de la
+            primera celula del arreglo, por defecto es el origen
+        """
+        cell_states = np.asarray(cell_states)
+        if origin is None:
+            origin = np.zeros(self.dimensions_number, dtype=int)
+
+        stored = cell_states != self.default_state
+        if self.attributes_number != 0 and cell_attributes is not None:
+            cell_attributes = np.asarray(cell_attributes, dtype=float)
+            stored |= np.any(cell_attributes != 0, axis=-1)
+
+        self.clear()
+        for index in np.argwhere(stored):
+            index = tuple(index)
+            attributes = None
+            if self.attributes_number != 0 and cell_attributes is not None:
+                attributes = cell_attributes[index]
+
+            self.update_cell(np.add(index, origin), cell_states[index], attributes)
+
+    def clear(self) -> None:
+        """
+        Este metodo elimina todas las celulas del buffer de escritura, esto
+        es, todas las celulas toman el valor por defecto
+        """
+        self.cells[self.write_buffer].clear()
+
+    def apply_mask(
+        self,
+        position: Union[Iterable[int], npt.NDArray[np.int]],
+        mask: npt.NDArray[np.int],
+    ) -> Tuple[npt.NDArray[np.int], Optional[npt.NDArray[np.float]]]:
+        """
+        Este metodo retorna la vecindad de una celula mediante la aplicacion
+        de la mascara que representa la vecindad
+
+        Parameters
+        ----------
+        position(tuple(int)|list(int)|ndarray(int)): posicion en la que se
+            ubica la mascara
+        mask(ndarray): arreglo que representa alguna vecindad
+
+        Returns
+        ------
+        out(tuple): Tupla donde la primera componente son los estados de las
+            celulas que representan la vecindad, y la segunda componente
+            representa los atributos de cada celula, si las celulas no tienen
+            atributos se retorna None
+        """
+        displacements = np.argwhere(mask)
+        states = np.full(len(displacements), self.default_state, dtype=int)
+
+        attributes = None
+        if self.attributes_number != 0:
+            attributes = np.zeros((len(displacements), self.attributes_number))
+
+        cells = self.cells[self.read_buffer]
+        for i, displacement in enumerate(displacements + np.asarray(position)):
+            cell = cells.get(tuple(int(j) for j in displacement))
+            if cell is None:
+                continue
+
+            states[i] = cell[0]
+            if attributes is not None and cell[1] is not None:
+                attributes[i] = cell[1]
+
+        return states, attributes
+
+    def get_candidates(
+        self, mask: npt.NDArray[np.int], offset: Iterable[int]
+    ) -> List[Tuple[int, ...]]:
+        """
+        Este metodo retorna las posiciones de las celulas que tienen en su
+        vecindad alguna celula almacenada en el buffer de lectura, las demas
+        celulas tienen una vecindad con valores por defecto
+
+        Parameters
+        ----------
+        mask(ndarray): arreglo que representa la vecindad
+        offset(tuple(int)|list(int)|ndarray(int)): offset de la vecindad
+
+        Returns
+        -------
+        out(list(tuple(int))): posiciones de las celulas
+        """
+        positions, _, _ = self.get_stored_cells()
+        if len(positions) == 0:
+            return []
+
+        # la celula p tiene en su vecindad a la celula q si q = p + offset + i
+        # para algun indice i de la mascara
+        displacements = np.argwhere(mask) + np.asarray(offset)
+        candidates = (positions[:, None, :] - displacements[None, :, :]).reshape(
+            -1, self.dimensions_number
+        )
+
+        return [tuple(position) for position in unique_rows(candidates)[0].tolist()]
+
+    def get_stored_cells(
+        self,
+    ) -> Tuple[npt.NDArray[np.int64], npt.NDArray[np.int], Optional[npt.NDArray]]:
+        """
+        Este metodo retorna las celulas almacenadas en el buffer de lectura
+        como arreglos
+
+        Returns
+        -------
+        out(tuple): tupla cuya primera componente es un arreglo (n, d) con
+            las posiciones, la segunda un arreglo (n,) con los estados y la
+            tercera un arreglo (n, a) con los atributos, o None en caso de que
+            las celulas no tengan atributos
+        """
+        cells = self.cells[self.read_buffer]
+
+        positions = np.array(list(cells), dtype=np.int64).reshape(
+            -1, self.dimensions_number
+        )
+        states = np.array([state for state, _ in cells.values()], dtype=int)
+
+        attributes = None
+        if self.attributes_number != 0:
+            attributes = np.zeros((len(cells), self.attributes_number))
+            for i, (_, cell_attributes) in enumerate(cells.values()):
+                if cell_attributes is not None:
+                    attributes[i] = cell_attributes
+
+        return positions, states, attributes
+
+    def update_stored_cells(
+        self,
+        positions: npt.NDArray[np.int64],
+        cell_states: npt.NDArray[np.int],
+        cell_attributes: Optional[npt.NDArray[np.float]] = None,
+    ) -> None:
+        """
+        Este metodo actualiza la informacion de varias celulas en el buffer de
+        escritura, las celulas con el valor por defecto no se almacenan
+
+        Parameters
+        ----------
+        positions(ndarray(int)): arreglo (n, d) con las posiciones
+        cell_states(ndarray(int)): arreglo (n,) con los estados
+        cell_attributes(ndarray(float)|None): arreglo (n, a) con los
+            atributos, o None
+        """
+        stored = np.asarray(cell_states) != self.default_state
+        if self.attributes_number != 0 and cell_attributes is not None:
+            stored |= np.any(cell_attributes != 0, axis=-1)
+
+        cells = self.cells[self.write_buffer]
+        for i in np.flatnonzero(stored):
+            attributes = None
+            if self.attributes_number != 0 and cell_attributes is not None:
+                attributes = np.array(cell_attributes[i], dtype=float)
+
+            cells[tuple(positions[i].tolist())] = (int(cell_states[i]), attributes)
+
+        for i in np.flatnonzero(~stored):
+            cells.pop(tuple(positions[i].tolist()), None)
+
+
+class UnboundedNGridTopology(Topology):
+    """
+    Esta clase representa una topologia rectangular n-dimensional no acotada,
+    el espacio se divide en bloques (chunks) de dimensiones fijas que se
+    crean cuando la actividad alcanza el borde de los bloques existentes, y
+    se eliminan cuando todas sus celulas vuelven al valor por defecto (el
+    estado por defecto y atributos iguales a 0), de esta forma la memoria
+    usada depende del area activa
+
+    La topologia no tiene frontera, todas las posiciones (con coordenadas
+    enteras arbitrarias) son validas. Los motores que la usan suponen que la
+    regla transforma una vecindad con valores por defecto en una celula con
+    valores por defecto
+
+    Parameters
+    ----------
+    attributes_number(int): numero de atributos de cada celula en el espacio
+    dimensions_number(int): numero de dimensiones del espacio
+    chunk_shape(tuple(int)|list(int)|ndarray(int)|None): dimensiones de los
+        bloques, por defecto CHUNK_SIZE celulas por eje
+    default_state(int): estado por defecto de las celulas
+    """
+
+    def __init__(
+        self,
+        attributes_number: int,
+        dimensions_number: int,
+        chunk_shape: Optional[Iterable[int]] = None,
+        default_state: int = 0,
+    ) -> None:
+        self.attributes_number = attributes_number
+        self.dimensions_number = dimensions_number
+        self.default_state = default_state
+
+        if chunk_shape is None:
+            chunk_shape = (CHUNK_SIZE,) * dimensions_number
+        self.chunk_shape = np.array(chunk_shape, dtype=int)
+
+        # cada bloque se indexa por su posicion en la malla de bloques, y
+        # tiene una lista con los arreglos de los 2 buffers
+        self.chunks = {}
+        self.chunks_attributes = {}
+
+        self.write_buffer = 0
+        self.read_buffer = 1
+
+    def get_offset(self) -> npt.NDArray[np.int]:
+        """
+        Este metodo retorna el offset de las posiciones, como la topologia no
+        tiene frontera el offset es 0 en todos los ejes
+        """
+        return np.zeros(self.dimensions_number, dtype=int)
+
+    def __iter__(self):
+        """
+        Este metodo retorna un iterador sobre las posiciones de las celulas de
+        los bloques existentes
+
+        Returns
+        -------
+        out(iter(tuple(int))): iterador sobre las posiciones
+        """
+        return (
+            tuple(int(i) for i in np.multiply(index, self.chunk_shape) + local)
+            for index in list(self.chunks)
+            for local in np.ndindex(*self.chunk_shape)
+        )
+
+    def flip(self) -> None:
+        """
+        Este metodo cambia el papel (ser de lectura o ser de escritura) que
+        cumplen las 2 estructuras de datos en las que se almacenan la
+        informacion de estados y atributos de las celulas
+        """
+        self.write_buffer, self.read_buffer = self.read_buffer, self.write_buffer
+
+    def split_position(
+        self, position: Union[Iterable[int], npt.NDArray[np.int]]
+    ) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+        """
+        Este metodo retorna el indice del bloque que contiene una posicion y
+        la posicion dentro del bloque
+
+        Parameters
+        ----------
+        position(tuple(int)|list(int)|ndarray(int)): posicion de la celula
+
+        Returns
+        -------
+        out(tuple): tupla con el indice del bloque y la posicion local
+        """
+        index, local = np.divmod(np.asarray(position, dtype=np.int64), self.chunk_shape)
+
+        return tuple(index.tolist()), tuple(local.tolist())
+
+    def allocate_chunk(self, index: Tuple[int, ...]) -> None:
+        """
+        Este metodo crea un bloque con valores por defecto, si no existe
+
+        Parameters
+        ----------
+        index(tuple(int)): indice del bloque
+        """
+        if index in self.chunks:
+            return
+
+        self.chunks[index] = [
+            np.full(self.chunk_shape, self.default_state, dtype=int),
+            np.full(self.chunk_shape, self.default_state, dtype=int),
+        ]
+
+        if self.attributes_number != 0:
+            self.chunks_attributes[index] = [
+                np.zeros((*self.chunk_shape, self.attributes_number)),
+                np.zeros((*self.chunk_shape, self.attributes_number)),
+            ]
+
+    def release_chunks(self) -> None:
+        """
+        Este metodo elimina los bloques cuyas celulas tienen el valor por
+        defecto en los 2 buffers
+        """
+        for index in list(self.chunks):
+            if any(
+                np.any(states != self.default_state) for states in self.chunks[index]
+            ):
+                continue
+
+            if self.attributes_number != 0 and any(
+                np.any(attributes) for attributes in self.chunks_attributes[index]
+            ):
+                continue
+
+            del self.chunks[index]
+            self.chunks_attributes.pop(index, None)
+
+    def get_cell(
+        self, position: Union[Iterable[int], npt.NDArray[np.int]]
+    ) -> Tuple[int, Optional[npt.NDArray[np.float]]]:
+        """
+        Este metodo obtiene la informacion de una celula, tanto los estados
+        como los atributos
+
+        Parameters
+        ----------
+        position(tuple(int)|list(int)|ndarray(int)): representan la posicion de
+            la celula
+
+        Returns
+        -------
+        outs(tuple): tupla cuya primera componente es un entero con el valor
+            del estado de la celula asociada a la posicion dada, y la segunda
+            componente es un array con el valor de los atributos, o None, en
+            caso de que las celulas no tenga atributos
+        """
+        index, local = self.split_position(position)
+
+        if index not in self.chunks:
+            attributes = None
+            if self.attributes_number != 0:
+                attributes = np.zeros(self.attributes_number)
+
+            return self.default_state, attributes
+
+        attributes = None
+        if self.attributes_number != 0:
+            attributes = self.chunks_attributes[index][self.read_buffer][local]
+
+        return self.chunks[index][self.read_buffer][local], attributes
+
+    def get_bounds(self) -> Tuple[npt.NDArray[np.int], npt.NDArray[np.int]]:
+        """
+        Este metodo retorna la caja que contiene las celulas del buffer de
+        lectura que no tienen el valor por defecto
+
+        Returns
+        -------
+        out(tuple): tupla con la esquina inferior (incluida) y la esquina
+            superior (excluida) de la caja, si todas las celulas tienen el
+            valor por defecto la caja es vacia
+        """
+        lower, upper = None, None
+
+        for index in self.chunks:
+            changed = self.chunks[index][self.read_buffer] != self.default_state
+            if self.attributes_number != 0:
+                changed |= np.any(
+                    self.chunks_attributes[index][self.read_buffer] != 0, axis=-1
+                )
+
+            if not changed.any():
+                continue
+
+            positions = np.argwhere(changed) + np.multiply(index, self.chunk_shape)
+            chunk_lower, chunk_upper = positions.min(axis=0), positions.max(axis=0) + 1
+
+            if lower is None:
+                lower, upper = chunk_lower, chunk_upper
+            else:
+                lower = np.minimum(lower, chunk_lower)
+                upper = np.maximum(upper, chunk_upper)
+
+        if lower is None:
+            origin = np.zeros(self.dimensions_number, dtype=int)
+            return origin, origin
+
+        return lower, upper
+
+    def get_chunk_regions(
+        self, lower: npt.NDArray[np.int], upper: npt.NDArray[np.int]
+    ) -> List[Tuple[Tuple[int, ...], Tuple[slice, ...], Tuple[slice, ...]]]:
+        """
+        Este metodo retorna las partes de los bloques existentes que estan en
+        una caja
+
+        Parameters
+        ----------
+        lower(ndarray(int)): esquina inferior (incluida) de la caja
+        upper(ndarray(int)): esquina superior (excluida) de la caja
+
+        Returns
+        -------
+        out(list(tuple)): lista de tuplas con el indice de cada bloque, la
+            region dentro del bloque y la region dentro de la caja
+        """
+        regions = []
+
+        for index in self.chunks:
+            start = np.multiply(index, self.chunk_shape)
+            first = np.maximum(start, lower)
+            last = np.minimum(start + self.chunk_shape, upper)
+
+            if np.any(last <= first):
+                continue
+
+            regions.append(
+                (
+                    index,
+                    tuple(slice(i, j) for i, j in zip(first - start, last - start)),
+                    tuple(slice(i, j) for i, j in zip(first - lower, last - lower)),
+                )
+            )
+
+        return regions
+
+    def get_states(self) -> npt.NDArray[np.int]:
+        """
+        Este metodo retorna los estados de las celulas en la caja que contiene
+        las celulas que no tienen el valor por defecto (ver get_bounds)
+
+        Returns
+        -------
+        out(ndarray(int)): arreglo con los estados de las celulas
+        """
+        lower, upper = self.get_bounds()
+        states = np.full(upper - lower, self.default_state, dtype=int)
+
+        for index, chunk_region, region in self.get_chunk_regions(lower, upper):
+            states[region] = self.chunks[index][self.read_buffer][chunk_region]
+
+        return states
+
+    def get_attributes(
+        self, attribute: Optional[int] = None
+    ) -> Optional[npt.NDArray[np.float]]:
+        """
+        Este metodo retorna los atributos de las celulas en la caja que
+        contiene las celulas que no tienen el valor por defecto (ver
+        get_bounds)
+
+        Parameters
+        ----------
+        attribute(int|None): indice de un atributo, si es None se retornan
+            todos los atributos
+
+        Returns
+        -------
+        out(ndarray(float)|None): arreglo con los atributos de las celulas, o
+            None en caso de que las celulas no tengan atributos
+        """
+        if self.attributes_number == 0:
+            return None
+
+        lower, upper = self.get_bounds()
+        attributes = np.zeros((*(upper - lower), self.attributes_number))
+
+        for index, chunk_region, region in self.get_chunk_regions(lower, upper):
+            attributes[region] = self.chunks_attributes[index][self.read_buffer][
+                chunk_region
+            ]
+
+        if attribute is not None:
+            return attributes[..., attribute]
+
+        return attributes
+
+    def update_cell(
+        self,
+        position: Union[Iterable[int], npt.NDArray[np.int]],
+        cell_state: int,
+        cell_attributes: Optional[Union[List[float], npt.NDArray[np.float]]],
+    ) -> None:
+        """
+        Este metodo actualiza la informacion de una celula, tanto estados como
+        atributos, si el bloque de la celula no existe se crea
+
+        Parameters
+        ----------
+        position(tuple(int)|list(int)|ndarray(int)): representa la posicion de
+            la celula que sera actualizada
+        cell_state(int): entero con el valor del estado de la celula
+        cell_attributes(list(float)|ndarray(float)|None): lista o arreglo con
+            los valores de los atributos. Si las celulas no tienen atributos
+            se pasa None
+        """
+        index, local = self.split_position(position)
+        self.allocate_chunk(index)
+
+        self.chunks[index][self.write_buffer][local] = cell_state
+
+        if self.attributes_number != 0 and cell_attributes is not None:
+            self.chunks_attributes[index][self.write_buffer][local] = cell_attributes
+
+    def set_border_values(
+        self,
+        cell_state: int,
+        cell_attributes: Optional[Union[List[float], npt.NDArray[np.float]]] = None,
+    ) -> None:
+        """
+        Esta topologia no tiene frontera, por lo que este metodo no hace nada
+        """
+
+    def set_values_from(
+        self,
+        cell_state: int,
+        cell_attributes: Optional[Union[List[float], npt.NDArray[np.float]]] = None,
+    ) -> None:
+        """
+        Este metodo establece el valor de todas las celulas, como el espacio
+        no es acotado solo se permite el valor por defecto
+
+        Parameters
+        ----------
+        cell_state(int): entero con el valor de los estados de las celulas
+        cell_attributes(list(float)|ndarray(float)|None): especifica el valor
+            de los atributos, si la celula no tiene atributos se pasa None
+        """
+        if cell_state != self.default_state or (
+            cell_attributes is not None and np.any(cell_attributes)
+        ):
+            raise InvalidParameterError(
+                "en una topologia no acotada todas las celulas deben tener el "
+                "valor por defecto"
+            )
+
+        self.clear()
+
+    def set_values_from_configuration(
+        self,
+        cell_states: npt.NDArray[np.int],
+        cell_attributes: Optional[npt.NDArray[np.float]] = None,
+        origin: Optional[Iterable[int]] = None,
+    ) -> None:
+        """
+        Este metodo establece el valor de las celulas desde un arreglo de
+        estados y un arreglo de atributos, las celulas fuera del arreglo
+        toman el valor por defecto
+
+        Parameters
+        ----------
+        cell_states(ndarray(int)): arreglo con los valores de los estados de
+            cada celula
+        cell_attributes(ndarray(float)|None): arreglo con los valores de los
+            atributos de cada celula. Si las celulas no tienen atributos se
+            pasa None
+        origin(tuple(int)|list(int)|ndarray(int)|None): posicion de la
+            primera celula del arreglo, por defecto es el origen
+        """
+        cell_states = np.asarray(cell_states)
+        if origin is None:
+            origin = np.zeros(self.dimensions_number, dtype=int)
+        lower = np.asarray(origin, dtype=np.int64)
+        upper = lower + cell_states.shape
+
+        self.clear()
+
+        # se crean los bloques que cubren el arreglo
+        first, _ = self.split_position(lower)
+        last, _ = self.split_position(upper - 1)
+        for index in np.ndindex(*(np.subtract(last, first) + 1)):
+            self.allocate_chunk(tuple(int(i) for i in np.add(first, index)))
+
+        for index, chunk_region, region in self.get_chunk_regions(lower, upper):
+            self.chunks[index][self.write_buffer][chunk_region] = cell_states[region]
+
+            if self.attributes_number != 0 and cell_attributes is not None:
+                self.chunks_attributes[index][self.write_buffer][
+                    chunk_region
+                ] = cell_attributes[region]
+
+    def clear(self) -> None:
+        """
+        Este metodo establece el valor por defecto en todas las celulas del
+        buffer de escritura
+        """
+        for index in self.chunks:
+            self.chunks[index][self.write_buffer][...] = self.default_state
+
+            if self.attributes_number != 0:
+                self.chunks_attributes[index][self.write_buffer][...] = 0
+
+    def apply_mask(
+        self,
+        position: Union[Iterable[int], npt.NDArray[np.int]],
+        mask: npt.NDArray[np.int],
+    ) -> Tuple[npt.NDArray[np.int], Optional[npt.NDArray[np.float]]]:
+        """
+        Este metodo retorna la vecindad de una celula mediante la aplicacion
+        de la mascara que representa la vecindad
+
+        Parameters
+        ----------
+        position(tuple(int)|list(int)|ndarray(int)): posicion en la que se
+            ubica la mascara
+        mask(ndarray): arreglo que representa alguna vecindad
+
+        Returns
+        ------
+        out(tuple): Tupla donde la primera componente son los estados de las
+            celulas que representan la vecindad, y la segunda componente
+            representa los atributos de cada celula, si las celulas no tienen
+            atributos se retorna None
+        """
+        cells = [
+            self.get_cell(displacement)
+            for displacement in np.argwhere(mask) + np.asarray(position)
+        ]
+
+        states = np.array([state for state, _ in cells], dtype=int)
+
+        attributes = None
+        if self.attributes_number != 0:
+            attributes = np.array([cell_attributes for _, cell_attributes in cells])
+
+        return states, attributes
+
+    def get_active_chunks(self, halo: Iterable[int]) -> List[Tuple[int, ...]]:
+        """
+        Este metodo crea los bloques vecinos de los bloques existentes a los
+        que llega la actividad, esto es, aquellos que tienen en la vecindad de
+        alguna de sus celulas una celula que no tiene el valor por defecto en
+        el buffer de lectura, y retorna los indices de todos los bloques
+
+        Parameters
+        ----------
+        halo(tuple(int)|list(int)|ndarray(int)): distancia maxima, a lo largo
+            de cada eje, entre una celula y las celulas de su vecindad
+
+        Returns
+        -------
+        out(list(tuple(int))): indices de los bloques
+        """
+        halo = np.asarray(halo)
+        if np.any(halo > self.chunk_shape):
+            raise InvalidParameterError(
+                "la vecindad no puede ser mayor que los bloques de la topologia"
+            )
+
+        directions = [
+            direction
+            for direction in itertools.product(
+                (-1, 0, 1), repeat=self.dimensions_number
+            )
+            if any(direction)
+            and all(halo[i] > 0 or d == 0 for i, d in enumerate(direction))
+        ]
+
+        for index in list(self.chunks):
+            changed = self.chunks[index][self.read_buffer] != self.default_state
+            if self.attributes_number != 0:
+                changed |= np.any(
+                    self.chunks_attributes[index][self.read_buffer] != 0, axis=-1
+                )
+
+            if not changed.any():
+                continue
+
+            for direction in directions:
+                # celulas del bloque que estan en la vecindad del bloque vecino
+                band = tuple(
+                    slice(0, size)
+                    if d == 0
+                    else slice(0, width)
+                    if d < 0
+                    else slice(size - width, size)
+                    for d, size, width in zip(direction, self.chunk_shape, halo)
+                )
+
+                if changed[band].any():
+                    self.allocate_chunk(tuple(np.add(index, direction).tolist()))
+
+        return list(self.chunks)
+
+    def get_padded_chunk(
+        self, index: Tuple[int, ...], halo: Iterable[int]
+    ) -> Tuple[npt.NDArray[np.int], Optional[npt.NDArray[np.float]]]:
+        """
+        Este metodo retorna los valores del buffer de lectura de un bloque,
+        extendido con las celulas de los bloques vecinos que estan a una
+        distancia menor o igual a halo
+
+        Parameters
+        ----------
+        index(tuple(int)): indice del bloque
+        halo(tuple(int)|list(int)|ndarray(int)): numero de celulas que se
+            agregan a cada lado del bloque a lo largo de cada eje
+
+        Returns
+        -------
+        out(tuple): tupla con el arreglo de estados y el arreglo de atributos
+            (o None) del bloque extendido
+        """
+        halo = np.asarray(halo)
+        shape = self.chunk_shape + 2 * halo
+
+        states = np.full(shape, self.default_state, dtype=int)
+        attributes = None
+        if self.attributes_number != 0:
+            attributes = np.zeros((*shape, self.attributes_number))
+
+        for direction in itertools.product((-1, 0, 1), repeat=self.dimensions_number):
+            neighbor = tuple(np.add(index, direction).tolist())
+            if neighbor not in self.chunks:
+                continue
+
+            if any(d != 0 and w == 0 for d, w in zip(direction, halo)):
+                continue
+
+            source, target = [], []
+            for d, size, width in zip(direction, self.chunk_shape, halo):
+                if d < 0:
+                    source.append(slice(size - width, size))
+                    target.append(slice(0, width))
+                elif d == 0:
+                    source.append(slice(0, size))
+                    target.append(slice(width, width + size))
+                else:
+                    source.append(slice(0, width))
+                    target.append(slice(width + size, 2 * width + size))
+
+            source, target = tuple(source), tuple(target)
+            states[target] = self.chunks[neighbor][self.read_buffer][source]
+
+            if attributes is not None:
+                attributes[target] = self.chunks_attributes[neighbor][self.read_buffer][
+                    source
+                ]
+
+        return states, attributes
+
+    def set_chunk(
+        self,
+        index: Tuple[int, ...],
+        cell_states: npt.NDArray[np.int],
+        cell_attributes: Optional[npt.NDArray[np.float]] = None,
+    ) -> None:
+        """
+        Este metodo establece los valores del buffer de escritura de un
+        bloque existente
+
+        Parameters
+        ----------
+        index(tuple(int)): indice del bloque
+        cell_states(ndarray(int)): arreglo con los estados del bloque
+        cell_attributes(ndarray(float)|None): arreglo con los atributos del
+            bloque, si es None los atributos no se modifican
+        """
+        self.chunks[index][self.write_buffer][...] = cell_states
+
+        if self.attributes_number != 0 and cell_attributes is not None:
+            self.chunks_attributes[index][self.write_buffer][...] = cell_attributes
@@ -0,0 +1,201 @@
+"""
+Un motor (engine) encapsula la manera en la que se calcula una generacion del
+automata. En este modulo se implementan motores vectorizados para las reglas
+de automatas celulares unidimensionales, estos motores calculan toda la linea
+en cada paso en lugar de aplicar la regla celula por celula
+"""
+
+import numpy as np
+
+from pycellslib.core.engine import ArrayEngine, PackedEngine
+from pycellslib.utils import shift_bits
+
+# registros que representan las funciones constantes en los programas
+# booleanos de PackedWolframCodeEngine
+ZERO = -1
+ONE = -2
+
+
+class WolframCodeEngine(ArrayEngine):
+    """
+    Este motor calcula las generaciones de las reglas en codigo de Wolfram.
+    El indice de la configuracion de la vecindad de todas las celulas se
+    calcula en un solo paso como una suma ponderada (por los elementos de la
+    base) de regiones desplazadas de la linea, y los nuevos estados se
+    obtienen indexando la regla con todos los indices a la vez
+
+    Parameters
+    ----------
+    rule(WolframCodeRule): regla de transicion del automata
+    topology(FiniteNGridTopology): topologia del automata
+    """
+
+    def __init__(self, rule, topology):
+        super().__init__(rule, topology)
+
+        # la regla esta ordenada desde la configuracion con mayor indice hasta
+        # la configuracion con indice 0
+        self.table = self.rule.rule[::-1].copy()
+
+    def compute(self, states, attributes, region):
+        """
+        Este metodo calcula los nuevos valores de las celulas de una region
+
+        Parameters
+        ----------
+        states(ndarray(int)): arreglo con los estados de las celulas,
+            incluyendo la frontera
+        attributes(None): las celulas de estas reglas no tienen atributos
+        region(tuple(slice)): region de las celulas que se actualizan, en
+            coordenadas de los arreglos
+
+        Returns
+        -------
+        out(tuple): tupla cuya primera componente es un arreglo con los
+            nuevos estados de la region, y la segunda componente es None
+        """
+        rows, columns = region
+        start = columns.start + self.offset[1]
+
+        configurations = np.zeros(
+            (rows.stop - rows.start, columns.stop - columns.start), dtype=np.int64
+        )
+        # las configuraciones se calculan con el metodo de Horner en int64,
+        # de esta forma no hay desbordamiento con estados de tipos pequenos
+        for i in range(len(self.rule.base_elements)):
+            shift = slice(start + i, columns.stop + self.offset[1] + i)
+            configurations *= self.rule.base
+            configurations += states[rows, shift]
+
+        return self.table[configurations].astype(states.dtype), None
+
+
+class PackedWolframCodeEngine(PackedEngine):
+    """
+    Este motor calcula las generaciones de las reglas en codigo de Wolfram
+    con 2 estados. La linea se empaqueta con 64 celulas por palabra (uint64)
+    y la regla se traduce a una formula booleana sobre los vecinos (un
+    diagrama de decision binario obtenido de la tabla de la regla), de esta
+    forma cada operacion sobre una palabra calcula 64 celulas a la vez
+
+    Parameters
+    ----------
+    rule(WolframCodeRule): regla de transicion del automata, debe tener 2
+        estados
+    topology(FiniteNGridTopology): topologia del automata
+    """
+
+    def __init__(self, rule, topology):
+        super().__init__(rule, topology)
+
+        # la configuracion c tiene como bit mas significativo al vecino de la
+        # izquierda, y la regla esta ordenada desde la configuracion con mayor
+        # indice hasta la configuracion con indice 0
+        table = self.rule.rule[::-1].astype(bool)
+
+        # cada instruccion del programa es una tupla (vecino, f0, f1) que
+        # representa la funcion f0 si el vecino es 0 y f1 si el vecino es 1,
+        # f0 y f1 son indices de instrucciones anteriores o constantes
+        self.program = []
+        self.output = self.compile(table, 0, {})
+
+    def compile(self, table, neighbor, memory):
+        """
+        Este metodo traduce una tabla de verdad a instrucciones del programa,
+        las subtablas iguales se traducen una sola vez
+
+        Parameters
+        ----------
+        table(ndarray(bool)): tabla de verdad sobre los vecinos desde el
+            vecino dado en adelante
+        neighbor(int): indice del vecino que representa el bit mas
+            significativo de la tabla
+        memory(dict): instrucciones ya traducidas
+
+        Returns
+        -------
+        out(int): indice de la instruccion (o constante) que representa a
+            la tabla
+        """
+        if not table.any():
+            return ZERO
+        if table.all():
+            return ONE
+
+        key = (neighbor, table.tobytes())
+        if key not in memory:
+            half = table.size // 2
+            low = self.compile(table[:half], neighbor + 1, memory)
+            high = self.compile(table[half:], neighbor + 1, memory)
+
+            if low == high:
+                memory[key] = low
+            else:
+                self.program.append((neighbor, low, high))
+                memory[key] = len(self.program) - 1
+
+        return memory[key]
+
+    def evaluate(self, neighbors):
+        """
+        Este metodo ejecuta el programa de la regla sobre palabras empaquetadas
+
+        Parameters
+        ----------
+        neighbors(list(ndarray(uint64))): palabras empaquetadas de cada
+            vecino, alineadas con la celula que se actualiza
+
+        Returns
+        -------
+        out(ndarray(uint64)): palabras empaquetadas con los nuevos estados
+        """
+        zeros = np.zeros_like(neighbors[0])
+        registers = {ZERO: zeros, ONE: ~zeros}
+
+        for index, (neighbor, low, high) in enumerate(self.program):
+            value = neighbors[neighbor]
+
+            if low == ZERO and high == ONE:
+                result = value
+            elif low == ONE and high == ZERO:
+                result = ~value
+            elif low == ZERO:
+                result = value & registers[high]
+            elif high == ZERO:
+                result = registers[low] & ~value
+            elif low == ONE:
+                result = registers[high] | ~value
+            elif high == ONE:
+                result = registers[low] | value
+            else:
+                result = registers[low] ^ (value & (registers[low] ^ registers[high]))
+
+            registers[index] = result
+
+        return registers[self.output]
+
+    def compute_packed(self, words, region):
+        """
+        Este metodo calcula los nuevos estados de una region a partir del
+        buffer de lectura empaquetado
+
+        Parameters
+        ----------
+        words(ndarray(uint64)): buffer de lectura empaquetado, incluyendo la
+            frontera
+        region(tuple(slice)): region de las celulas que se actualizan, en
+            coordenadas de los arreglos (sin empaquetar)
+
+        Returns
+        -------
+        out(ndarray(uint64)): palabras con los nuevos estados de las filas de
+            la region, alineadas con words
+        """
+        line = words[region[0]]
+
+        # el vecino k de la celula i es la celula i + offset + k
+        neighbors = [
+            shift_bits(line, -(self.offset[1] + k)) for k in range(self.mask.shape[1])
+        ]
+
+        return self.evaluate(neighbors)
@@ -1,6 +1,10 @@
 import numpy as np
 
-from pycellslib.core import Rule
+from pycellslib.core import FiniteNGridTopology, Rule
+from pycellslib.onedimensional.engines import (
+    PackedWolframCodeEngine,
+    WolframCodeEngine,
+)
 from pycellslib.onedimensional.neighborhoods import MooreNeighborhood
 
 
@@ -18,6 +22,8 @@ class WolframCodeRule(Rule):
         de esa vecindad
     """
 
+    deterministic = True
+
     def __init__(self, rule_number, states_number=2, neighborhood_radius=1):
         # la base esta determinada por todos lo posibles estados de las celulas
         self.base = states_number
@@ -44,6 +50,29 @@ class WolframCodeRule(Rule):
         """
         return self.neighborhood
 
+    def get_engine(self, topology):
+        """
+        Este metodo retorna el motor vectorizado de la regla, que calcula toda
+        la linea en cada paso. Con 2 estados se usa el motor que empaqueta 64
+        celulas por palabra
+
+        Parameters
+        ----------
+        topology(Topology): topologia del automata
+
+        Returns
+        -------
+        out(WolframCodeEngine|PackedWolframCodeEngine|None): motor de la
+            regla, o None si la topologia no es una linea
+        """
+        if isinstance(topology, FiniteNGridTopology) and topology.dimensions.size == 2:
+            if self.base == 2:
+                return PackedWolframCodeEngine(self, topology)
+
+            return WolframCodeEngine(self, topology)
+
+        return None
+
     def get_max_rule_number(self):
         """
         Este metodo retorna la maxima regla permitida con el numero de estados
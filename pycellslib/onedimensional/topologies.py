@@ -17,7 +17,29 @@ class FiniteLineTopology(FiniteNGridTopology):
     size(int): dimension del espacio
     border_width(int): dimension de la frontera. Estas dimensiones se le
         suman a las dimensiones del espacio
+    boundary(str): tipo de frontera ("constant", "periodic" o "reflective"),
+        con la frontera periodica la linea es un anillo
+    attributes_dtype(dtype|list(dtype)|None): tipo de los atributos, o una
+        lista con el tipo de cada atributo, si es None el automata usa los
+        tipos de sus celulas
+    states_dtype(dtype|None): tipo entero de los estados, si es None el
+        automata usa el menor tipo que contiene los estados de sus celulas
     """
 
-    def __init__(self, attributes_number: int, size, border_width) -> None:
-        super().__init__(attributes_number, (1, size), (0, border_width))
+    def __init__(
+        self,
+        attributes_number: int,
+        size,
+        border_width,
+        boundary="constant",
+        attributes_dtype=None,
+        states_dtype=None,
+    ) -> None:
+        super().__init__(
+            attributes_number,
+            (1, size),
+            (0, border_width),
+            boundary,
+            attributes_dtype,
+            states_dtype,
+        )
@@ -0,0 +1,569 @@
+"""
+Un motor (engine) encapsula la manera en la que se calcula una generacion del
+automata. En este modulo se implementan motores vectorizados para las reglas
+de automatas celulares bidimensionales, estos motores calculan todo el plano
+en cada paso en lugar de aplicar la regla celula por celula
+"""
+
+import numpy as np
+
+from pycellslib.core.convolution import (
+    correlate,
+    expand_region,
+    get_sum_dtype,
+    neighborhood_sum,
+)
+from pycellslib.core.engine import ArrayEngine, Engine, PackedEngine
+from pycellslib.errors import InvalidParameterError
+from pycellslib.utils import shift_bits, unique_rows
+
+
+class BSNotationEngine(ArrayEngine):
+    """
+    Este motor calcula las generaciones de las reglas en notacion B/S. El
+    numero de vecinos vivos de todas las celulas se calcula al mismo tiempo
+    (ver neighborhood_sum), con sumas separables en vecindades pequenas y con
+    tablas de sumas acumuladas en vecindades grandes (reglas Larger than
+    Life), de esta forma el costo por celula no depende del radio. El
+    nacimiento y la supervivencia se resuelven con tablas de busqueda
+    indexadas por el numero de vecinos
+
+    Parameters
+    ----------
+    rule(BSNotationRule): regla de transicion del automata
+    topology(FiniteNGridTopology): topologia del automata
+    """
+
+    def __init__(self, rule, topology):
+        super().__init__(rule, topology)
+
+        # la vecindad incluye a la celula del centro, entonces el numero de
+        # vecinos esta entre 0 y mask.size - 1. El indice mask.size se usa
+        # para las cuentas fuera de rango (cuando hay estados distintos de 0
+        # y 1)
+        self.out_of_range = self.mask.size
+
+        self.birth = np.zeros(self.out_of_range + 1, dtype=bool)
+        self.survival = np.zeros(self.out_of_range + 1, dtype=bool)
+
+        # si no se especifica B, toda celula muerta nace (igual que en
+        # BSNotationRule.apply_rule)
+        if self.rule.B == []:
+            self.birth[:] = True
+        else:
+            self.birth[[b for b in self.rule.B if 0 <= b < self.out_of_range]] = True
+
+        self.survival[[s for s in self.rule.S if 0 <= s < self.out_of_range]] = True
+
+    def compute(self, states, attributes, region):
+        """
+        Este metodo calcula los nuevos valores de las celulas de una region
+
+        Parameters
+        ----------
+        states(ndarray(int)): arreglo con los estados de las celulas,
+            incluyendo la frontera
+        attributes(None): las celulas de estas reglas no tienen atributos
+        region(tuple(slice)): region de las celulas que se actualizan, en
+            coordenadas de los arreglos
+
+        Returns
+        -------
+        out(tuple): tupla cuya primera componente es un arreglo con los
+            nuevos estados de la region, y la segunda componente es None
+        """
+        center = states[region]
+        # la suma sobre la vecindad incluye a la celula del centro, se
+        # acumula en el menor tipo que no se desborda con el tipo de los
+        # estados
+        dtype = get_sum_dtype(states.dtype, self.mask.size)
+        counts = neighborhood_sum(states, self.mask, self.offset, region, dtype)
+        counts -= center
+        counts[(counts < 0) | (counts > self.out_of_range)] = self.out_of_range
+
+        new_states = np.where(
+            center == 1, self.survival[counts], (center == 0) & self.birth[counts]
+        )
+
+        return new_states.astype(states.dtype), None
+
+
+class OuterTotalisticEngine(ArrayEngine):
+    """
+    Este motor calcula las generaciones de las reglas totalisticas externas
+    con varios estados (ver OuterTotalisticRule). Cuando todos los estados
+    tienen el mismo estado de disparo, el numero de vecinos en ese estado se
+    calcula en todo el plano al mismo tiempo (ver neighborhood_sum), en caso
+    contrario cada vecino se compara con el estado de disparo de la celula.
+    El nuevo estado de cada celula se lee de la tabla de transicion de la
+    regla indexada por el estado actual y el numero de vecinos
+
+    Parameters
+    ----------
+    rule(OuterTotalisticRule): regla de transicion del automata
+    topology(FiniteNGridTopology): topologia del automata
+    """
+
+    def __init__(self, rule, topology):
+        super().__init__(rule, topology)
+
+        # estados de disparo distintos, en la mayoria de las reglas solo hay
+        # uno
+        self.firing_states = np.unique(self.rule.firing)
+
+        # posiciones de los vecinos respecto a cada celula, sin incluir la
+        # celula del centro
+        self.displacements = [
+            displacement
+            for displacement in np.argwhere(self.mask) + self.offset
+            if np.any(displacement != 0)
+        ]
+
+    def count(self, states, value, region):
+        """
+        Este metodo calcula el numero de vecinos en un estado para cada
+        celula de una region, incluyendo a la celula del centro
+
+        Parameters
+        ----------
+        states(ndarray(int)): arreglo con los estados de las celulas,
+            incluyendo la frontera
+        value(int): estado que se cuenta
+        region(tuple(slice)): region de las celulas, en coordenadas de los
+            arreglos
+
+        Returns
+        -------
+        out(ndarray(int)): arreglo con las dimensiones de la region con el
+            numero de vecinos en el estado dado
+        """
+        # solo se compara la region que cubren las vecindades
+        window = expand_region(region, self.offset, self.mask.shape)
+        indicator = states[window] == value
+        local_region = tuple(
+            slice(-start, -start + axis.stop - axis.start)
+            for axis, start in zip(region, self.offset)
+        )
+
+        return neighborhood_sum(
+            indicator,
+            self.mask,
+            self.offset,
+            local_region,
+            get_sum_dtype(bool, self.mask.size),
+        )
+
+    def compute(self, states, attributes, region):
+        """
+        Este metodo calcula los nuevos valores de las celulas de una region
+
+        Parameters
+        ----------
+        states(ndarray(int)): arreglo con los estados de las celulas,
+            incluyendo la frontera
+        attributes(None): las celulas de estas reglas no tienen atributos
+        region(tuple(slice)): region de las celulas que se actualizan, en
+            coordenadas de los arreglos
+
+        Returns
+        -------
+        out(tuple): tupla cuya primera componente es un arreglo con los
+            nuevos estados de la region, y la segunda componente es None
+        """
+        center = states[region]
+        # los estados fuera del rango de la regla no cambian
+        valid = (center >= 0) & (center < self.rule.states_number)
+        codes = np.where(valid, center, 0)
+
+        firing = self.rule.firing[codes]
+        if self.firing_states.size == 1:
+            # la celula del centro no se cuenta como vecina
+            value = self.firing_states[0]
+            counts = self.count(states, value, region) - (center == value)
+        else:
+            # con varios estados de disparo (por ejemplo en los automatas
+            # ciclicos) cada vecino se compara con el estado de disparo de la
+            # celula del centro
+            counts = np.zeros(center.shape, dtype=np.intp)
+            for displacement in self.displacements:
+                shifted = tuple(
+                    slice(axis.start + d, axis.stop + d)
+                    for axis, d in zip(region, displacement)
+                )
+                counts += states[shifted] == firing
+
+        new_states = np.where(valid, self.rule.table[codes, counts], center)
+
+        return new_states.astype(states.dtype), None
+
+
+class WeightedSumEngine(ArrayEngine):
+    """
+    Este motor calcula las generaciones de las reglas totalisticas con pesos
+    (ver WeightedSumRule). Las sumas ponderadas de todo el plano se calculan
+    al mismo tiempo con una correlacion (ver correlate), de forma directa con
+    nucleos pequenos y con la transformada rapida de Fourier con nucleos
+    grandes. Los espectros de los nucleos se almacenan en una cache por
+    dimensiones del plano, por lo que solo se calculan en la primera
+    generacion
+
+    Parameters
+    ----------
+    rule(WeightedSumRule): regla de transicion del automata
+    topology(FiniteNGridTopology): topologia del automata
+    """
+
+    # el plano se calcula completo en cada paso, de esta forma la
+    # transformada siempre tiene las mismas dimensiones y su espectro se
+    # reutiliza
+    skip_tiles = False
+
+    def __init__(self, rule, topology):
+        super().__init__(rule, topology)
+
+        self.weights = self.rule.get_neighborhood().get_weights()
+
+    def compute(self, states, attributes, region):
+        """
+        Este metodo calcula los nuevos valores de las celulas de una region
+
+        Parameters
+        ----------
+        states(ndarray(int)): arreglo con los estados de las celulas,
+            incluyendo la frontera
+        attributes(None): las celulas de estas reglas no tienen atributos
+        region(tuple(slice)): region de las celulas que se actualizan, en
+            coordenadas de los arreglos
+
+        Returns
+        -------
+        out(tuple): tupla cuya primera componente es un arreglo con los
+            nuevos estados de la region, y la segunda componente es None
+        """
+        sums = correlate(states, self.weights, self.offset, region)
+        new_states = self.rule.transition(states[region], sums)
+
+        return np.asarray(new_states).astype(states.dtype), None
+
+
+class ContinuousEngine(ArrayEngine):
+    """
+    Este motor calcula las generaciones de las reglas de estado continuo (ver
+    ContinuousRule). Los potenciales de todo el plano se calculan con una
+    correlacion (ver correlate), con la transformada rapida de Fourier con
+    nucleos grandes, cuyo espectro se calcula una sola vez, y el crecimiento
+    se aplica sobre el arreglo de los potenciales. En cada paso los nuevos
+    valores se escriben directamente en el buffer de escritura, sin arreglos
+    intermedios por region
+
+    Parameters
+    ----------
+    rule(ContinuousRule): regla de transicion del automata
+    topology(FiniteNGridTopology): topologia del automata, las celulas deben
+        tener el atributo de la regla
+    """
+
+    # todas las celulas cambian en cada paso
+    skip_tiles = False
+    # el plano se calcula con una sola transformada, con hilos cada region
+    # necesitaria su propia transformada
+    threadable = False
+
+    def __init__(self, rule, topology):
+        super().__init__(rule, topology)
+
+        self.attribute = self.topology.get_attribute_index(self.rule.attribute)
+        if not np.issubdtype(
+            self.topology.attributes_dtypes[self.attribute], np.floating
+        ):
+            raise InvalidParameterError("el atributo de la regla debe ser de tipo real")
+
+        # atributos que no modifica la regla
+        self.others = [
+            attribute
+            for attribute in range(self.topology.attributes_number)
+            if attribute != self.attribute
+        ]
+
+    def compute(self, states, attributes, region):
+        """
+        Este metodo calcula los nuevos valores de las celulas de una region
+
+        Parameters
+        ----------
+        states(ndarray(int)): arreglo con los estados de las celulas,
+            incluyendo la frontera
+        attributes(list(ndarray)): lista con un arreglo por atributo con los
+            valores de las celulas, incluyendo la frontera
+        region(tuple(slice)): region de las celulas que se actualizan, en
+            coordenadas de los arreglos
+
+        Returns
+        -------
+        out(tuple): tupla cuya primera componente es un arreglo con los
+            estados de la region (no cambian), y la segunda componente un
+            arreglo con los nuevos atributos de la region
+        """
+        values = attributes[self.attribute]
+        potential = correlate(
+            values, self.rule.kernel, self.offset, region, self.rule.dtype
+        )
+
+        new_attributes = np.stack([field[region] for field in attributes], axis=-1)
+        self.rule.update(values[region], potential, new_attributes[..., self.attribute])
+
+        return states[region], new_attributes
+
+    def step(self):
+        """
+        Este metodo calcula una generacion del automata
+        """
+        topology = self.topology
+        region = topology.subshape
+        read, write = topology.read_buffer, topology.write_buffer
+
+        # cada atributo es un arreglo contiguo, por lo que la correlacion no
+        # recorre los demas atributos
+        values = topology.attributes[read][self.attribute]
+        potential = correlate(
+            values, self.rule.kernel, self.offset, region, self.rule.dtype
+        )
+        self.rule.update(
+            values[region],
+            potential,
+            topology.attributes[write][self.attribute][region],
+        )
+
+        # los estados y los demas atributos no cambian
+        topology.states[write][region] = topology.states[read][region]
+        for attribute in self.others:
+            topology.attributes[write][attribute][region] = topology.attributes[read][
+                attribute
+            ][region]
+
+        topology.mark_changes()
+
+
+class PackedBSNotationEngine(PackedEngine):
+    """
+    Este motor calcula las generaciones de las reglas en notacion B/S de radio
+    1 con 2 estados. Cada fila del plano se empaqueta con 64 celulas por
+    palabra (uint64), el numero de vecinos vivos se calcula con sumadores
+    (medios sumadores y sumadores completos) sobre las palabras, obteniendo
+    los 4 bits del numero de vecinos en planos de bits separados, y las listas
+    B y S se aplican como operaciones logicas sobre esos planos
+
+    Parameters
+    ----------
+    rule(BSNotationRule): regla de transicion del automata, debe tener radio
+        1
+    topology(FiniteNGridTopology): topologia del automata
+    """
+
+    def __init__(self, rule, topology):
+        super().__init__(rule, topology)
+
+        # con radio 1 hay entre 0 y 8 vecinos vivos
+        self.birth = list(range(9)) if self.rule.B == [] else self.rule.B
+        self.birth = [b for b in self.birth if 0 <= b <= 8]
+        self.survival = [s for s in self.rule.S if 0 <= s <= 8]
+
+    @staticmethod
+    def full_adder(a, b, c):
+        """
+        Este metodo suma 3 planos de bits
+
+        Returns
+        -------
+        out(tuple): tupla con el bit de la suma y el bit de acarreo
+        """
+        partial = a ^ b
+
+        return partial ^ c, (a & b) | (c & partial)
+
+    @staticmethod
+    def half_adder(a, b):
+        """
+        Este metodo suma 2 planos de bits
+
+        Returns
+        -------
+        out(tuple): tupla con el bit de la suma y el bit de acarreo
+        """
+        return a ^ b, a & b
+
+    def count_neighbors(self, neighbors):
+        """
+        Este metodo suma los 8 planos de bits de los vecinos
+
+        Parameters
+        ----------
+        neighbors(list(ndarray(uint64))): planos de bits de cada vecino,
+            alineados con la celula que se actualiza
+
+        Returns
+        -------
+        out(list(ndarray(uint64))): los 4 planos de bits del numero de
+            vecinos vivos, desde el bit menos significativo
+        """
+        # bits de peso 1
+        sum_1, carry_1 = self.full_adder(*neighbors[0:3])
+        sum_2, carry_2 = self.full_adder(*neighbors[3:6])
+        sum_3, carry_3 = self.half_adder(*neighbors[6:8])
+        bit_0, carry_4 = self.full_adder(sum_1, sum_2, sum_3)
+
+        # bits de peso 2
+        sum_4, carry_5 = self.full_adder(carry_1, carry_2, carry_3)
+        bit_1, carry_6 = self.half_adder(sum_4, carry_4)
+
+        # bits de peso 4 y 8
+        bit_2, bit_3 = self.half_adder(carry_5, carry_6)
+
+        return [bit_0, bit_1, bit_2, bit_3]
+
+    @staticmethod
+    def any_count(bits, counts):
+        """
+        Este metodo retorna el plano de bits de las celulas cuyo numero de
+        vecinos esta en una lista
+
+        Parameters
+        ----------
+        bits(list(ndarray(uint64))): planos de bits del numero de vecinos
+        counts(list(int)): numeros de vecinos aceptados
+
+        Returns
+        -------
+        out(ndarray(uint64)): plano de bits resultante
+        """
+        result = np.zeros_like(bits[0])
+
+        for count in set(counts):
+            equal = np.full_like(result, ~np.uint64(0))
+            for i, bit in enumerate(bits):
+                equal &= bit if count >> i & 1 else ~bit
+            result |= equal
+
+        return result
+
+    def compute_packed(self, words, region):
+        """
+        Este metodo calcula los nuevos estados de una region a partir del
+        buffer de lectura empaquetado
+
+        Parameters
+        ----------
+        words(ndarray(uint64)): buffer de lectura empaquetado, incluyendo la
+            frontera
+        region(tuple(slice)): region de las celulas que se actualizan, en
+            coordenadas de los arreglos (sin empaquetar)
+
+        Returns
+        -------
+        out(ndarray(uint64)): palabras con los nuevos estados de las filas de
+            la region, alineadas con words
+        """
+        rows = region[0]
+        height = rows.stop - rows.start
+
+        # la region se extiende una fila en cada direccion
+        extended = words[rows.start - 1 : rows.stop + 1]
+
+        # columnas de la izquierda, del centro y de la derecha de cada celula
+        left, center, right = (shift_bits(extended, shift) for shift in (1, 0, -1))
+
+        neighbors = [
+            column[row : row + height]
+            for row in range(3)
+            for column in (left, center, right)
+            if row != 1 or column is not center
+        ]
+        bits = self.count_neighbors(neighbors)
+
+        alive = center[1 : height + 1]
+
+        return (alive & self.any_count(bits, self.survival)) | (
+            ~alive & self.any_count(bits, self.birth)
+        )
+
+
+class SparseBSNotationEngine(Engine):
+    """
+    Este motor calcula las generaciones de las reglas en notacion B/S sobre
+    una topologia dispersa (SparseTopology). Cada celula almacenada suma su
+    estado a todas las celulas de las que es vecina, las sumas de todas las
+    celulas se acumulan a la vez agrupando las posiciones repetidas, de esta
+    forma el costo es proporcional al numero de celulas vivas y no al area
+    que ocupan
+
+    Parameters
+    ----------
+    rule(BSNotationRule): regla de transicion del automata, el espacio vacio
+        debe permanecer vacio (B no puede contener 0 ni ser vacia)
+    topology(SparseTopology): topologia del automata, con estado por defecto
+        0
+    """
+
+    def __init__(self, rule, topology):
+        super().__init__(rule, topology)
+
+        # si B es vacia toda celula muerta nace (ver BSNotationRule)
+        if self.rule.B == [] or 0 in self.rule.B or self.topology.default_state != 0:
+            raise InvalidParameterError(
+                "la topologia dispersa necesita que el espacio vacio permanezca "
+                "vacio"
+            )
+
+        # igual que en BSNotationEngine, el indice mask.size representa las
+        # cuentas fuera de rango
+        self.out_of_range = self.mask.size
+
+        self.birth = np.zeros(self.out_of_range + 1, dtype=bool)
+        self.birth[[b for b in self.rule.B if 0 <= b < self.out_of_range]] = True
+
+        self.survival = np.zeros(self.out_of_range + 1, dtype=bool)
+        self.survival[[s for s in self.rule.S if 0 <= s < self.out_of_range]] = True
+
+        # la celula p tiene en su vecindad a la celula q si q = p + d, donde d
+        # es uno de los desplazamientos de la vecindad
+        self.displacements = np.argwhere(self.mask) + np.asarray(self.offset)
+        self.center = np.flatnonzero(~self.displacements.any(axis=1))
+
+    def step(self):
+        """
+        Este metodo calcula una generacion del automata
+        """
+        positions, states, _ = self.topology.get_stored_cells()
+        self.topology.clear()
+
+        if len(positions) == 0:
+            return
+
+        # posiciones de las celulas que tienen en su vecindad a cada celula
+        # almacenada
+        targets = positions[:, None, :] - self.displacements[None, :, :]
+        candidates, inverse = unique_rows(targets.reshape(-1, positions.shape[1]))
+        inverse = inverse.reshape(targets.shape[:2])
+
+        counts = np.bincount(
+            inverse.ravel(),
+            weights=np.repeat(states, len(self.displacements)),
+            minlength=len(candidates),
+        ).astype(np.int64)
+
+        # estado actual de los candidatos, las celulas almacenadas son las
+        # que tienen desplazamiento 0 respecto a si mismas
+        center = np.zeros(len(candidates), dtype=states.dtype)
+        center[inverse[:, self.center[0]]] = states
+
+        # la suma sobre la vecindad incluye a la celula del centro
+        counts -= center
+        counts[(counts < 0) | (counts > self.out_of_range)] = self.out_of_range
+
+        new_states = np.where(
+            center == 1, self.survival[counts], (center == 0) & self.birth[counts]
+        )
+
+        self.topology.update_stored_cells(
+            candidates[new_states], np.ones(np.count_nonzero(new_states), dtype=int)
+        )
@@ -0,0 +1,558 @@
+"""
+HashLife es un algoritmo para simular reglas en notacion B/S de radio 1 sobre
+un plano infinito. El espacio se representa como un quadtree de macroceldas
+canonicas (dos macroceldas con el mismo contenido son el mismo objeto), y el
+resultado de avanzar cada macrocelda se memoriza, de esta forma los patrones
+con estructuras repetidas en el espacio o en el tiempo se pueden avanzar
+2^k generaciones en una sola llamada
+
+En este modulo se implementa el algoritmo y la interoperabilidad con la clase
+FiniteNGridTopology para importar y exportar la region visible
+"""
+
+import sys
+from collections import OrderedDict
+
+import numpy as np
+
+from pycellslib.errors import InvalidParameterError
+
+
+class Node:
+    """
+    Esta clase representa una macrocelda del quadtree, esto es, un cuadrado
+    de 2^level x 2^level celulas formado por 4 macroceldas de nivel
+    level - 1. Las macroceldas de nivel 0 son las celulas
+
+    Parameters
+    ----------
+    level(int): nivel de la macrocelda
+    a(Node|None): cuadrante superior izquierdo
+    b(Node|None): cuadrante superior derecho
+    c(Node|None): cuadrante inferior izquierdo
+    d(Node|None): cuadrante inferior derecho
+    population(int): numero de celulas vivas en la macrocelda
+    """
+
+    __slots__ = ("level", "a", "b", "c", "d", "population")
+
+    def __init__(self, level, a, b, c, d, population):
+        self.level = level
+        self.a = a
+        self.b = b
+        self.c = c
+        self.d = d
+        self.population = population
+
+
+class HashLife:
+    """
+    Esta clase simula una regla en notacion B/S de radio 1 con el algoritmo
+    HashLife. Las macroceldas se guardan en una tabla que las hace canonicas,
+    y los resultados de avanzar cada macrocelda se guardan en una cache con
+    politica de reemplazo LRU (se descarta el resultado usado hace mas
+    tiempo)
+
+    Parameters
+    ----------
+    rule(BSNotationRule): regla de transicion, debe tener radio 1 con
+        vecindad de Moore y el espacio vacio debe permanecer vacio (B no
+        puede contener 0 ni ser vacia)
+    max_cache_size(int|None): numero maximo de resultados memorizados, None
+        indica que no hay limite
+    max_nodes(int|None): numero de macroceldas a partir del cual se eliminan
+        las macroceldas que no se usan, None indica que no hay limite. Es un
+        limite aproximado, las macroceldas del patron actual nunca se
+        eliminan, por lo que la tabla puede superarlo
+    """
+
+    def __init__(self, rule, max_cache_size=2**20, max_nodes=None):
+        if rule.radius != 1 or rule.neighborhood_type != "moore":
+            raise InvalidParameterError(
+                "HashLife solo acepta reglas de radio 1 con vecindad de Moore"
+            )
+
+        # si B es vacia toda celula muerta nace (ver BSNotationRule)
+        if rule.B == [] or 0 in rule.B:
+            raise InvalidParameterError(
+                "HashLife necesita que el espacio vacio permanezca vacio"
+            )
+
+        self.birth = frozenset(rule.B)
+        self.survival = frozenset(rule.S)
+        self.max_cache_size = max_cache_size
+        self.max_nodes = max_nodes
+
+        # tabla de macroceldas canonicas, indexada por sus cuadrantes
+        self.nodes = {}
+        # resultados memorizados, indexados por la macrocelda y el exponente
+        # del numero de generaciones
+        self.results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        self.off = Node(0, None, None, None, None, 0)
+        self.on = Node(0, None, None, None, None, 1)
+        self.empty_nodes = [self.off]
+
+        # la raiz es una macrocelda de nivel 3 vacia, cuya esquina superior
+        # izquierda esta en (top, left)
+        self.root = self.empty(3)
+        self.top = 0
+        self.left = 0
+        self.generation = 0
+
+    def join(self, a, b, c, d):
+        """
+        Este metodo retorna la macrocelda canonica formada por 4 cuadrantes
+
+        Parameters
+        ----------
+        a(Node): cuadrante superior izquierdo
+        b(Node): cuadrante superior derecho
+        c(Node): cuadrante inferior izquierdo
+        d(Node): cuadrante inferior derecho
+
+        Returns
+        -------
+        out(Node): macrocelda canonica
+        """
+        key = (a, b, c, d)
+        node = self.nodes.get(key)
+
+        if node is None:
+            population = a.population + b.population + c.population + d.population
+            node = Node(a.level + 1, a, b, c, d, population)
+            self.nodes[key] = node
+
+        return node
+
+    def empty(self, level):
+        """
+        Este metodo retorna la macrocelda vacia de un nivel
+
+        Parameters
+        ----------
+        level(int): nivel de la macrocelda
+
+        Returns
+        -------
+        out(Node): macrocelda vacia
+        """
+        while len(self.empty_nodes) <= level:
+            node = self.empty_nodes[-1]
+            self.empty_nodes.append(self.join(node, node, node, node))
+
+        return self.empty_nodes[level]
+
+    def centre(self, node):
+        """
+        Este metodo retorna una macrocelda del siguiente nivel que tiene a la
+        macrocelda dada en su centro, rodeada de celulas muertas
+
+        Parameters
+        ----------
+        node(Node): macrocelda
+
+        Returns
+        -------
+        out(Node): macrocelda de nivel node.level + 1
+        """
+        empty = self.empty(node.level - 1)
+
+        return self.join(
+            self.join(empty, empty, empty, node.a),
+            self.join(empty, empty, node.b, empty),
+            self.join(empty, node.c, empty, empty),
+            self.join(node.d, empty, empty, empty),
+        )
+
+    def inner(self, node):
+        """
+        Este metodo retorna la macrocelda del nivel anterior que esta en el
+        centro de la macrocelda dada
+
+        Parameters
+        ----------
+        node(Node): macrocelda
+
+        Returns
+        -------
+        out(Node): macrocelda de nivel node.level - 1
+        """
+        return self.join(node.a.d, node.b.c, node.c.b, node.d.a)
+
+    def life_4x4(self, node):
+        """
+        Este metodo avanza una generacion una macrocelda de nivel 2 (4x4) y
+        retorna su centro (2x2)
+
+        Parameters
+        ----------
+        node(Node): macrocelda de nivel 2
+
+        Returns
+        -------
+        out(Node): macrocelda de nivel 1
+        """
+        cells = [
+            [node.a.a, node.a.b, node.b.a, node.b.b],
+            [node.a.c, node.a.d, node.b.c, node.b.d],
+            [node.c.a, node.c.b, node.d.a, node.d.b],
+            [node.c.c, node.c.d, node.d.c, node.d.d],
+        ]
+        cells = [[cell.population for cell in row] for row in cells]
+
+        new_cells = []
+        for y in (1, 2):
+            for x in (1, 2):
+                alive = sum(
+                    cells[y + dy][x + dx] for dy in (-1, 0, 1) for dx in (-1, 0, 1)
+                )
+                alive -= cells[y][x]
+
+                if cells[y][x] == 1:
+                    new_cells.append(self.on if alive in self.survival else self.off)
+                else:
+                    new_cells.append(self.on if alive in self.birth else self.off)
+
+        return self.join(*new_cells)
+
+    def successor(self, node, exponent):
+        """
+        Este metodo avanza 2^exponent generaciones una macrocelda y retorna su
+        centro. El exponente debe ser como maximo node.level - 2
+
+        Parameters
+        ----------
+        node(Node): macrocelda de nivel mayor o igual a 2
+        exponent(int): exponente del numero de generaciones
+
+        Returns
+        -------
+        out(Node): macrocelda de nivel node.level - 1
+        """
+        if node.population == 0:
+            return node.a
+
+        key = (node, exponent)
+        result = self.results.get(key)
+        if result is not None:
+            self.hits += 1
+            self.results.move_to_end(key)
+            return result
+
+        self.misses += 1
+
+        if node.level == 2:
+            result = self.life_4x4(node)
+        else:
+            a, b, c, d = node.a, node.b, node.c, node.d
+
+            # 9 macroceldas del nivel anterior que se superponen, avanzadas
+            # 2^exponent (o 2^(exponent - 1) generaciones si se necesitan 2
+            # pasos)
+            half = exponent if exponent < node.level - 2 else exponent - 1
+            partial = [
+                self.successor(self.join(*quadrants), half)
+                for quadrants in (
+                    (a.a, a.b, a.c, a.d),
+                    (a.b, b.a, a.d, b.c),
+                    (b.a, b.b, b.c, b.d),
+                    (a.c, a.d, c.a, c.b),
+                    (a.d, b.c, c.b, d.a),
+                    (b.c, b.d, d.a, d.b),
+                    (c.a, c.b, c.c, c.d),
+                    (c.b, d.a, c.d, d.c),
+                    (d.a, d.b, d.c, d.d),
+                )
+            ]
+            p1, p2, p3, p4, p5, p6, p7, p8, p9 = partial
+
+            if exponent < node.level - 2:
+                result = self.join(
+                    self.join(p1.d, p2.c, p4.b, p5.a),
+                    self.join(p2.d, p3.c, p5.b, p6.a),
+                    self.join(p4.d, p5.c, p7.b, p8.a),
+                    self.join(p5.d, p6.c, p8.b, p9.a),
+                )
+            else:
+                result = self.join(
+                    self.successor(self.join(p1, p2, p4, p5), half),
+                    self.successor(self.join(p2, p3, p5, p6), half),
+                    self.successor(self.join(p4, p5, p7, p8), half),
+                    self.successor(self.join(p5, p6, p8, p9), half),
+                )
+
+        self.results[key] = result
+        if self.max_cache_size is not None and len(self.results) > self.max_cache_size:
+            self.results.popitem(last=False)
+
+        return result
+
+    def advance(self, exponent):
+        """
+        Este metodo avanza 2^exponent generaciones el patron
+
+        Parameters
+        ----------
+        exponent(int): exponente del numero de generaciones
+        """
+        if exponent < 0:
+            raise InvalidParameterError("el exponente debe ser no negativo")
+
+        # el patron debe estar en el centro de la raiz, y la raiz debe ser
+        # suficientemente grande para que el patron no la abandone
+        root = self.root
+        while (
+            root.level < exponent + 2 or root.population != self.inner(root).population
+        ):
+            root = self.expand(root)
+        root = self.expand(root)
+
+        self.root = self.successor(root, exponent)
+        self.top += 2 ** (root.level - 2)
+        self.left += 2 ** (root.level - 2)
+        self.generation += 2**exponent
+
+        if self.max_nodes is not None and len(self.nodes) > self.max_nodes:
+            self.collect_garbage()
+
+    def run(self, generations):
+        """
+        Este metodo avanza un numero arbitrario de generaciones, usando un
+        avance de 2^k generaciones por cada bit del numero de generaciones
+
+        Parameters
+        ----------
+        generations(int): numero de generaciones
+        """
+        exponent = 0
+        while generations > 0:
+            if generations & 1:
+                self.advance(exponent)
+            generations >>= 1
+            exponent += 1
+
+    def expand(self, node):
+        """
+        Este metodo centra la raiz en una macrocelda del siguiente nivel,
+        actualizando la posicion de su esquina superior izquierda
+
+        Parameters
+        ----------
+        node(Node): raiz actual
+
+        Returns
+        -------
+        out(Node): nueva raiz
+        """
+        self.top -= 2 ** (node.level - 1)
+        self.left -= 2 ** (node.level - 1)
+
+        return self.centre(node)
+
+    def collect_garbage(self):
+        """
+        Este metodo elimina de la tabla las macroceldas que no se pueden
+        alcanzar desde la raiz ni desde los resultados memorizados. Si la
+        tabla sigue siendo mayor que max_nodes, se vacia la cache de
+        resultados y se eliminan de nuevo las macroceldas, una sola vez, ya
+        que las macroceldas de la raiz pueden superar por si solas el limite
+        """
+        self.sweep()
+
+        if self.max_nodes is not None and len(self.nodes) > self.max_nodes:
+            self.results.clear()
+            self.sweep()
+
+    def sweep(self):
+        """
+        Este metodo elimina de la tabla las macroceldas que no se pueden
+        alcanzar desde la raiz ni desde los resultados memorizados
+        """
+        reachable = set()
+        pending = [self.root, *self.empty_nodes]
+        for key, result in self.results.items():
+            pending.extend((key[0], result))
+
+        while pending:
+            node = pending.pop()
+            if node.level == 0 or id(node) in reachable:
+                continue
+            reachable.add(id(node))
+            pending.extend((node.a, node.b, node.c, node.d))
+
+        self.nodes = {
+            key: node for key, node in self.nodes.items() if id(node) in reachable
+        }
+
+    def build(self, states, level):
+        """
+        Este metodo construye la macrocelda que representa un arreglo
+        cuadrado de 2^level x 2^level
+
+        Parameters
+        ----------
+        states(ndarray(int)): arreglo de estados
+        level(int): nivel de la macrocelda
+
+        Returns
+        -------
+        out(Node): macrocelda
+        """
+        if not states.any():
+            return self.empty(level)
+
+        if level == 0:
+            return self.on
+
+        half = 2 ** (level - 1)
+
+        return self.join(
+            self.build(states[:half, :half], level - 1),
+            self.build(states[:half, half:], level - 1),
+            self.build(states[half:, :half], level - 1),
+            self.build(states[half:, half:], level - 1),
+        )
+
+    def set_states(self, states, top=0, left=0):
+        """
+        Este metodo reemplaza el patron por un arreglo de estados (0/1)
+
+        Parameters
+        ----------
+        states(ndarray(int)): arreglo bidimensional de estados
+        top(int): fila en la que se ubica la primera fila del arreglo
+        left(int): columna en la que se ubica la primera columna del arreglo
+        """
+        states = np.asarray(states) != 0
+        level = max(3, int(np.ceil(np.log2(max(states.shape)))))
+
+        padded = np.zeros((2**level, 2**level), dtype=bool)
+        padded[: states.shape[0], : states.shape[1]] = states
+
+        self.root = self.build(padded, level)
+        self.top = top
+        self.left = left
+
+    def get_region(self, top, left, height, width):
+        """
+        Este metodo retorna los estados de una region rectangular del plano
+
+        Parameters
+        ----------
+        top(int): fila de la esquina superior izquierda de la region
+        left(int): columna de la esquina superior izquierda de la region
+        height(int): alto de la region
+        width(int): ancho de la region
+
+        Returns
+        -------
+        out(ndarray(int)): arreglo de estados de la region
+        """
+        region = np.zeros((height, width), dtype=int)
+        pending = [(self.root, self.top - top, self.left - left)]
+
+        while pending:
+            node, y, x = pending.pop()
+            size = 2**node.level
+
+            # las macroceldas vacias o fuera de la region no se recorren
+            if (
+                node.population == 0
+                or y >= height
+                or x >= width
+                or y + size <= 0
+                or x + size <= 0
+            ):
+                continue
+
+            if node.level == 0:
+                region[y, x] = 1
+                continue
+
+            half = size // 2
+            pending.extend(
+                (
+                    (node.a, y, x),
+                    (node.b, y, x + half),
+                    (node.c, y + half, x),
+                    (node.d, y + half, x + half),
+                )
+            )
+
+        return region
+
+    def load_topology(self, topology):
+        """
+        Este metodo reemplaza el patron por los estados de una topologia
+        bidimensional (sin tener en cuenta la frontera), la celula (0, 0) de
+        la topologia se ubica en la posicion (0, 0) del plano. Se usa el
+        buffer de escritura, que contiene la generacion mas reciente
+
+        Parameters
+        ----------
+        topology(FiniteNGridTopology): topologia bidimensional
+        """
+        self.set_states(topology.states[topology.write_buffer][topology.subshape])
+
+    def store_topology(self, topology):
+        """
+        Este metodo escribe la region visible del plano (la que tiene las
+        dimensiones de la topologia a partir de la posicion (0, 0)) en los
+        dos buffers de la topologia, de esta forma los estados se pueden leer
+        con get_states y el automata puede continuar desde ellos
+
+        Parameters
+        ----------
+        topology(FiniteNGridTopology): topologia bidimensional
+        """
+        height, width = topology.dimensions
+        states = self.get_region(0, 0, height, width)
+
+        topology.set_values_from_configuration(states)
+        topology.flip()
+        topology.set_values_from_configuration(states)
+        topology.flip()
+
+    def get_population(self):
+        """
+        Este metodo retorna el numero de celulas vivas del patron
+
+        Returns
+        -------
+        out(int): numero de celulas vivas
+        """
+        return self.root.population
+
+    def get_statistics(self):
+        """
+        Este metodo retorna estadisticas del uso de la memoria y de la cache
+        de resultados. La memoria es una estimacion del tamano de las
+        macroceldas y de las entradas de las tablas
+
+        Returns
+        -------
+        out(dict): diccionario con el numero de macroceldas (nodes), el numero
+            de resultados memorizados (cached_results), los aciertos (hits) y
+            fallos (misses) de la cache, la tasa de aciertos (hit_rate) y la
+            memoria estimada en bytes (memory)
+        """
+        # tamano de una macrocelda, de la llave de la tabla (tupla de 4) y de
+        # una entrada en un diccionario (hash, llave y valor)
+        node_size = sys.getsizeof(self.on) + sys.getsizeof((0, 0, 0, 0)) + 24
+        # tamano de la llave de la cache (tupla de 2) y de su entrada en el
+        # OrderedDict (que ademas mantiene una lista enlazada)
+        result_size = sys.getsizeof((0, 0)) + 24 + 56
+
+        lookups = self.hits + self.misses
+
+        return {
+            "nodes": len(self.nodes),
+            "cached_results": len(self.results),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups != 0 else 0.0,
+            "memory": len(self.nodes) * node_size + len(self.results) * result_size,
+        }
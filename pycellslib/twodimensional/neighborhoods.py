@@ -14,6 +14,7 @@ definicion de automatas celulares 2-dimensionales
 import numpy as np
 
 from pycellslib.core import Neighborhood
+from pycellslib.errors import InvalidParameterError
 
 
 class MooreNeighborhood(Neighborhood):
@@ -57,11 +58,95 @@ class MooreNeighborhood(Neighborhood):
 
 
 class CircularNeighborhood(Neighborhood):
-    """docstring for CircularNeighborhood"""
+    """
+    Esta clase representa la vecindad circular de una celula en un espacio
+    2-dimensional, esto es, las celulas cuyo centro esta a una distancia
+    euclidiana menor que radius + 1/2 del centro de la celula (x^2 + y^2 <=
+    radius^2 + radius). Es la vecindad NC de las reglas Larger than Life
+
+    Parameters
+    ----------
+    radius(int): radio de la vecindad
+    inclusive(bool): si es True, la celula afecta su propia transicion, False
+        en caso contrario
+    """
+
+    def __init__(self, radius=1, inclusive=True):
+        self.radius = radius
+        xx, yy = np.meshgrid(
+            np.arange(-radius, radius + 1, 1, dtype=int),
+            np.arange(-radius, radius + 1, 1, dtype=int),
+            sparse=True,
+        )
+        self.mask = xx**2 + yy**2 <= radius**2 + radius
+        if not inclusive:
+            self.mask[radius, radius] = 0
+
+    def get_mask(self):
+        """
+        Este metodo retorna la mascara que define la vecindad de una celula
+
+        Returns
+        -------
+        out(ndarray(bool)): mascara
+        """
+        return self.mask
+
+    def get_offset(self):
+        """
+        Este metodo retorna el offset de la mascara
+
+        Returns
+        -------
+        out(int|tuple): valor que indica el offset en cada eje de la mascara
+        """
+        return -self.radius, -self.radius
 
 
 class L2Neighborhood(Neighborhood):
-    """docstring for L2Neighborhood"""
+    """
+    Esta clase representa la vecindad euclidiana (L^2) de una celula en un
+    espacio 2-dimensional, esto es, las celulas a una distancia euclidiana
+    menor o igual que radius (x^2 + y^2 <= radius^2). Es la vecindad N2 de las
+    reglas Larger than Life
+
+    Parameters
+    ----------
+    radius(int): radio de la vecindad
+    inclusive(bool): si es True, la celula afecta su propia transicion, False
+        en caso contrario
+    """
+
+    def __init__(self, radius=1, inclusive=True):
+        self.radius = radius
+        xx, yy = np.meshgrid(
+            np.arange(-radius, radius + 1, 1, dtype=int),
+            np.arange(-radius, radius + 1, 1, dtype=int),
+            sparse=True,
+        )
+        self.mask = xx**2 + yy**2 <= radius**2
+        if not inclusive:
+            self.mask[radius, radius] = 0
+
+    def get_mask(self):
+        """
+        Este metodo retorna la mascara que define la vecindad de una celula
+
+        Returns
+        -------
+        out(ndarray(bool)): mascara
+        """
+        return self.mask
+
+    def get_offset(self):
+        """
+        Este metodo retorna el offset de la mascara
+
+        Returns
+        -------
+        out(int|tuple): valor que indica el offset en cada eje de la mascara
+        """
+        return -self.radius, -self.radius
 
 
 class NeumannNeighborhood(Neighborhood):
@@ -107,3 +192,102 @@ class NeumannNeighborhood(Neighborhood):
         out(int|tuple): valor que indica el offset en cada eje de la mascara
         """
         return -self.radius, -self.radius
+
+
+class WeightedNeighborhood(Neighborhood):
+    """
+    Esta clase representa una vecindad con pesos (enteros o reales) en un
+    espacio 2-dimensional, centrada en la celula. La mascara son las celulas
+    con peso distinto de 0, y siempre incluye a la celula del centro (aunque
+    su peso sea 0) para que la regla conozca su estado
+
+    Parameters
+    ----------
+    weights(list(list)|ndarray): pesos de la vecindad, un arreglo
+        bidimensional con un numero impar de filas y de columnas, la celula
+        del centro del arreglo es la celula que se actualiza
+    """
+
+    def __init__(self, weights):
+        self.weights = np.array(weights)
+        if self.weights.dtype == bool:
+            self.weights = self.weights.astype(int)
+
+        if (
+            self.weights.ndim != 2
+            or not np.issubdtype(self.weights.dtype, np.number)
+            or any(size % 2 == 0 for size in self.weights.shape)
+        ):
+            raise InvalidParameterError(
+                "los pesos deben ser un arreglo numerico bidimensional con un "
+                "numero impar de filas y de columnas"
+            )
+
+        self.radius = tuple(size // 2 for size in self.weights.shape)
+
+        self.mask = self.weights != 0
+        self.mask[self.radius] = True
+
+    def get_mask(self):
+        """
+        Este metodo retorna la mascara que define la vecindad de una celula
+
+        Returns
+        -------
+        out(ndarray(bool)): mascara
+        """
+        return self.mask
+
+    def get_offset(self):
+        """
+        Este metodo retorna el offset de la mascara
+
+        Returns
+        -------
+        out(int|tuple): valor que indica el offset en cada eje de la mascara
+        """
+        return -self.radius[0], -self.radius[1]
+
+    def get_weights(self):
+        """
+        Este metodo retorna los pesos de las celulas de la vecindad
+
+        Returns
+        -------
+        out(ndarray(int)|ndarray(float)): pesos de la vecindad
+        """
+        return self.weights
+
+
+class LeniaNeighborhood(WeightedNeighborhood):
+    """
+    Esta clase representa el nucleo de los automatas Lenia, un nucleo con
+    pesos reales formado por anillos concentricos. La distancia normalizada
+    r = distancia / radius (entre 0 y 1) se divide en len(peaks) anillos, y
+    en cada anillo el peso es la altura del anillo por la funcion
+    exp(4 - 1 / (t (1 - t))), donde t es la posicion (entre 0 y 1) dentro del
+    anillo. Los pesos se normalizan para que sumen 1
+
+    Parameters
+    ----------
+    radius(int): radio del nucleo
+    peaks(tuple(float)|list(float)): altura de cada anillo, desde el centro
+    """
+
+    def __init__(self, radius=13, peaks=(1.0,)):
+        x, y = np.indices((2 * radius + 1, 2 * radius + 1)) - radius
+        distance = np.sqrt(x**2 + y**2) / radius * len(peaks)
+
+        ring = np.minimum(distance.astype(int), len(peaks) - 1)
+        position = distance - ring
+
+        weights = np.zeros(distance.shape)
+        inside = (distance < len(peaks)) & (position > 0) & (position < 1)
+        weights[inside] = np.asarray(peaks, dtype=float)[ring[inside]] * np.exp(
+            4 - 1 / (position[inside] * (1 - position[inside]))
+        )
+
+        if weights.sum() == 0:
+            raise InvalidParameterError("el nucleo no tiene pesos distintos de 0")
+
+        super().__init__(weights / weights.sum())
@@ -8,8 +8,32 @@ celulares bidimensionales
 """
 import numpy as np
 
-from pycellslib.core import Rule
-from pycellslib.twodimensional.neighborhoods import MooreNeighborhood
+from pycellslib.core import FiniteNGridTopology, Neighborhood, Rule, SparseTopology
+from pycellslib.errors import InvalidParameterError
+from pycellslib.twodimensional.engines import (
+    BSNotationEngine,
+    ContinuousEngine,
+    OuterTotalisticEngine,
+    PackedBSNotationEngine,
+    SparseBSNotationEngine,
+    WeightedSumEngine,
+)
+from pycellslib.twodimensional.neighborhoods import (
+    CircularNeighborhood,
+    L2Neighborhood,
+    LeniaNeighborhood,
+    MooreNeighborhood,
+    NeumannNeighborhood,
+    WeightedNeighborhood,
+)
+
+# vecindades que se pueden usar en las reglas totalisticas
+NEIGHBORHOODS = {
+    "moore": MooreNeighborhood,
+    "neumann": NeumannNeighborhood,
+    "circular": CircularNeighborhood,
+    "l2": L2Neighborhood,
+}
 
 
 class BSNotationRule(Rule):
@@ -24,14 +48,75 @@ class BSNotationRule(Rule):
         sobreviva
     radius(int): en este formato de especificacino de las reglas
         se debe usar una vecindad de Moore, este parametro representa el radio
-        de esa vecindad
+        de esa vecindad. Con radios grandes (reglas Larger than Life) el
+        costo por celula del motor vectorizado no depende del radio
+    neighborhood(str): tipo de vecindad, "moore", "neumann" (el rombo
+        |dx| + |dy| <= radius), "circular" o "l2" (ver CircularNeighborhood y
+        L2Neighborhood)
     """
 
-    def __init__(self, B, S, radius=1):
+    deterministic = True
+
+    def __init__(self, B, S, radius=1, neighborhood="moore"):
+        if neighborhood not in NEIGHBORHOODS:
+            raise InvalidParameterError(
+                f"la vecindad debe ser una de {list(NEIGHBORHOODS)}"
+            )
+
         self.B = B
         self.S = S
         self.radius = radius
-        self.neighborhood = MooreNeighborhood(radius=radius, inclusive=True)
+        self.neighborhood_type = neighborhood
+        self.neighborhood = NEIGHBORHOODS[neighborhood](radius=radius, inclusive=True)
+
+    @classmethod
+    def from_larger_than_life(cls, notation):
+        """
+        Este metodo crea una regla a partir de su notacion Larger than Life,
+        por ejemplo "R5,C0,M1,S34..58,B34..45,NM" (regla de Bosco). R es el
+        radio, C el numero de estados (0 y 2 representan 2 estados), M indica
+        si la celula del centro se cuenta como vecina (1) o no (0), S y B son
+        los intervalos de supervivencia y nacimiento, y N el tipo de vecindad
+        (M para Moore, N para Neumann, C para la vecindad circular y 2 para
+        la euclidiana)
+
+        Parameters
+        ----------
+        notation(str): notacion de la regla
+
+        Returns
+        -------
+        out(BSNotationRule): regla
+        """
+        fields = {}
+        for field in notation.upper().replace(" ", "").split(","):
+            fields[field[:1]] = field[1:]
+
+        try:
+            radius = int(fields["R"])
+            states = int(fields.get("C", "0"))
+            middle = int(fields.get("M", "0"))
+            survival, birth = (
+                [int(limit) for limit in fields[key].split("..")] for key in "SB"
+            )
+            codes = {"M": "moore", "N": "neumann", "C": "circular", "2": "l2"}
+            neighborhood = codes[fields.get("N", "M")]
+        except (KeyError, ValueError) as error:
+            raise InvalidParameterError(
+                f"la notacion {notation} no es una notacion Larger than Life"
+            ) from error
+
+        if states not in (0, 2) or middle not in (0, 1):
+            raise InvalidParameterError("solo se admiten reglas con 2 estados")
+        if len(survival) != 2 or len(birth) != 2:
+            raise InvalidParameterError("S y B deben ser intervalos min..max")
+
+        # si la celula del centro se cuenta, una celula viva tiene un vecino
+        # vivo menos que la cuenta de la notacion
+        S = list(range(survival[0] - middle, survival[1] - middle + 1))
+        B = list(range(birth[0], birth[1] + 1))
+
+        return cls(B, S, radius, neighborhood)
 
     def get_neighborhood(self):
         """
@@ -43,6 +128,33 @@ class BSNotationRule(Rule):
         """
         return self.neighborhood
 
+    def get_engine(self, topology):
+        """
+        Este metodo retorna el motor vectorizado de la regla, que calcula todo
+        el plano en cada paso. Con radio 1 y vecindad de Moore se usa el motor
+        que empaqueta 64 celulas por palabra, y con una topologia dispersa el
+        motor que solo visita las celulas vivas y sus vecinas
+
+        Parameters
+        ----------
+        topology(Topology): topologia del automata
+
+        Returns
+        -------
+        out(BSNotationEngine|PackedBSNotationEngine|SparseBSNotationEngine|None):
+            motor de la regla, o None si la topologia no es bidimensional
+        """
+        if isinstance(topology, FiniteNGridTopology) and topology.dimensions.size == 2:
+            if self.radius == 1 and self.neighborhood_type == "moore":
+                return PackedBSNotationEngine(self, topology)
+
+            return BSNotationEngine(self, topology)
+
+        if isinstance(topology, SparseTopology) and topology.dimensions_number == 2:
+            return SparseBSNotationEngine(self, topology)
+
+        return None
+
     def apply_rule(self, cell_states, _):
         """
         Este metodo aplica la regla a una vecindad de alguna celula
@@ -76,3 +188,536 @@ class BSNotationRule(Rule):
                 new_state = 1
 
         return new_state, None
+
+
+class OuterTotalisticRule(Rule):
+    """
+    Esta clase representa las reglas totalisticas externas con varios
+    estados, esto es, aquellas en las que el nuevo estado de una celula
+    depende de su estado actual y del numero de vecinos en su estado de
+    disparo. Cada estado tiene un estado de disparo (en la mayoria de las
+    reglas es el mismo para todos los estados), y la regla se define con una
+    tabla indexada por el estado actual y el numero de vecinos en el estado
+    de disparo
+
+    Parameters
+    ----------
+    firing(list(int)|ndarray(int)): estado de disparo de cada estado, los
+        estados de la regla son 0, 1, ..., len(firing) - 1
+    table(list(list(int))|ndarray(int)|callable): arreglo de dimensiones
+        (len(firing), vecinos + 1) con el nuevo estado para cada estado y
+        numero de vecinos en el estado de disparo, o funcion que recibe el
+        estado y el numero de vecinos y retorna el nuevo estado
+    radius(int): radio de la vecindad
+    neighborhood(str): tipo de vecindad (ver NEIGHBORHOODS)
+    """
+
+    deterministic = True
+
+    def __init__(self, firing, table, radius=1, neighborhood="moore"):
+        if neighborhood not in NEIGHBORHOODS:
+            raise InvalidParameterError(
+                f"la vecindad debe ser una de {list(NEIGHBORHOODS)}"
+            )
+
+        self.radius = radius
+        self.neighborhood = NEIGHBORHOODS[neighborhood](radius=radius, inclusive=True)
+
+        self.firing = np.array(firing, dtype=int)
+        self.states_number = self.firing.size
+
+        # la celula del centro no se cuenta como vecina
+        neighbors = np.count_nonzero(self.neighborhood.get_mask()) - 1
+        if callable(table):
+            table = [
+                [table(state, count) for count in range(neighbors + 1)]
+                for state in range(self.states_number)
+            ]
+        self.table = np.array(table, dtype=int)
+
+        if self.table.shape != (self.states_number, neighbors + 1):
+            raise InvalidParameterError(
+                f"la tabla debe tener dimensiones ({self.states_number}, "
+                f"{neighbors + 1})"
+            )
+
+    def get_neighborhood(self):
+        """
+        Este metodo retorna la vecindad asociada a la regla
+
+        Returns
+        -------
+        out(Neighborhood): Objeto que representa la vecindad
+        """
+        return self.neighborhood
+
+    def get_engine(self, topology):
+        """
+        Este metodo retorna el motor vectorizado de la regla, que calcula todo
+        el plano en cada paso
+
+        Parameters
+        ----------
+        topology(Topology): topologia del automata
+
+        Returns
+        -------
+        out(OuterTotalisticEngine|None): motor de la regla, o None si la
+            topologia no es un plano finito
+        """
+        if isinstance(topology, FiniteNGridTopology) and topology.dimensions.size == 2:
+            return OuterTotalisticEngine(self, topology)
+
+        return None
+
+    def apply_rule(self, cell_states, _):
+        """
+        Este metodo aplica la regla a una vecindad de alguna celula
+
+        Params
+        ------
+        cell_states(ndarray(int)): estados de las celulas vecinas
+
+        Returns
+        -------
+        out(int): estado de la celula en la siguiente iteracion
+        """
+        current_cell = cell_states[cell_states.size // 2]
+        if not 0 <= current_cell < self.states_number:
+            return current_cell, None
+
+        firing = self.firing[current_cell]
+        # la celula del centro no se cuenta como vecina
+        count = np.count_nonzero(cell_states == firing) - (current_cell == firing)
+
+        return self.table[current_cell, count], None
+
+
+class GenerationsRule(OuterTotalisticRule):
+    """
+    Esta clase representa las reglas de la familia Generations, denotadas con
+    la notacion B/S/C. El estado 0 representa una celula muerta, el estado 1
+    una celula viva, y los estados 2, ..., C - 1 celulas que estan muriendo.
+    Una celula muerta nace si su numero de vecinos vivos esta en B, una
+    celula viva sobrevive si su numero de vecinos vivos esta en S, y en caso
+    contrario empieza a morir, las celulas que estan muriendo pasan al
+    siguiente estado sin importar sus vecinos, y del estado C - 1 pasan al
+    estado 0. Con C = 2 se obtienen las reglas en notacion B/S
+
+    Parameters
+    ----------
+    B(list(int)): lista de los enteros que ocacionan a una celula muerta, nacer
+    S(list(int)): lista de los enteros que permiten que una celula viva
+        sobreviva
+    C(int): numero de estados
+    radius(int): radio de la vecindad
+    neighborhood(str): tipo de vecindad, "moore" o "neumann"
+    """
+
+    def __init__(self, B, S, C, radius=1, neighborhood="moore"):
+        if C < 2:
+            raise InvalidParameterError("C debe ser mayor o igual a 2")
+
+        self.B = B
+        self.S = S
+        self.C = C
+
+        def transition(state, count):
+            if state == 0:
+                return int(count in B)
+            if state == 1 and count in S:
+                return 1
+            return (state + 1) % C
+
+        super().__init__([1] * C, transition, radius, neighborhood)
+
+    @classmethod
+    def from_notation(cls, notation, radius=1, neighborhood="moore"):
+        """
+        Este metodo crea una regla a partir de su notacion, por ejemplo
+        "B2/S/C3" (Brian's Brain) o "B3/S23/C2" (juego de la vida). Cada
+        digito de B y S es un numero de vecinos, por lo que solo se pueden
+        especificar numeros de vecinos menores a 10
+
+        Parameters
+        ----------
+        notation(str): notacion de la regla
+        radius(int): radio de la vecindad
+        neighborhood(str): tipo de vecindad, "moore" o "neumann"
+
+        Returns
+        -------
+        out(GenerationsRule): regla
+        """
+        parts = notation.upper().split("/")
+        if (
+            len(parts) != 3
+            or [part[:1] for part in parts] != ["B", "S", "C"]
+            or not all(part[1:].isdigit() or part[1:] == "" for part in parts[:2])
+            or not parts[2][1:].isdigit()
+        ):
+            raise InvalidParameterError(
+                f"la notacion {notation} no tiene la forma B.../S.../C..."
+            )
+
+        B = [int(digit) for digit in parts[0][1:]]
+        S = [int(digit) for digit in parts[1][1:]]
+
+        return cls(B, S, int(parts[2][1:]), radius, neighborhood)
+
+
+class BriansBrainRule(GenerationsRule):
+    """
+    Esta clase representa la regla Brian's Brain, esto es, la regla B2/S/C3
+    de la familia Generations
+    """
+
+    def __init__(self):
+        super().__init__([2], [], 3)
+
+
+class GreenbergHastingsRule(OuterTotalisticRule):
+    """
+    Esta clase representa los medios excitables de Greenberg-Hastings. El
+    estado 0 representa una celula en reposo, el estado 1 una celula
+    excitada, y los estados 2, ..., n - 1 celulas refractarias. Una celula en
+    reposo se excita si tiene al menos threshold vecinos excitados, y las
+    demas celulas pasan al siguiente estado sin importar sus vecinos (del
+    estado n - 1 pasan al estado 0)
+
+    Parameters
+    ----------
+    states_number(int): numero de estados, debe ser mayor o igual a 3
+    threshold(int): numero minimo de vecinos excitados para que una celula
+        en reposo se excite
+    radius(int): radio de la vecindad
+    neighborhood(str): tipo de vecindad, "moore" o "neumann"
+    """
+
+    def __init__(self, states_number=3, threshold=1, radius=1, neighborhood="neumann"):
+        if states_number < 3:
+            raise InvalidParameterError("el numero de estados debe ser mayor a 2")
+
+        self.threshold = threshold
+
+        def transition(state, count):
+            if state == 0:
+                return int(count >= threshold)
+            return (state + 1) % states_number
+
+        super().__init__([1] * states_number, transition, radius, neighborhood)
+
+
+class CyclicRule(OuterTotalisticRule):
+    """
+    Esta clase representa los automatas celulares ciclicos. Una celula en el
+    estado k pasa al estado k + 1 (modulo n) si tiene al menos threshold
+    vecinos en el estado k + 1 (modulo n), en caso contrario conserva su
+    estado
+
+    Parameters
+    ----------
+    states_number(int): numero de estados
+    threshold(int): numero minimo de vecinos en el estado siguiente para que
+        una celula avance
+    radius(int): radio de la vecindad
+    neighborhood(str): tipo de vecindad, "moore" o "neumann"
+    """
+
+    def __init__(self, states_number, threshold=1, radius=1, neighborhood="neumann"):
+        if states_number < 2:
+            raise InvalidParameterError("el numero de estados debe ser mayor a 1")
+
+        self.threshold = threshold
+
+        def transition(state, count):
+            if count >= threshold:
+                return (state + 1) % states_number
+            return state
+
+        super().__init__(
+            [(state + 1) % states_number for state in range(states_number)],
+            transition,
+            radius,
+            neighborhood,
+        )
+
+
+class WireworldRule(OuterTotalisticRule):
+    """
+    Esta clase representa la regla Wireworld. El estado 0 representa una
+    celula vacia, el estado 1 la cabeza de un electron, el estado 2 la cola
+    de un electron y el estado 3 un conductor. Las celulas vacias no
+    cambian, las cabezas pasan a ser colas, las colas pasan a ser
+    conductores, y los conductores pasan a ser cabezas si tienen 1 o 2
+    vecinos que son cabezas
+    """
+
+    def __init__(self):
+        def transition(state, count):
+            if state == 1:
+                return 2
+            if state == 2:
+                return 3
+            if state == 3:
+                return 1 if count in (1, 2) else 3
+            return 0
+
+        super().__init__([1] * 4, transition)
+
+
+class WeightedSumRule(Rule):
+    """
+    Esta clase representa las reglas totalisticas con pesos, esto es,
+    aquellas en las que el nuevo estado de una celula depende de su estado
+    actual y de la suma de los estados de su vecindad multiplicados por los
+    pesos de la vecindad (ver Neighborhood.get_weights). Las sumas de todo el
+    plano se calculan de forma directa con nucleos pequenos y con la
+    transformada rapida de Fourier con nucleos grandes (ver WeightedSumEngine)
+
+    Parameters
+    ----------
+    neighborhood(Neighborhood|list(list)|ndarray): vecindad de la regla, o
+        pesos de una vecindad centrada en la celula (ver WeightedNeighborhood)
+    transition(callable): funcion vectorizada que recibe un arreglo con los
+        estados de las celulas y un arreglo con las sumas ponderadas de sus
+        vecindades, y retorna un arreglo con los nuevos estados
+    """
+
+    def __init__(self, neighborhood, transition):
+        if not isinstance(neighborhood, Neighborhood):
+            neighborhood = WeightedNeighborhood(neighborhood)
+
+        self.neighborhood = neighborhood
+        self.transition = transition
+
+        # pesos de las celulas en el orden que retorna apply_mask, y posicion
+        # de la celula del centro en ese orden
+        mask = self.neighborhood.get_mask()
+        self.weights = self.neighborhood.get_weights()[mask]
+
+        center = tuple(-start for start in self.neighborhood.get_offset())
+        inside = all(0 <= i < size for i, size in zip(center, mask.shape))
+        if not inside or not mask[center]:
+            raise InvalidParameterError("la vecindad debe incluir a la celula")
+        self.center = np.count_nonzero(
+            mask.ravel()[: np.ravel_multi_index(center, mask.shape)]
+        )
+
+    def get_neighborhood(self):
+        """
+        Este metodo retorna la vecindad asociada a la regla
+
+        Returns
+        -------
+        out(Neighborhood): Objeto que representa la vecindad
+        """
+        return self.neighborhood
+
+    def get_engine(self, topology):
+        """
+        Este metodo retorna el motor vectorizado de la regla, que calcula todo
+        el plano en cada paso
+
+        Parameters
+        ----------
+        topology(Topology): topologia del automata
+
+        Returns
+        -------
+        out(WeightedSumEngine|None): motor de la regla, o None si la
+            topologia no es un plano finito
+        """
+        if isinstance(topology, FiniteNGridTopology) and topology.dimensions.size == 2:
+            return WeightedSumEngine(self, topology)
+
+        return None
+
+    def apply_rule(self, cell_states, _):
+        """
+        Este metodo aplica la regla a una vecindad de alguna celula
+
+        Params
+        ------
+        cell_states(ndarray(int)): estados de las celulas vecinas
+
+        Returns
+        -------
+        out(int): estado de la celula en la siguiente iteracion
+        """
+        total = np.dot(cell_states, self.weights)
+        new_state = self.transition(
+            np.array([cell_states[self.center]]), np.array([total])
+        )
+
+        return np.asarray(new_state)[0], None
+
+
+class ContinuousRule(Rule):
+    """
+    Esta clase representa las reglas de estado continuo, en las que cada
+    celula tiene un valor real entre 0 y 1 (almacenado en uno de sus
+    atributos). En cada paso se calcula el potencial de cada celula, la suma
+    de los valores de su vecindad multiplicados por los pesos de la vecindad,
+    y el nuevo valor es clip(valor + dt * growth(potencial), 0, 1). Los
+    estados de las celulas no cambian
+
+    Parameters
+    ----------
+    neighborhood(Neighborhood|list(list)|ndarray): vecindad de la regla, o
+        pesos de una vecindad centrada en la celula (ver WeightedNeighborhood)
+    growth(callable): funcion vectorizada que recibe un arreglo con los
+        potenciales y retorna un arreglo con el crecimiento de cada celula,
+        puede modificar el arreglo que recibe
+    dt(float): paso de tiempo
+    attribute(int): indice del atributo que almacena el valor de las celulas
+    dtype(dtype): tipo real en el que se calcula el potencial y el
+        crecimiento, con float32 se reduce a la mitad la memoria que recorre
+        cada paso (ver FiniteNGridTopology con attributes_dtype)
+    """
+
+    def __init__(self, neighborhood, growth, dt=0.1, attribute=0, dtype=np.float64):
+        if not isinstance(neighborhood, Neighborhood):
+            neighborhood = WeightedNeighborhood(neighborhood)
+
+        self.neighborhood = neighborhood
+        self.growth = growth
+        self.dt = dt
+        self.attribute = attribute
+        self.dtype = np.dtype(dtype)
+
+        if not np.issubdtype(self.dtype, np.floating):
+            raise InvalidParameterError("el tipo de la regla debe ser real")
+
+        # nucleo con el que el motor calcula los potenciales de todo el plano
+        self.kernel = self.neighborhood.get_weights().astype(self.dtype)
+
+        # pesos de las celulas en el orden que retorna apply_mask, y posicion
+        # de la celula del centro en ese orden (ver WeightedSumRule)
+        mask = self.neighborhood.get_mask()
+        self.weights = self.kernel[mask]
+
+        center = tuple(-start for start in self.neighborhood.get_offset())
+        inside = all(0 <= i < size for i, size in zip(center, mask.shape))
+        if not inside or not mask[center]:
+            raise InvalidParameterError("la vecindad debe incluir a la celula")
+        self.center = np.count_nonzero(
+            mask.ravel()[: np.ravel_multi_index(center, mask.shape)]
+        )
+
+    def update(self, values, potential, out=None):
+        """
+        Este metodo calcula los nuevos valores de un arreglo de celulas,
+        reutiliza el arreglo de los potenciales
+
+        Parameters
+        ----------
+        values(ndarray(float)): valores actuales de las celulas
+        potential(ndarray(float)): potenciales de las celulas, se modifica
+        out(ndarray(float)|None): arreglo en el que se escriben los nuevos
+            valores
+
+        Returns
+        -------
+        out(ndarray(float)): nuevos valores
+        """
+        growth = self.growth(potential)
+        growth *= self.dt
+        growth += values
+
+        return np.clip(growth, 0, 1, out=out)
+
+    def get_neighborhood(self):
+        """
+        Este metodo retorna la vecindad asociada a la regla
+
+        Returns
+        -------
+        out(Neighborhood): Objeto que representa la vecindad
+        """
+        return self.neighborhood
+
+    def get_engine(self, topology):
+        """
+        Este metodo retorna el motor vectorizado de la regla, que calcula todo
+        el plano en cada paso
+
+        Parameters
+        ----------
+        topology(Topology): topologia del automata
+
+        Returns
+        -------
+        out(ContinuousEngine|None): motor de la regla, o None si la topologia
+            no es un plano finito
+        """
+        if isinstance(topology, FiniteNGridTopology) and topology.dimensions.size == 2:
+            return ContinuousEngine(self, topology)
+
+        return None
+
+    def apply_rule(self, cell_states, cell_attributes):
+        """
+        Este metodo aplica la regla a una vecindad de alguna celula
+
+        Params
+        ------
+        cell_states(ndarray(int)): estados de las celulas vecinas
+        cell_attributes(ndarray(float)): atributos de las celulas vecinas
+
+        Returns
+        -------
+        out(tuple): estado de la celula (no cambia) y sus nuevos atributos
+        """
+        values = cell_attributes[:, self.attribute].astype(self.dtype)
+        potential = np.array([np.dot(values, self.weights)])
+
+        attributes = np.array(cell_attributes[self.center])
+        attributes[self.attribute] = self.update(values[self.center], potential)[0]
+
+        return cell_states[self.center], attributes
+
+
+class LeniaRule(ContinuousRule):
+    """
+    Esta clase representa los automatas Lenia, reglas de estado continuo con
+    el nucleo de anillos de LeniaNeighborhood y la funcion de crecimiento
+    gaussiana growth(u) = 2 exp(-(u - mu)^2 / (2 sigma^2)) - 1
+
+    Parameters
+    ----------
+    radius(int): radio del nucleo
+    mu(float): potencial con el maximo crecimiento
+    sigma(float): ancho de la funcion de crecimiento
+    dt(float): paso de tiempo
+    peaks(tuple(float)|list(float)): altura de cada anillo del nucleo
+    attribute(int): indice del atributo que almacena el valor de las celulas
+    dtype(dtype): tipo real en el que se calcula el potencial y el
+        crecimiento
+    """
+
+    def __init__(
+        self,
+        radius=13,
+        mu=0.15,
+        sigma=0.015,
+        dt=0.1,
+        peaks=(1.0,),
+        attribute=0,
+        dtype=np.float64,
+    ):
+        self.mu = mu
+        self.sigma = sigma
+
+        def growth(potential):
+            # el crecimiento se calcula sobre el arreglo de los potenciales
+            potential -= mu
+            potential *= potential
+            potential *= -1 / (2 * sigma**2)
+            np.exp(potential, out=potential)
+            potential *= 2
+            potential -= 1
+
+            return potential
+
+        super().__init__(LeniaNeighborhood(radius, peaks), growth, dt, attribute, dtype)
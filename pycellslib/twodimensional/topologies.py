@@ -18,9 +18,31 @@ class FinitePlaneTopology(FiniteNGridTopology):
     height(int): alto del espacio
     border_width(int): ancho de la frontera
     border_height(int): alto de la frontera
+    boundary(str): tipo de frontera ("constant", "periodic" o "reflective"),
+        con la frontera periodica el plano es un toro
+    attributes_dtype(dtype|list(dtype)|None): tipo de los atributos, o una
+        lista con el tipo de cada atributo, si es None el automata usa los
+        tipos de sus celulas
+    states_dtype(dtype|None): tipo entero de los estados, si es None el
+        automata usa el menor tipo que contiene los estados de sus celulas
     """
 
-    def __init__(self, attributes_number, width, height, border_width, border_height):
+    def __init__(
+        self,
+        attributes_number,
+        width,
+        height,
+        border_width,
+        border_height,
+        boundary="constant",
+        attributes_dtype=None,
+        states_dtype=None,
+    ):
         super().__init__(
-            attributes_number, (height, width), (border_height, border_width)
+            attributes_number,
+            (height, width),
+            (border_height, border_width),
+            boundary,
+            attributes_dtype,
+            states_dtype,
         )
@@ -1,5 +1,9 @@
+import itertools
+from typing import Iterable, Tuple
+
 import numpy as np
 import numpy.typing as npt
+from numpy.lib.stride_tricks import sliding_window_view
 
 
 class PositionIterator:
@@ -20,24 +24,218 @@ class PositionIterator:
         # dimensiones de la frontera
         self.border_widths = border_widths
 
-        self.index = np.ndindex(*(self.dimensions + self.border_widths))
+        # solo se recorren los indices que no corresponden a puntos de la
+        # frontera
+        self.index = itertools.product(
+            *(
+                range(border, border + dimension)
+                for dimension, border in zip(
+                    np.asarray(dimensions).tolist(), np.asarray(border_widths).tolist()
+                )
+            )
+        )
 
     def __iter__(self) -> "PositionIterator":
         return self
 
-    def __next__(self) -> npt.NDArray[np.int]:
+    def __next__(self) -> Tuple[int, ...]:
         """
-        Este metodo itera sobre todos los posibles indices del espacio y
-        retorna solo aquellos que no corresponden a puntos de la frontera
+        Este metodo retorna el siguiente indice del espacio que no
+        corresponde a un punto de la frontera
         """
-        while True:
-            # se revisa que las coordenadas esten en el limite permitido
-            coordinate = np.array(next(self.index), dtype=int)
+        return next(self.index)
+
+
+def get_windows(
+    array: npt.NDArray, window_shape: Tuple[int, ...], region: Tuple[slice, ...]
+) -> npt.NDArray:
+    """
+    Esta funcion retorna todas las ventanas de un arreglo como una vista de
+    solo lectura (no se copia memoria). Las ventanas se toman sobre los
+    primeros ejes del arreglo, los ejes restantes (por ejemplo el eje de los
+    atributos) se conservan al final
+
+    Parameters
+    ----------
+    array(ndarray): arreglo del que se extraen las ventanas
+    window_shape(tuple(int)): dimensiones de cada ventana
+    region(tuple(slice)): region de las posiciones en las que empiezan las
+        ventanas
+
+    Returns
+    -------
+    out(ndarray): vista de dimensiones (*region, *window_shape, *extra) donde
+        extra son las dimensiones de los ejes que no hacen parte de la ventana
+    """
+    ndim = len(window_shape)
+    extra = array.ndim - ndim
+
+    windows = sliding_window_view(array, window_shape, axis=tuple(range(ndim)))
+    windows = windows[region]
+
+    # sliding_window_view deja los ejes de la ventana al final
+    if extra != 0:
+        windows = np.moveaxis(
+            windows, tuple(range(ndim, ndim + extra)), tuple(range(-extra, 0))
+        )
+
+    return windows
+
+
+# numero de celulas que se almacenan en cada palabra en las representaciones
+# empaquetadas (un bit por celula)
+WORD_SIZE = 64
+
+
+def pack_bits(states: npt.NDArray) -> npt.NDArray[np.uint64]:
+    """
+    Esta funcion empaqueta un arreglo de estados binarios (0/1) a lo largo de
+    su ultimo eje, 64 celulas por palabra de tipo uint64. La celula i queda en
+    el bit i % 64 de la palabra i // 64, los bits sobrantes de la ultima
+    palabra son 0
+
+    Parameters
+    ----------
+    states(ndarray): arreglo de estados binarios
+
+    Returns
+    -------
+    out(ndarray(uint64)): arreglo empaquetado
+    """
+    # packbits toma cualquier valor distinto de 0 como 1, por lo que los
+    # estados no se convierten
+    packed = np.packbits(states, axis=-1, bitorder="little")
+
+    padding = -packed.shape[-1] % (WORD_SIZE // 8)
+    if padding != 0:
+        packed = np.concatenate(
+            [packed, np.zeros((*packed.shape[:-1], padding), dtype=np.uint8)],
+            axis=-1,
+        )
+
+    return np.ascontiguousarray(packed).view("<u8").astype(np.uint64, copy=False)
+
+
+def unpack_bits(words: npt.NDArray[np.uint64], size: int) -> npt.NDArray[np.uint8]:
+    """
+    Esta funcion desempaqueta un arreglo creado con pack_bits
+
+    Parameters
+    ----------
+    words(ndarray(uint64)): arreglo empaquetado
+    size(int): numero de celulas en el ultimo eje
+
+    Returns
+    -------
+    out(ndarray(uint8)): arreglo de estados binarios
+    """
+    packed = np.ascontiguousarray(words.astype("<u8", copy=False)).view(np.uint8)
+
+    return np.unpackbits(packed, axis=-1, count=size, bitorder="little")
+
 
-            inferior_limit = self.border_widths - 1 < coordinate
-            superior_limit = coordinate < self.dimensions + self.border_widths
+def shift_bits(words: npt.NDArray[np.uint64], shift: int) -> npt.NDArray[np.uint64]:
+    """
+    Esta funcion desplaza las celulas de un arreglo empaquetado a lo largo de
+    su ultimo eje, las celulas que entran por los extremos son 0
+
+    Parameters
+    ----------
+    words(ndarray(uint64)): arreglo empaquetado
+    shift(int): desplazamiento, la celula i del resultado es la celula
+        i - shift del arreglo original
+
+    Returns
+    -------
+    out(ndarray(uint64)): arreglo empaquetado desplazado
+    """
+    result = np.zeros_like(words)
+    size = words.shape[-1]
+    word_shift, bit_shift = divmod(abs(shift), WORD_SIZE)
+
+    if word_shift >= size:
+        return result
+
+    low = np.uint64(bit_shift)
+    high = np.uint64(WORD_SIZE - bit_shift)
+
+    if shift >= 0:
+        result[..., word_shift:] = words[..., : size - word_shift] << low
+        if bit_shift != 0 and word_shift + 1 < size:
+            result[..., word_shift + 1 :] |= words[..., : size - word_shift - 1] >> high
+    else:
+        result[..., : size - word_shift] = words[..., word_shift:] >> low
+        if bit_shift != 0 and word_shift + 1 < size:
+            result[..., : size - word_shift - 1] |= words[..., word_shift + 1 :] << high
+
+    return result
+
+
+def unique_rows(
+    array: npt.NDArray[np.int64],
+) -> Tuple[npt.NDArray[np.int64], npt.NDArray[np.intp]]:
+    """
+    Esta funcion retorna las filas distintas (ordenadas lexicograficamente)
+    de un arreglo bidimensional de enteros, y el indice en ellas de cada fila
+    del arreglo. Si el rango de los valores lo permite, cada fila se codifica
+    como un unico entero, lo que es mucho mas rapido que np.unique con axis=0
+
+    Parameters
+    ----------
+    array(ndarray(int)): arreglo (n, d) de enteros
+
+    Returns
+    -------
+    out(tuple): tupla cuya primera componente es el arreglo con las filas
+        distintas, y la segunda el arreglo (n,) con los indices
+    """
+    if len(array) == 0:
+        return array, np.zeros(0, dtype=np.intp)
+
+    lower = array.min(axis=0)
+    extent = array.max(axis=0) - lower + 1
+
+    if np.prod(extent.astype(float)) >= 2**62:
+        unique, inverse = np.unique(array, axis=0, return_inverse=True)
+        return unique, inverse.reshape(-1)
+
+    strides = np.cumprod(np.append(1, extent[:0:-1]))[::-1]
+    keys = (array - lower) @ strides
+
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    unique = unique_keys[:, None] // strides % extent + lower
+
+    return unique, inverse
+
+
+# tipos enteros en los que se pueden almacenar los estados, de menor a mayor.
+# No se usa uint64, ya que las operaciones entre uint64 e int64 producen
+# arreglos de tipo float64
+STATES_DTYPES = (np.uint8, np.uint16, np.uint32, np.int64)
+SIGNED_STATES_DTYPES = (np.int8, np.int16, np.int32, np.int64)
+
+
+def get_states_dtype(states: Iterable[int]) -> np.dtype:
+    """
+    Esta funcion retorna el menor tipo entero que puede almacenar todos los
+    estados dados, un tipo sin signo si ningun estado es negativo
+
+    Parameters
+    ----------
+    states(tuple(int)|list(int)|ndarray(int)): estados
+
+    Returns
+    -------
+    out(dtype): tipo de los estados
+    """
+    states = np.asarray(states, dtype=np.int64)
+    if states.size == 0:
+        return np.dtype(np.uint8)
 
-            if np.all(inferior_limit & superior_limit):
-                return tuple(coordinate)
+    low, high = states.min(), states.max()
+    for dtype in STATES_DTYPES if low >= 0 else SIGNED_STATES_DTYPES:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return np.dtype(dtype)
 
-        return coordinate
+    return np.dtype(np.int64)
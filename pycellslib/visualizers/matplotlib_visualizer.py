@@ -67,21 +67,38 @@ class GameOfLifeLikePalette(ColorPaletteCreator):
         super().__init__(colors, "Game Of Life")
 
 
-def update_function(_, axes, palette, interpolation, automaton):
+def get_image(states):
+    """
+    Esta funcion escala los estados al rango [0, 255] para su graficacion. Los
+    estados se convierten a float antes de escalarlos, ya que la topologia
+    puede almacenarlos en un tipo entero pequeno (uint8) en el que el
+    producto daria la vuelta
+
+    parameters
+    states(ndarray(int)): estados de una generacion
+
+    returns
+    out(ndarray(float)): estados escalados, el mayor estado vale 255
+    """
+    states = states.astype(float)
+
+    # se evita la division por 0 en las generaciones sin celulas vivas
+    return 255 * states / max(states.max(), 1)
+
+
+def update_function(states, axes, palette, interpolation):
     """
     Funcion usada para la actualizacion de la animacion
 
     parameters
-    -: frame actual en el que se va en la simulacion
+    states(ndarray(int)): estados de la generacion actual, los produce el
+        generador Automaton.iter_generations
     axes(Axes): axes de la figura en matplotlib
     palette(Palette): paleta de colores usada para la graficacion de la imagen
     interpolation(str): interpolacion usada para la graficacion de la imagen
-    automaton(Automaton): automata usado en la animacion
     """
-    automaton.next_step()
-    states = automaton.topology.get_states()
     img = axes.imshow(
-        255 * states / states.max(),
+        get_image(states),
         cmap=palette,
         aspect="equal",
         interpolation=interpolation,
@@ -122,20 +139,24 @@ def animate(
     frames=None,
     time_per_frame=50,
     save_count=None,
+    every=1,
 ):
     """
-    Esta funcion corre una animacion previamente configurada
+    Esta funcion corre una animacion previamente configurada, cada frame
+    muestra los estados del automata cada every generaciones
     """
     axes.imshow(
-        255 * automaton.topology.get_states(), cmap=palette, interpolation=interpolation
+        get_image(automaton.get_states()), cmap=palette, interpolation=interpolation
     )
     animation = FuncAnimation(
         fig,
         update_function,
-        frames=frames,
-        fargs=(axes, palette, interpolation, automaton),
+        frames=automaton.iter_generations(
+            None if frames is None else frames * every, every
+        ),
+        fargs=(axes, palette, interpolation),
         interval=time_per_frame,
-        save_count=save_count,
+        save_count=frames if save_count is None else save_count,
     )
     plt.show()
 
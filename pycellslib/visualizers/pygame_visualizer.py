@@ -57,6 +57,7 @@ class System:
             self.automaton.topology.get_states(), None
         )
         self.automaton.topology.flip()
+        self.generations = self.automaton.iter_generations()
 
         self.height, self.width = automaton.topology.dimensions
         self.colors = colors
@@ -154,7 +155,7 @@ class System:
 
     def update(self):
         """Se debe implementar en las clases que heredan"""
-        self.automaton.next_step()
+        next(self.generations)
 
 
 class CellGraph:
@@ -5,17 +5,44 @@ lidad, ...), esto es, en general aquellos cuya implementacion esta en
 ./pycellslib/__init__.py
 """
 
+import functools
+import itertools
 import unittest
 
 import numpy as np
 
-from pycellslib.cells import StandardCell
-from pycellslib.core import FiniteNGridTopology
+from pycellslib.cells import AttributesCell, StandardCell
+from pycellslib.core import (
+    Automaton,
+    FiniteNGridTopology,
+    Neighborhood,
+    Rule,
+    SparseTopology,
+    UnboundedNGridTopology,
+)
+from pycellslib.core.engine import (
+    BatchEngine,
+    CellByCellEngine,
+    ChunkedEngine,
+    JitEngine,
+    SparseEngine,
+    TableEngine,
+    is_tabulable,
+    prewarm_plans,
+)
+from pycellslib.core.jit import JIT_AVAILABLE
+from pycellslib.core.parallel import (
+    ParallelEngine,
+    ThreadedEngine,
+    get_slabs,
+    split_regions,
+)
+from pycellslib.core.plan_cache import PlanCache, plan_cache
 from pycellslib.errors import (
     InitializationWithoutParametersError,
     InvalidParameterError,
 )
-from pycellslib.utils import PositionIterator
+from pycellslib.utils import PositionIterator, get_states_dtype, unique_rows
 
 
 class TestStandardCell(unittest.TestCase):
@@ -199,6 +226,29 @@ class TestStandardCell(unittest.TestCase):
         self.assertIsNone(cell.get_name_of_attributes(0))
 
 
+class TestAttributesCell(unittest.TestCase):
+    """
+    Tests para la clase AttributesCell
+    """
+
+    def test_attributes(self):
+        """
+        Este metodo testea el numero, los nombres, los tipos y los valores por
+        defecto de los atributos
+        """
+        cell = AttributesCell([("energia", np.float32), ("edad", "uint8")], 3)
+
+        self.assertEqual(cell.get_states(), [0, 1, 2])
+        self.assertEqual(cell.get_number_of_attributes(), 2)
+        self.assertEqual(cell.get_name_of_attributes(1), "edad")
+        self.assertEqual(cell.get_dtype_of_attributes(0), np.float32)
+        self.assertEqual(cell.get_dtype_of_attributes(1), np.uint8)
+        self.assertEqual(cell.get_default_value_of_attributes(), [0, 0])
+
+        # las celulas sin tipos de atributos usan float
+        self.assertEqual(StandardCell(2).get_dtype_of_attributes(0), float)
+
+
 class TestPositionIterator(unittest.TestCase):
     """
     Tests para la clase PositionIterator
@@ -350,6 +400,99 @@ class TestPositionIterator(unittest.TestCase):
             self.assertLess(y_pos, dimensions[0] + border_widths[0])
 
 
+class TestUniqueRows(unittest.TestCase):
+    """
+    Tests para la funcion unique_rows
+    """
+
+    def test_unique_rows(self):
+        """
+        Este metodo testea que el resultado sea igual al de np.unique, tanto
+        con rangos pequenos (codificando las filas) como con rangos grandes
+        """
+        random = np.random.default_rng(0)
+
+        for low, high in ((-5, 5), (-(2**62), 2**62)):
+            array = random.integers(low, high, (200, 3))
+
+            unique, inverse = unique_rows(array)
+            expected_unique, expected_inverse = np.unique(
+                array, axis=0, return_inverse=True
+            )
+
+            self.assertTrue(np.array_equal(unique, expected_unique))
+            self.assertTrue(np.array_equal(inverse, expected_inverse.reshape(-1)))
+            self.assertTrue(np.array_equal(unique[inverse], array))
+
+
+class TestGetStatesDtype(unittest.TestCase):
+    """
+    Tests para la funcion get_states_dtype
+    """
+
+    def test_get_states_dtype(self):
+        """
+        Este metodo testea que se retorne el menor tipo entero que contiene
+        los estados, sin signo si no hay estados negativos
+        """
+        self.assertEqual(get_states_dtype([0, 1]), np.uint8)
+        self.assertEqual(get_states_dtype(range(256)), np.uint8)
+        self.assertEqual(get_states_dtype([0, 256]), np.uint16)
+        self.assertEqual(get_states_dtype([0, 2**16]), np.uint32)
+        self.assertEqual(get_states_dtype([0, 2**32]), np.int64)
+        self.assertEqual(get_states_dtype([-1, 1]), np.int8)
+        self.assertEqual(get_states_dtype([-1, 128]), np.int16)
+        self.assertEqual(get_states_dtype([-(2**31) - 1, 0]), np.int64)
+        self.assertEqual(get_states_dtype([]), np.uint8)
+
+
+class TestPlanCache(unittest.TestCase):
+    """
+    Tests para la clase PlanCache
+    """
+
+    def test_get_and_evict_least_recently_used(self):
+        """
+        Este metodo testea que la cache cuente aciertos y fallos, y que al
+        superar el limite de memoria elimine los planes usados hace mas
+        tiempo
+        """
+        cache = PlanCache(max_memory=200)
+
+        def build(value):
+            return lambda: np.full(10, value, dtype=np.int64)
+
+        first = cache.get("a", build(1))
+        self.assertIs(cache.get("a", build(0)), first)
+        self.assertFalse(first.flags.writeable)
+
+        cache.get("b", build(2))
+        cache.get("a", build(0))
+        cache.get("c", build(3))
+
+        # el plan b es el usado hace mas tiempo
+        self.assertEqual(list(cache.plans), ["a", "c"])
+        self.assertEqual(cache.get("b", build(4))[0], 4)
+        self.assertEqual(list(cache.plans), ["c", "b"])
+
+        statistics = cache.get_statistics()
+        self.assertEqual(statistics["plans"], 2)
+        self.assertEqual(statistics["memory"], 160)
+        self.assertEqual(statistics["hits"], 2)
+        self.assertEqual(statistics["misses"], 4)
+        self.assertAlmostEqual(statistics["hit_rate"], 1 / 3)
+
+        # los planes que no caben en la cache no se almacenan
+        cache.get("d", lambda: np.zeros(100))
+        self.assertEqual(list(cache.plans), ["c", "b"])
+
+        cache.set_max_memory(100)
+        self.assertEqual(list(cache.plans), ["b"])
+
+        cache.clear()
+        self.assertEqual(cache.get_statistics()["misses"], 0)
+
+
 class TestFinite1GridTopology(unittest.TestCase):
     """
     Tests para la clase FiniteNGridTopology en el caso 1 dimensional
@@ -774,7 +917,9 @@ class TestFinite1GridTopology(unittest.TestCase):
 
         self.assertTrue(np.array_equal(topology.states[topology.write_buffer], space))
         self.assertTrue(
-            np.allclose(topology.attributes[topology.write_buffer], attributes_array)
+            np.allclose(
+                topology.stack_attributes(topology.write_buffer), attributes_array
+            )
         )
 
     # @unittest.skip("Implementando funcionalidad")
@@ -821,8 +966,43 @@ class TestFinite1GridTopology(unittest.TestCase):
 
         self.assertTrue(np.array_equal(topology.states[topology.write_buffer], space))
         self.assertTrue(
-            np.allclose(topology.attributes[topology.write_buffer], attributes_array)
+            np.allclose(
+                topology.stack_attributes(topology.write_buffer), attributes_array
+            )
+        )
+
+    def test_get_neighborhoods_view_and_compact_neighborhoods_case_1(self):
+        """
+        Este metodo testea los metodos get_neighborhoods_view y
+        compact_neighborhoods en el caso de tener 1 atributo por celula, un
+        espacio de longitud 9 y una frontera de longitud 2, las vecindades
+        compactadas deben coincidir con las retornadas por apply_mask
+        """
+        topology = FiniteNGridTopology(1, (1, 9), (0, 2))
+        random = np.random.default_rng(1)
+        topology.set_values_from_configuration(
+            random.integers(0, 5, (1, 9)), random.random((1, 9, 1))
         )
+        topology.set_border_values(7, [0.5])
+        topology.flip()
+
+        mask = np.array([[1, 0, 1, 1, 0]], dtype=bool)
+        offset = (0, -2)
+        states, attributes = topology.get_neighborhoods_view(mask, offset)
+
+        self.assertEqual(states.shape, (1, 9, 1, 5))
+        # cada atributo tiene su propia vista
+        self.assertEqual(len(attributes), 1)
+        self.assertEqual(attributes[0].shape, (1, 9, 1, 5))
+
+        states, attributes = topology.compact_neighborhoods(states, attributes, mask)
+        for position in topology:
+            mask_position = (position[0] + offset[0], position[1] + offset[1])
+            states_n, attributes_n = topology.apply_mask(mask_position, mask)
+            index = tuple(np.subtract(position, topology.get_offset()))
+
+            self.assertTrue(np.array_equal(states[index], states_n))
+            self.assertTrue(np.array_equal(attributes[index], attributes_n))
 
 
 class TestFinite2GridTopology(unittest.TestCase):
@@ -1176,7 +1356,9 @@ class TestFinite2GridTopology(unittest.TestCase):
 
         self.assertTrue(np.array_equal(topology.states[topology.write_buffer], space))
         self.assertTrue(
-            np.allclose(topology.attributes[topology.write_buffer], attributes_array)
+            np.allclose(
+                topology.stack_attributes(topology.write_buffer), attributes_array
+            )
         )
 
     # @unittest.skip("Implementando funcionalidad")
@@ -1230,7 +1412,9 @@ class TestFinite2GridTopology(unittest.TestCase):
 
         self.assertTrue(np.array_equal(topology.states[topology.write_buffer], space))
         self.assertTrue(
-            np.allclose(topology.attributes[topology.write_buffer], attributes_array)
+            np.allclose(
+                topology.stack_attributes(topology.write_buffer), attributes_array
+            )
         )
 
     # @unittest.skip("Implementando funcionalidad")
@@ -1320,6 +1504,1167 @@ class TestFinite2GridTopology(unittest.TestCase):
 
         self.assertEqual(counter, 4)
 
+    def test_get_neighborhoods_view_and_compact_neighborhoods_case_1(self):
+        """
+        Este metodo testea los metodos get_neighborhoods_view y
+        compact_neighborhoods en el caso de tener 2 atributos por celula, un
+        espacio de dimensiones (6, 5) y una frontera de dimensiones (2, 1),
+        las vecindades compactadas deben coincidir con las retornadas por
+        apply_mask
+        """
+        topology = FiniteNGridTopology(2, (6, 5), (2, 1))
+        random = np.random.default_rng(2)
+        topology.set_values_from_configuration(
+            random.integers(0, 5, (6, 5)), random.random((6, 5, 2))
+        )
+        topology.flip()
+
+        mask = np.array([[0, 1, 0], [1, 1, 1], [0, 1, 0], [0, 0, 1]], dtype=bool)
+        offset = (-2, -1)
+        states, attributes = topology.get_neighborhoods_view(mask, offset)
+
+        # la vista no copia memoria y es de solo lectura
+        self.assertEqual(states.shape, (6, 5, 4, 3))
+        self.assertTrue(np.shares_memory(states, topology.states[topology.read_buffer]))
+        self.assertFalse(states.flags.writeable)
+        # cada atributo tiene su propia vista
+        self.assertEqual(len(attributes), 2)
+        self.assertEqual(attributes[1].shape, (6, 5, 4, 3))
+        self.assertTrue(
+            np.shares_memory(
+                attributes[1], topology.attributes[topology.read_buffer][1]
+            )
+        )
+
+        states, attributes = topology.compact_neighborhoods(states, attributes, mask)
+        for position in topology:
+            mask_position = (position[0] + offset[0], position[1] + offset[1])
+            states_n, attributes_n = topology.apply_mask(mask_position, mask)
+            index = tuple(np.subtract(position, topology.get_offset()))
+
+            self.assertTrue(np.array_equal(states[index], states_n))
+            self.assertTrue(np.array_equal(attributes[index], attributes_n))
+
+    def test_get_neighborhoods_view_case_2(self):
+        """
+        Este metodo testea el metodo get_neighborhoods_view en el caso de que
+        la frontera no sea suficiente para aplicar la mascara
+        """
+        topology = FiniteNGridTopology(0, (6, 5), (1, 1))
+        mask = np.ones((5, 5), dtype=bool)
+
+        with self.assertRaises(InvalidParameterError):
+            topology.get_neighborhoods_view(mask, (-2, -2))
+
+    def test_get_gather_plan_and_gather_neighborhoods(self):
+        """
+        Este metodo testea que las vecindades extraidas con el plan de
+        recoleccion coincidan con las que retorna apply_mask, y que el plan
+        se calcule una sola vez
+        """
+        topology = FiniteNGridTopology(2, (6, 5), (2, 1))
+        topology.set_values_from_configuration(
+            np.random.randint(0, 10, (6, 5)), np.random.random((6, 5, 2))
+        )
+        topology.flip()
+
+        mask = np.array([[1, 0, 1], [0, 1, 0], [1, 1, 0], [0, 0, 1]], dtype=bool)
+        offset = (-2, -1)
+        region = (slice(3, 6), slice(1, 6))
+
+        plan = topology.get_gather_plan(mask, offset, region)
+        self.assertEqual(plan.shape, (6, 15))
+        self.assertIs(topology.get_gather_plan(mask, offset, region), plan)
+
+        states, attributes = topology.gather_neighborhoods(region, mask, offset)
+        positions = itertools.product(range(3, 6), range(1, 6))
+        for index, position in enumerate(positions):
+            mask_position = tuple(np.add(position, offset))
+            states_n, attributes_n = topology.apply_mask(mask_position, mask)
+
+            self.assertTrue(np.array_equal(states[index], states_n))
+            self.assertTrue(np.array_equal(attributes[index], attributes_n))
+
+        with self.assertRaises(InvalidParameterError):
+            topology.get_gather_plan(mask, (-3, -1))
+
+    def test_periodic_and_reflective_border(self):
+        """
+        Este metodo testea que refresh_border calcule la frontera, incluidas
+        las esquinas, a partir de las celulas del buffer de lectura
+        """
+        configuration = np.arange(20).reshape(4, 5)
+        attributes = np.arange(20.0).reshape(4, 5, 1)
+
+        for boundary, mode in (("periodic", "wrap"), ("reflective", "symmetric")):
+            topology = FiniteNGridTopology(1, (4, 5), (2, 1), boundary)
+            topology.set_values_from_configuration(configuration, attributes)
+            topology.flip()
+
+            expected = np.pad(configuration, ((2, 2), (1, 1)), mode=mode)
+            self.assertTrue(
+                np.array_equal(topology.states[topology.read_buffer], expected)
+            )
+            self.assertTrue(
+                np.array_equal(topology.attributes[topology.read_buffer][0], expected)
+            )
+
+            with self.assertRaises(InvalidParameterError):
+                topology.set_border_values(1, [0.0])
+
+        with self.assertRaises(InvalidParameterError):
+            FiniteNGridTopology(0, (4, 5), (1, 1), "mirror")
+
+        with self.assertRaises(InvalidParameterError):
+            FiniteNGridTopology(0, (4, 5), (1, 6), "periodic")
+
+    def test_update_cells_marks_changed_tiles(self):
+        """
+        Este metodo testea que update_cells marque los bloques en los que
+        alguna celula cambio respecto al buffer de lectura
+        """
+        topology = FiniteNGridTopology(0, (10, 12), (1, 2))
+        topology.set_tile_shape((4, 5))
+        self.assertEqual(topology.changed_tiles.shape, (3, 3))
+
+        topology.reset_changes()
+        states = np.zeros((10, 12), dtype=int)
+        states[5, 10] = 1
+        topology.update_cells(topology.subshape, states)
+
+        expected = np.zeros((3, 3), dtype=bool)
+        expected[1, 2] = True
+        self.assertTrue(np.array_equal(topology.changed_tiles, expected))
+
+        # una region que no esta alineada con los bloques
+        topology.reset_changes()
+        states = np.zeros((3, 7), dtype=int)
+        states[0, 0] = 1
+        topology.update_cells((slice(4, 7), slice(5, 12)), states)
+
+        expected = np.zeros((3, 3), dtype=bool)
+        expected[0, 0] = True
+        self.assertTrue(np.array_equal(topology.changed_tiles, expected))
+
+    def test_get_active_tiles_and_get_tiles_regions(self):
+        """
+        Este metodo testea que los bloques activos incluyan los bloques que
+        alcanza la vecindad de los bloques cambiados, y las regiones que
+        cubren los bloques activos
+        """
+        topology = FiniteNGridTopology(0, (12, 14), (2, 2))
+        topology.set_tile_shape((3, 3))
+        topology.reset_changes()
+        topology.changed_tiles[1, 2] = True
+
+        active = topology.get_active_tiles((1, 4))
+        expected = np.zeros((4, 5), dtype=bool)
+        expected[0:3, 0:5] = True
+        self.assertTrue(np.array_equal(active, expected))
+
+        regions = topology.get_tiles_regions(active[:, :3])
+        self.assertEqual(
+            regions,
+            [(slice(2 + 3 * i, 5 + 3 * i), slice(2, 11)) for i in range(3)],
+        )
+
+        # si la frontera de los buffers es distinta, los bloques cercanos a
+        # la frontera siempre estan activos
+        topology.set_border_values(1)
+        topology.reset_changes()
+        active = topology.get_active_tiles((1, 1))
+        expected = np.ones((4, 5), dtype=bool)
+        expected[1:3, 1:4] = False
+        self.assertTrue(np.array_equal(active, expected))
+
+    def test_compact_states(self):
+        """
+        Este metodo testea que el tipo de los estados se reduzca al menor tipo
+        que contiene los estados y los valores de los buffers, excepto si se
+        especifico al crear la topologia
+        """
+        topology = FiniteNGridTopology(0, (3, 4), (1, 1))
+        self.assertEqual(topology.states_dtype, int)
+
+        configuration = np.arange(12).reshape(3, 4) % 2
+        topology.set_values_from_configuration(configuration)
+        topology.compact_states([0, 1])
+        self.assertEqual(topology.states_dtype, np.uint8)
+        for buffer in topology.states:
+            self.assertEqual(buffer.dtype, np.uint8)
+        states = topology.states[topology.write_buffer][topology.subshape]
+        self.assertTrue(np.array_equal(states, configuration))
+
+        # los estados negativos requieren un tipo con signo
+        topology = FiniteNGridTopology(0, (3, 4), (1, 1))
+        topology.compact_states(range(-3, 200))
+        self.assertEqual(topology.states_dtype, np.int16)
+
+        # los valores de los buffers fuera de los estados se conservan
+        topology = FiniteNGridTopology(0, (3, 4), (1, 1))
+        topology.set_border_values(300)
+        topology.compact_states([0, 1])
+        self.assertEqual(topology.states_dtype, np.uint16)
+
+        # un tipo especificado no se modifica
+        topology = FiniteNGridTopology(0, (3, 4), (1, 1), states_dtype=np.int32)
+        topology.compact_states([0, 1])
+        self.assertEqual(topology.states_dtype, np.int32)
+        self.assertEqual(topology.states[0].dtype, np.int32)
+
+        with self.assertRaises(InvalidParameterError):
+            FiniteNGridTopology(0, (3, 4), (1, 1), states_dtype=float)
+
+    def test_attributes_fields(self):
+        """
+        Este metodo testea que cada atributo se almacene en un arreglo
+        contiguo de su tipo, y que los atributos se puedan obtener por indice
+        o por nombre
+        """
+        dtypes = [np.float32, np.int16, np.uint8]
+        topology = FiniteNGridTopology(3, (4, 5), (1, 1), attributes_dtype=dtypes)
+
+        configuration = np.random.default_rng(0).integers(0, 100, (4, 5, 3))
+        topology.set_values_from_configuration(
+            np.zeros((4, 5), dtype=int), configuration
+        )
+        topology.set_attributes_fields(["energia", "", "edad"])
+        topology.flip()
+
+        for buffer in topology.attributes:
+            for field, dtype in zip(buffer, dtypes):
+                self.assertEqual(field.dtype, dtype)
+                self.assertEqual(field.shape, (6, 7))
+                self.assertTrue(field.flags.c_contiguous)
+
+        self.assertTrue(np.array_equal(topology.get_attributes(), configuration))
+        self.assertEqual(topology.get_attributes(1).dtype, np.int16)
+        self.assertTrue(
+            np.array_equal(topology.get_attributes("edad"), configuration[..., 2])
+        )
+        self.assertEqual(topology.get_attribute_index("energia"), 0)
+
+        state, attributes = topology.get_cell((2, 3))
+        self.assertTrue(np.array_equal(attributes, configuration[1, 2]))
+
+        for attribute in ("velocidad", "", 3):
+            with self.assertRaises(InvalidParameterError):
+                topology.get_attributes(attribute)
+
+        # los tipos especificados al crear la topologia no se modifican
+        topology.set_attributes_fields(["a", "b", "c"], [float] * 3)
+        self.assertEqual(topology.attributes_dtypes, dtypes)
+
+        # en caso contrario los valores se convierten a los nuevos tipos
+        topology = FiniteNGridTopology(2, (4, 5), (1, 1))
+        topology.set_values_from(0, [1.5, 2.0])
+        topology.set_attributes_fields(["a", "b"], [np.float32, np.uint8])
+        self.assertEqual(topology.attributes[topology.write_buffer][1].dtype, np.uint8)
+        self.assertTrue(
+            np.array_equal(
+                topology.stack_attributes(topology.write_buffer, topology.subshape),
+                np.full((4, 5, 2), [1.5, 2.0]),
+            )
+        )
+
+        with self.assertRaises(InvalidParameterError):
+            topology.set_attributes_fields(["a"])
+
+        with self.assertRaises(InvalidParameterError):
+            FiniteNGridTopology(2, (4, 5), (1, 1), attributes_dtype=[float])
+
+        with self.assertRaises(InvalidParameterError):
+            FiniteNGridTopology(1, (4, 5), (1, 1), attributes_dtype=complex)
+
+
+class TestSparseTopology(unittest.TestCase):
+    """
+    Tests para la clase SparseTopology
+    """
+
+    def test_update_cell_and_get_cell(self):
+        """
+        Este metodo testea que solo se almacenen las celulas que no tienen el
+        valor por defecto, en posiciones arbitrarias
+        """
+        topology = SparseTopology(1, 2)
+
+        topology.update_cell((-5, 10**12), 1, [0.0])
+        topology.update_cell((3, 4), 0, [0.5])
+        topology.update_cell((7, 7), 0, [0.0])
+        topology.flip()
+
+        self.assertEqual(len(topology.cells[topology.read_buffer]), 2)
+
+        state, attributes = topology.get_cell((-5, 10**12))
+        self.assertEqual(state, 1)
+        self.assertTrue(np.array_equal(attributes, [0.0]))
+
+        state, attributes = topology.get_cell((3, 4))
+        self.assertEqual(state, 0)
+        self.assertTrue(np.array_equal(attributes, [0.5]))
+
+        state, attributes = topology.get_cell((7, 7))
+        self.assertEqual(state, 0)
+        self.assertTrue(np.array_equal(attributes, [0.0]))
+
+    def test_set_values_from_configuration_and_get_states(self):
+        """
+        Este metodo testea que get_states retorne la caja que contiene las
+        celulas almacenadas
+        """
+        topology = SparseTopology(0, 2)
+        configuration = np.array([[0, 0, 0, 0], [0, 1, 0, 2], [0, 0, 1, 0]])
+        topology.set_values_from_configuration(configuration, origin=(-10, 20))
+        topology.flip()
+
+        lower, upper = topology.get_bounds()
+        self.assertTrue(np.array_equal(lower, [-9, 21]))
+        self.assertTrue(np.array_equal(upper, [-7, 24]))
+        self.assertTrue(np.array_equal(topology.get_states(), configuration[1:, 1:]))
+        self.assertIsNone(topology.get_attributes())
+
+        with self.assertRaises(InvalidParameterError):
+            topology.set_values_from(1)
+
+    def test_apply_mask_and_get_candidates(self):
+        """
+        Este metodo testea la extraccion de vecindades y las posiciones de las
+        celulas que tienen en su vecindad alguna celula almacenada
+        """
+        topology = SparseTopology(0, 2)
+        topology.update_cell((0, 0), 1, None)
+        topology.update_cell((0, 2), 2, None)
+        topology.flip()
+
+        mask = CrossNeighborhood().get_mask()
+        states, attributes = topology.apply_mask((-1, 0), mask)
+        self.assertTrue(np.array_equal(states, [0, 1, 0, 2, 0]))
+        self.assertIsNone(attributes)
+
+        candidates = topology.get_candidates(mask, (-1, -1))
+        self.assertEqual(
+            candidates,
+            [(-1, 0), (-1, 2), (0, -1), (0, 0), (0, 1), (0, 2), (0, 3), (1, 0), (1, 2)],
+        )
+
+
+class TestUnboundedNGridTopology(unittest.TestCase):
+    """
+    Tests para la clase UnboundedNGridTopology
+    """
+
+    def test_update_cell_and_get_cell(self):
+        """
+        Este metodo testea que los bloques se creen al actualizar celulas en
+        posiciones arbitrarias, y se eliminen cuando vuelven al valor por
+        defecto
+        """
+        topology = UnboundedNGridTopology(1, 2, (4, 4))
+
+        topology.update_cell((-5, 10**12), 1, [0.0])
+        topology.update_cell((3, 4), 0, [0.5])
+        topology.flip()
+
+        self.assertEqual(sorted(topology.chunks), [(-2, 250000000000), (0, 1)])
+
+        state, attributes = topology.get_cell((-5, 10**12))
+        self.assertEqual(state, 1)
+        self.assertTrue(np.array_equal(attributes, [0.0]))
+
+        state, attributes = topology.get_cell((3, 4))
+        self.assertEqual(state, 0)
+        self.assertTrue(np.array_equal(attributes, [0.5]))
+
+        state, attributes = topology.get_cell((100, 100))
+        self.assertEqual(state, 0)
+        self.assertTrue(np.array_equal(attributes, [0.0]))
+
+        topology.update_cell((3, 4), 0, [0.0])
+        topology.flip()
+        topology.update_cell((3, 4), 0, [0.0])
+        topology.release_chunks()
+        self.assertEqual(list(topology.chunks), [(-2, 250000000000)])
+
+    def test_set_values_from_configuration_and_get_states(self):
+        """
+        Este metodo testea que get_states retorne la caja que contiene las
+        celulas que no tienen el valor por defecto
+        """
+        topology = UnboundedNGridTopology(0, 2, (4, 4))
+        configuration = np.array([[0, 0, 0, 0], [0, 1, 0, 2], [0, 0, 1, 0]])
+        topology.set_values_from_configuration(configuration, origin=(-10, 2))
+        topology.flip()
+
+        self.assertEqual(len(topology.chunks), 4)
+
+        lower, upper = topology.get_bounds()
+        self.assertTrue(np.array_equal(lower, [-9, 3]))
+        self.assertTrue(np.array_equal(upper, [-7, 6]))
+        self.assertTrue(np.array_equal(topology.get_states(), configuration[1:, 1:]))
+        self.assertIsNone(topology.get_attributes())
+
+        with self.assertRaises(InvalidParameterError):
+            topology.set_values_from(1)
+
+    def test_get_active_chunks_and_get_padded_chunk(self):
+        """
+        Este metodo testea que se creen los bloques a los que llega la
+        actividad, y la extension de los bloques con las celulas vecinas
+        """
+        topology = UnboundedNGridTopology(0, 2, (4, 4))
+        topology.update_cell((0, 3), 1, None)
+        topology.update_cell((1, 1), 2, None)
+        topology.flip()
+
+        self.assertEqual(
+            sorted(topology.get_active_chunks((1, 1))),
+            [(-1, 0), (-1, 1), (0, 0), (0, 1)],
+        )
+
+        states, attributes = topology.get_padded_chunk((0, 1), (1, 1))
+        expected = np.zeros((6, 6), dtype=int)
+        expected[1, 0] = 1
+        self.assertTrue(np.array_equal(states, expected))
+        self.assertIsNone(attributes)
+
+        with self.assertRaises(InvalidParameterError):
+            topology.get_active_chunks((5, 1))
+
+
+class CrossNeighborhood(Neighborhood):
+    """
+    Vecindad de Neumann de radio 1 usada en los tests del automata
+    """
+
+    def __init__(self):
+        self.mask = np.array([[0, 1, 0], [1, 1, 1], [0, 1, 0]], dtype=bool)
+
+    def get_mask(self):
+        return self.mask
+
+    def get_offset(self):
+        return -1, -1
+
+
+class ParityRule(Rule):
+    """
+    Regla usada en los tests del automata, el nuevo estado es la paridad de la
+    suma de los estados de la vecindad y el nuevo atributo es el promedio de
+    los atributos de la vecindad
+    """
+
+    deterministic = True
+
+    def __init__(self):
+        self.neighborhood = CrossNeighborhood()
+
+    def get_neighborhood(self):
+        return self.neighborhood
+
+    def apply_rule(self, cell_states, cell_attributes):
+        attributes = None
+        if cell_attributes is not None:
+            attributes = cell_attributes.mean(axis=0)
+
+        return np.sum(cell_states) % 2, attributes
+
+
+class BatchParityRule(ParityRule):
+    """
+    Version de ParityRule que implementa el metodo apply_rule_batch
+    """
+
+    def apply_rule_batch(self, cell_states, cell_attributes):
+        attributes = None
+        if cell_attributes is not None:
+            attributes = cell_attributes.mean(axis=1)
+
+        return np.sum(cell_states, axis=1) % 2, attributes
+
+
+class MaximumRule(ParityRule):
+    """
+    Regla sin atributos cuyo nuevo estado es el maximo de los estados de la
+    vecindad
+    """
+
+    def apply_rule(self, cell_states, cell_attributes):
+        return np.max(cell_states), None
+
+
+class DecayRule(ParityRule):
+    """
+    Regla no determinista cuyo nuevo estado es el estado de la celula menos
+    el numero de vecinos vivos, sin bajar de 0, con estados uint8 la resta
+    daria la vuelta
+    """
+
+    deterministic = False
+
+    def apply_rule(self, cell_states, cell_attributes):
+        return max(cell_states[2] - np.sum(cell_states[[0, 1, 3, 4]]), 0), None
+
+    def apply_rule_batch(self, cell_states, cell_attributes):
+        states = cell_states[:, 2] - np.sum(cell_states[:, [0, 1, 3, 4]], axis=1)
+        return np.maximum(states, 0), None
+
+
+class RandomRule(ParityRule):
+    """
+    Version aleatoria de ParityRule, no se puede tabular
+    """
+
+    deterministic = False
+
+    def apply_rule(self, cell_states, cell_attributes):
+        return np.random.randint(2), None
+
+
+def parity(cell_states):
+    """
+    Funcion de transicion pura de ParityRule, sin atributos
+    """
+    return np.sum(cell_states) % 2
+
+
+class JitParityRule(ParityRule):
+    """
+    Version de ParityRule que implementa el metodo get_transition_function
+    """
+
+    def get_transition_function(self):
+        return parity
+
+
+class TestAutomaton(unittest.TestCase):
+    """
+    Tests para la clase Automaton
+    """
+
+    @staticmethod
+    def create_automaton(rule, attributes_number, engine=None):
+        """
+        Este metodo crea un automata con una configuracion inicial aleatoria
+        (pero igual para todos los automatas creados)
+        """
+        dimensions = (13, 7)
+        random = np.random.default_rng(0)
+
+        topology = FiniteNGridTopology(attributes_number, dimensions, (1, 1))
+        attributes = None
+        if attributes_number != 0:
+            attributes = random.random((*dimensions, attributes_number))
+        topology.set_values_from_configuration(
+            random.integers(0, 2, dimensions), attributes
+        )
+
+        return Automaton(StandardCell(2), rule, topology, engine=engine)
+
+    def test_engine_selection(self):
+        """
+        Este metodo testea que el automata evalue bloques de celulas solo
+        cuando la regla implementa apply_rule_batch
+        """
+        automaton = self.create_automaton(ParityRule(), 1)
+        self.assertIsInstance(automaton.engine, CellByCellEngine)
+
+        automaton = self.create_automaton(BatchParityRule(), 1)
+        self.assertIsInstance(automaton.engine, BatchEngine)
+
+    def test_batch_engine_matches_cell_by_cell_engine(self):
+        """
+        Este metodo testea que el motor por bloques produzca las mismas
+        generaciones que el motor celula por celula, usando bloques de
+        distintos tamanos
+        """
+        for batch_size in (1, 10, 1000):
+            reference = self.create_automaton(BatchParityRule(), 2, CellByCellEngine)
+            automaton = self.create_automaton(
+                BatchParityRule(),
+                2,
+                lambda rule, topology: BatchEngine(rule, topology, batch_size),
+            )
+
+            for _ in range(4):
+                reference.next_step()
+                automaton.next_step()
+
+                self.assertTrue(
+                    np.array_equal(reference.topology.states, automaton.topology.states)
+                )
+                self.assertTrue(
+                    np.allclose(
+                        reference.topology.attributes, automaton.topology.attributes
+                    )
+                )
+
+    def test_transition_function(self):
+        """
+        Este metodo testea que las reglas con funcion de transicion se
+        compilen solo si numba esta instalado y las celulas no tienen
+        atributos (en caso contrario se tabulan), y que produzcan las mismas
+        generaciones que apply_rule
+        """
+        reference = self.create_automaton(ParityRule(), 0, CellByCellEngine)
+        automaton = self.create_automaton(JitParityRule(), 0)
+        self.assertIsInstance(
+            automaton.engine, JitEngine if JIT_AVAILABLE else TableEngine
+        )
+
+        for _ in range(4):
+            reference.next_step()
+            automaton.next_step()
+
+            self.assertTrue(
+                np.array_equal(reference.topology.states, automaton.topology.states)
+            )
+
+        automaton = self.create_automaton(JitParityRule(), 1)
+        self.assertIsInstance(automaton.engine, CellByCellEngine)
+
+    def test_table_engine(self):
+        """
+        Este metodo testea que las reglas deterministas con pocos estados y
+        sin atributos se tabulen, y que produzcan las mismas generaciones que
+        el motor celula por celula, tambien con estados que no son 0, 1, ...
+        """
+        automaton = self.create_automaton(ParityRule(), 0)
+        self.assertIsInstance(automaton.engine, TableEngine)
+        self.assertEqual(automaton.engine.table.size, 2**5)
+
+        automaton = self.create_automaton(RandomRule(), 0)
+        self.assertIsInstance(automaton.engine, CellByCellEngine)
+
+        states = (2, 5, 7)
+        configuration = np.random.default_rng(0).choice(states, (13, 7))
+
+        automata = []
+        for engine in (
+            CellByCellEngine,
+            lambda rule, topology: TableEngine(rule, topology, states),
+        ):
+            topology = FiniteNGridTopology(0, (13, 7), (1, 1))
+            topology.set_values_from_configuration(configuration)
+            # la frontera debe tener un estado de la tabla en ambos buffers
+            for _ in range(2):
+                topology.set_border_values(2, None)
+                topology.flip()
+            automata.append(
+                Automaton(StandardCell(3), MaximumRule(), topology, engine=engine)
+            )
+
+        reference, automaton = automata
+        self.assertFalse(automaton.engine.identity)
+
+        for _ in range(4):
+            reference.next_step()
+            automaton.next_step()
+
+            self.assertTrue(
+                np.array_equal(reference.topology.states, automaton.topology.states)
+            )
+
+    def test_stochastic_rule(self):
+        """
+        Este metodo testea que las reglas no se tabulen si no indican que son
+        deterministas, y que las reglas aleatorias se evaluen en cada celula
+        """
+        self.assertFalse(Rule.deterministic)
+
+        topology = FiniteNGridTopology(0, (100, 100), (1, 1))
+        topology.set_values_from_configuration(np.zeros((100, 100), dtype=int))
+        automaton = Automaton(StandardCell(2), RandomRule(), topology)
+        self.assertNotIsInstance(automaton.engine, TableEngine)
+
+        np.random.seed(0)
+        automaton.next_step()
+        self.assertAlmostEqual(automaton.get_density_of_state(1), 0.5, delta=0.05)
+
+    def test_table_unknown_states(self):
+        """
+        Este metodo testea que el motor con tabla rechace los estados que no
+        estan en la tabla, con y sin codificacion de los estados
+        """
+        for states, unknown in (((0, 1), 2), ((2, 5, 7), 3)):
+            configuration = np.full((13, 7), states[0])
+            configuration[4, 3] = unknown
+
+            topology = FiniteNGridTopology(0, (13, 7), (1, 1))
+            topology.set_values_from_configuration(configuration)
+            topology.set_border_values(states[0], None)
+            automaton = Automaton(
+                StandardCell(3),
+                MaximumRule(),
+                topology,
+                engine=lambda rule, topology: TableEngine(rule, topology, states),
+            )
+
+            with self.assertRaises(InvalidParameterError):
+                automaton.next_step()
+
+    def test_table_size_threshold(self):
+        """
+        Este metodo testea que no se tabulen reglas con demasiadas
+        configuraciones de la vecindad
+        """
+        topology = FiniteNGridTopology(0, (13, 7), (1, 1))
+
+        self.assertTrue(is_tabulable(ParityRule(), topology, (0, 1, 2), 3**5))
+        self.assertFalse(is_tabulable(ParityRule(), topology, (0, 1, 2), 3**5 - 1))
+        self.assertFalse(is_tabulable(ParityRule(), topology, range(10**6)))
+
+        with self.assertRaises(InvalidParameterError):
+            TableEngine(ParityRule(), topology, (0, 1, 2), 100)
+
+    @unittest.skipIf(not JIT_AVAILABLE, "numba no esta instalado")
+    def test_jit_engine(self):
+        """
+        Este metodo testea que el motor compilado produzca las mismas
+        generaciones que el motor celula por celula con frontera periodica
+        """
+        configuration = np.random.default_rng(0).integers(0, 2, (13, 7))
+
+        automata = []
+        for engine in (CellByCellEngine, JitEngine):
+            topology = FiniteNGridTopology(0, (13, 7), (1, 1), "periodic")
+            topology.set_values_from_configuration(configuration)
+            automata.append(
+                Automaton(StandardCell(2), JitParityRule(), topology, engine=engine)
+            )
+
+        reference, automaton = automata
+        for _ in range(6):
+            reference.next_step()
+            automaton.next_step()
+
+            self.assertTrue(
+                np.array_equal(reference.topology.states, automaton.topology.states)
+            )
+
+    def test_sparse_engine(self):
+        """
+        Este metodo testea que el motor de la topologia dispersa produzca las
+        mismas generaciones que el motor celula por celula, mientras el
+        patron no alcanza la frontera
+        """
+        configuration = np.zeros((21, 21), dtype=int)
+        configuration[8:13, 8:13] = np.random.default_rng(0).integers(0, 2, (5, 5))
+        attributes = np.zeros((21, 21, 1))
+        attributes[10, 10] = 1.0
+
+        topology = FiniteNGridTopology(1, (21, 21), (1, 1))
+        topology.set_values_from_configuration(configuration, attributes)
+        reference = Automaton(StandardCell(2), ParityRule(), topology)
+
+        sparse = SparseTopology(1, 2)
+        sparse.set_values_from_configuration(configuration, attributes)
+        automaton = Automaton(StandardCell(2), ParityRule(), sparse)
+        self.assertIsInstance(automaton.engine, SparseEngine)
+
+        for _ in range(4):
+            reference.next_step()
+            automaton.next_step()
+
+            lower, upper = sparse.get_bounds()
+            region = tuple(slice(i, j) for i, j in zip(lower, upper))
+            states = reference.topology.get_states()
+
+            self.assertTrue(np.array_equal(states[region], sparse.get_states()))
+            self.assertEqual(
+                np.count_nonzero(states), np.count_nonzero(sparse.get_states())
+            )
+            self.assertTrue(
+                np.allclose(
+                    reference.topology.get_attributes()[region],
+                    sparse.get_attributes(),
+                )
+            )
+
+    def test_chunked_engine(self):
+        """
+        Este metodo testea que el motor de la topologia no acotada produzca
+        las mismas generaciones que el motor por bloques de filas, mientras el
+        patron no alcanza la frontera
+        """
+        configuration = np.zeros((21, 21), dtype=int)
+        configuration[8:13, 8:13] = np.random.default_rng(0).integers(0, 2, (5, 5))
+        attributes = np.zeros((21, 21, 1))
+        attributes[10, 10] = 1.0
+
+        topology = FiniteNGridTopology(1, (21, 21), (1, 1))
+        topology.set_values_from_configuration(configuration, attributes)
+        reference = Automaton(StandardCell(2), BatchParityRule(), topology)
+
+        unbounded = UnboundedNGridTopology(1, 2, (4, 4))
+        unbounded.set_values_from_configuration(configuration, attributes)
+        automaton = Automaton(StandardCell(2), BatchParityRule(), unbounded)
+        self.assertIsInstance(automaton.engine, ChunkedEngine)
+        self.assertIsInstance(automaton.engine.engine, BatchEngine)
+
+        for _ in range(4):
+            reference.next_step()
+            automaton.next_step()
+
+            lower, upper = unbounded.get_bounds()
+            region = tuple(slice(i, j) for i, j in zip(lower, upper))
+            states = reference.topology.get_states()
+
+            self.assertTrue(np.array_equal(states[region], unbounded.get_states()))
+            self.assertEqual(
+                np.count_nonzero(states), np.count_nonzero(unbounded.get_states())
+            )
+            self.assertTrue(
+                np.allclose(
+                    reference.topology.get_attributes()[region],
+                    unbounded.get_attributes(),
+                )
+            )
+
+    def test_prewarm_plans(self):
+        """
+        Este metodo testea que los automatas con la misma geometria usen los
+        planes calculados con prewarm_plans
+        """
+        plan_cache.clear()
+
+        prewarm_plans(ParityRule(), FiniteNGridTopology(1, (13, 7), (1, 1)))
+        misses = plan_cache.get_statistics()["misses"]
+        self.assertGreater(misses, 0)
+
+        automaton = self.create_automaton(ParityRule(), 1, CellByCellEngine)
+        automaton.next_step()
+
+        statistics = plan_cache.get_statistics()
+        self.assertEqual(statistics["misses"], misses)
+        self.assertGreater(statistics["hits"], 0)
+
+    def test_run(self):
+        """
+        Este metodo testea que el metodo run produzca las mismas generaciones
+        que el metodo next_step, y que el callback se llame cada every
+        generaciones
+        """
+        reference = self.create_automaton(BatchParityRule(), 1)
+        automaton = self.create_automaton(BatchParityRule(), 1)
+
+        for _ in range(7):
+            reference.next_step()
+
+        generations = []
+        automaton.run(7, 3, lambda automaton: generations.append(automaton.generation))
+
+        self.assertEqual(generations, [3, 6])
+        self.assertEqual(automaton.generation, 7)
+        self.assertTrue(
+            np.array_equal(reference.topology.states, automaton.topology.states)
+        )
+
+        with self.assertRaises(InvalidParameterError):
+            automaton.run(1, 0)
+
+    def test_get_states(self):
+        """
+        Este metodo testea que get_states retorne la generacion mas reciente
+        """
+        automaton = self.create_automaton(BatchParityRule(), 1)
+        automaton.run(2)
+
+        topology = automaton.topology
+        self.assertTrue(
+            np.array_equal(
+                automaton.get_states(),
+                topology.states[topology.write_buffer][topology.subshape],
+            )
+        )
+
+    def test_densities_and_averages(self):
+        """
+        Este metodo testea las densidades de los estados y los promedios de
+        los atributos, con atributos de distintos tipos
+        """
+        cell = AttributesCell([("energia", np.float32), ("edad", np.uint8)])
+        topology = FiniteNGridTopology(2, (13, 7), (1, 1))
+        random = np.random.default_rng(0)
+        topology.set_values_from_configuration(
+            random.integers(0, 2, (13, 7)), random.integers(0, 200, (13, 7, 2))
+        )
+        automaton = Automaton(cell, BatchParityRule(), topology)
+        self.assertEqual(topology.attributes_dtypes, [np.float32, np.uint8])
+        self.assertEqual(topology.attributes_names, ["energia", "edad"])
+
+        automaton.run(2)
+        states = automaton.get_states()
+        attributes = automaton.get_attributes()
+
+        density = np.count_nonzero(states) / states.size
+        self.assertAlmostEqual(automaton.get_density_of_state(1), density)
+        self.assertEqual(automaton.get_densities_of_states(), [1 - density, density])
+
+        self.assertEqual(automaton.get_attributes("edad").dtype, np.uint8)
+        self.assertTrue(
+            np.array_equal(automaton.get_attributes("edad"), attributes[..., 1])
+        )
+        self.assertAlmostEqual(
+            automaton.get_average_of_attribute("edad"),
+            attributes[..., 1].mean(dtype=np.float64),
+        )
+        self.assertTrue(
+            np.allclose(
+                automaton.get_averages_of_attributes(), attributes.mean(axis=(0, 1))
+            )
+        )
+
+        for index in ("velocidad", 2, -1):
+            with self.assertRaises(InvalidParameterError):
+                automaton.get_average_of_attribute(index)
+
+        automaton = self.create_automaton(BatchParityRule(), 0)
+        self.assertEqual(automaton.get_averages_of_attributes(), [])
+        with self.assertRaises(InvalidParameterError):
+            automaton.get_average_of_attribute(0)
+
+    def test_rules_receive_int64_states(self):
+        """
+        Este metodo testea que las reglas reciban los estados en int64 aunque
+        la topologia los almacene en uint8
+        """
+        dimensions = (13, 7)
+        configuration = np.random.default_rng(0).integers(0, 3, dimensions)
+        expected = None
+
+        for engine in (CellByCellEngine, BatchEngine, None):
+            topology = FiniteNGridTopology(0, dimensions, (1, 1))
+            topology.set_values_from_configuration(configuration)
+            automaton = Automaton(StandardCell(3), DecayRule(), topology, engine=engine)
+            self.assertEqual(topology.states_dtype, np.uint8)
+
+            automaton.run(2)
+            states = automaton.get_states()
+            self.assertLessEqual(states.max(), 2)
+
+            if expected is None:
+                expected = states.copy()
+            self.assertTrue(np.array_equal(states, expected))
+
+    def test_iter_generations(self):
+        """
+        Este metodo testea que el generador retorne las generaciones cada
+        every pasos, como vistas de solo lectura o como copias
+        """
+        reference = self.create_automaton(BatchParityRule(), 1)
+        automaton = self.create_automaton(BatchParityRule(), 1)
+
+        expected = []
+        for _ in range(7):
+            reference.next_step()
+            expected.append(reference.get_states().copy())
+
+        generations = list(automaton.iter_generations(7, 2, copy=True))
+        self.assertEqual(len(generations), 3)
+        for states, expected_states in zip(generations, expected[1::2]):
+            self.assertTrue(np.array_equal(states, expected_states))
+
+        # las generaciones restantes se calculan al terminar la iteracion
+        self.assertEqual(automaton.generation, 7)
+        self.assertTrue(np.array_equal(automaton.get_states(), expected[-1]))
+
+        states = next(automaton.iter_generations())
+        with self.assertRaises(ValueError):
+            states[0, 0] = 1
+
+
+class TestParallelEngine(unittest.TestCase):
+    """
+    Tests para la clase ParallelEngine
+    """
+
+    def test_get_slabs(self):
+        """
+        Este metodo testea la division del espacio en bloques de filas
+        """
+        topology = FiniteNGridTopology(0, (10, 4), (2, 1))
+
+        self.assertEqual(
+            [region[0] for region in get_slabs(topology, 3)],
+            [slice(2, 5), slice(5, 8), slice(8, 12)],
+        )
+        self.assertEqual(len(get_slabs(topology, 20)), 10)
+
+    def test_same_generations_as_serial_engine(self):
+        """
+        Este metodo testea que el motor paralelo produzca las mismas
+        generaciones que el motor por bloques, y que al cerrarlo la topologia
+        conserve los buffers
+        """
+        for boundary in ("constant", "periodic"):
+            configuration = np.random.default_rng(0).integers(0, 2, (13, 7))
+            attributes = np.random.default_rng(1).random((13, 7, 1))
+
+            automata = []
+            for engine in (BatchEngine, functools.partial(ParallelEngine, workers=3)):
+                topology = FiniteNGridTopology(1, (13, 7), (1, 1), boundary)
+                topology.set_values_from_configuration(configuration, attributes)
+                automata.append(
+                    Automaton(
+                        StandardCell(2), BatchParityRule(), topology, engine=engine
+                    )
+                )
+
+            reference, automaton = automata
+            try:
+                for _ in range(3):
+                    reference.next_step()
+                    automaton.next_step()
+
+                    self.assertTrue(
+                        np.array_equal(
+                            reference.topology.states, automaton.topology.states
+                        )
+                    )
+
+                reference.run(5)
+                automaton.run(5)
+            finally:
+                automaton.engine.close()
+
+            self.assertTrue(
+                np.array_equal(reference.topology.states, automaton.topology.states)
+            )
+            self.assertTrue(
+                np.allclose(
+                    reference.topology.attributes, automaton.topology.attributes
+                )
+            )
+
+            with self.assertRaises(InvalidParameterError):
+                automaton.next_step()
+
+    def test_rule_without_vectorized_path(self):
+        """
+        Este metodo testea que no se acepten reglas que solo implementan
+        apply_rule
+        """
+        with self.assertRaises(InvalidParameterError):
+            TestAutomaton.create_automaton(
+                ParityRule(), 0, functools.partial(ParallelEngine, workers=2)
+            )
+
+
+class TestThreadedEngine(unittest.TestCase):
+    """
+    Tests para la clase ThreadedEngine
+    """
+
+    def test_split_regions(self):
+        """
+        Este metodo testea la division de regiones entre bloques de filas
+        """
+        topology = FiniteNGridTopology(0, (10, 4), (2, 1))
+        regions = [(slice(2, 4), slice(1, 3)), (slice(4, 10), slice(3, 5))]
+
+        self.assertEqual(
+            split_regions(regions, get_slabs(topology, 3)),
+            [
+                [(slice(2, 4), slice(1, 3)), (slice(4, 5), slice(3, 5))],
+                [(slice(5, 8), slice(3, 5))],
+                [(slice(8, 10), slice(3, 5))],
+            ],
+        )
+
+    def test_same_generations_as_serial_engine(self):
+        """
+        Este metodo testea que el motor con hilos produzca las mismas
+        generaciones que el motor por bloques
+        """
+        for boundary in ("constant", "periodic"):
+            configuration = np.random.default_rng(0).integers(0, 2, (13, 7))
+            attributes = np.random.default_rng(1).random((13, 7, 1))
+
+            automata = []
+            for threads in (1, 3):
+                topology = FiniteNGridTopology(1, (13, 7), (1, 1), boundary)
+                topology.set_values_from_configuration(configuration, attributes)
+                automata.append(
+                    Automaton(
+                        StandardCell(2), BatchParityRule(), topology, threads=threads
+                    )
+                )
+
+            reference, automaton = automata
+            self.assertIsInstance(reference.engine, BatchEngine)
+            self.assertIsInstance(automaton.engine, ThreadedEngine)
+            self.assertEqual(len(automaton.engine.slabs), 3)
+
+            for _ in range(3):
+                reference.next_step()
+                automaton.next_step()
+
+                self.assertTrue(
+                    np.array_equal(reference.topology.states, automaton.topology.states)
+                )
+
+            reference.run(5)
+            automaton.run(5)
+            automaton.engine.close()
+
+            self.assertTrue(
+                np.allclose(
+                    reference.topology.attributes, automaton.topology.attributes
+                )
+            )
+
+            with self.assertRaises(InvalidParameterError):
+                automaton.next_step()
+
+    def test_default_threads(self):
+        """
+        Este metodo testea que por defecto no se usen hilos en espacios
+        pequenos, y que las reglas sin un camino vectorizado usen un solo
+        hilo aunque se pidan varios
+        """
+        automaton = TestAutomaton.create_automaton(BatchParityRule(), 0)
+        self.assertIsInstance(automaton.engine, BatchEngine)
+
+        automaton = Automaton(
+            StandardCell(2),
+            ParityRule(),
+            FiniteNGridTopology(1, (13, 7), (1, 1)),
+            threads=2,
+        )
+        self.assertIsInstance(automaton.engine, CellByCellEngine)
+
+    def test_serial_fallback(self):
+        """
+        Este metodo testea que el motor con hilos calcule las generaciones en
+        el hilo principal si el motor no se puede usar en varios hilos
+        """
+        automata = []
+        for engine in (
+            CellByCellEngine,
+            lambda rule, topology: ThreadedEngine(rule, topology, 3),
+        ):
+            topology = FiniteNGridTopology(1, (13, 7), (1, 1))
+            topology.set_values_from_configuration(
+                np.random.default_rng(0).integers(0, 2, (13, 7)),
+                np.random.default_rng(1).random((13, 7, 1)),
+            )
+            automata.append(
+                Automaton(StandardCell(2), ParityRule(), topology, engine=engine)
+            )
+
+        reference, automaton = automata
+        self.assertIsInstance(automaton.engine.engine, CellByCellEngine)
+        self.assertEqual(len(automaton.engine.slabs), 1)
+
+        reference.run(3)
+        automaton.run(3)
+        automaton.engine.close()
+
+        self.assertTrue(
+            np.array_equal(reference.topology.states, automaton.topology.states)
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,191 @@
+"""
+En este script se testean los motores implementados para los casos
+unidimensionales, cada motor debe producir las mismas generaciones que el
+motor celula por celula
+"""
+
+import unittest
+
+import numpy as np
+
+from pycellslib.cells import StandardCell
+from pycellslib.core import Automaton
+from pycellslib.core.engine import CellByCellEngine
+from pycellslib.onedimensional.engines import (
+    PackedWolframCodeEngine,
+    WolframCodeEngine,
+)
+from pycellslib.onedimensional.rules import WolframCodeRule
+from pycellslib.onedimensional.topologies import FiniteLineTopology
+
+
+def create_automaton(rule, configuration, border, engine=None):
+    """
+    Esta funcion crea un automata con la configuracion inicial dada, los
+    bordes del buffer de escritura tienen el estado 1 y los del buffer de
+    lectura el estado 0
+    """
+    topology = FiniteLineTopology(0, configuration.size, border)
+    topology.set_values_from_configuration(configuration)
+    topology.set_border_values(1)
+
+    return Automaton(StandardCell(rule.base), rule, topology, engine=engine)
+
+
+class TestWolframCodeEngine(unittest.TestCase):
+    """
+    Tests para la clase WolframCodeEngine
+    """
+
+    engine = WolframCodeEngine
+
+    def assert_same_generations(self, rule_parameters, size=41, generations=6):
+        """
+        Este metodo revisa que el motor produzca las mismas generaciones que
+        el motor celula por celula
+        """
+        rule = WolframCodeRule(**rule_parameters)
+        radius = rule_parameters.get("neighborhood_radius", 1)
+        configuration = np.random.default_rng(0).integers(0, rule.base, (1, size))
+
+        reference = create_automaton(rule, configuration, radius, CellByCellEngine)
+        automaton = create_automaton(rule, configuration, radius, self.engine)
+
+        for _ in range(generations):
+            reference.next_step()
+            automaton.next_step()
+
+            self.assertTrue(
+                np.array_equal(reference.topology.states, automaton.topology.states)
+            )
+
+        # el metodo run debe producir las mismas generaciones en los 2 buffers
+        automaton = create_automaton(rule, configuration, radius, self.engine)
+        automaton.run(generations)
+        automaton.synchronize()
+        self.assertTrue(
+            np.array_equal(reference.topology.states, automaton.topology.states)
+        )
+
+    def test_engine_selection(self):
+        """
+        Este metodo testea que el automata use el motor de la regla
+        """
+        rule = WolframCodeRule(rule_number=30, states_number=3)
+        automaton = create_automaton(rule, np.zeros((1, 5), dtype=int), 1)
+        self.assertIsInstance(automaton.engine, WolframCodeEngine)
+
+        # con 2 estados se usa el motor empaquetado
+        rule = WolframCodeRule(rule_number=30, states_number=2)
+        automaton = create_automaton(rule, np.zeros((1, 5), dtype=int), 1)
+        self.assertIsInstance(automaton.engine, PackedWolframCodeEngine)
+
+    def test_elementary_rules(self):
+        """
+        Este metodo testea el motor con las reglas 30, 90 y 110
+        """
+        for rule_number in (30, 90, 110):
+            self.assert_same_generations({"rule_number": rule_number})
+
+    def test_periodic_ring(self):
+        """
+        Este metodo testea la regla 90 en un anillo, cada celula es el xor de
+        sus 2 vecinas
+        """
+        configuration = np.random.default_rng(0).integers(0, 2, (1, 70))
+
+        topology = FiniteLineTopology(0, 70, 1, "periodic")
+        topology.set_values_from_configuration(configuration)
+        automaton = Automaton(
+            StandardCell(2), WolframCodeRule(90), topology, engine=self.engine
+        )
+
+        expected = configuration
+        for _ in range(20):
+            expected = np.roll(expected, 1, 1) ^ np.roll(expected, -1, 1)
+            automaton.next_step()
+
+            self.assertTrue(np.array_equal(automaton.get_states(), expected))
+
+    def test_attributes_dtype(self):
+        """
+        Este metodo testea que la linea almacene cada atributo en un arreglo
+        del tipo especificado
+        """
+        topology = FiniteLineTopology(2, 70, 1, attributes_dtype=[np.float32, np.uint8])
+        attributes = np.random.default_rng(0).integers(0, 100, (1, 70, 2))
+        topology.set_values_from_configuration(np.zeros((1, 70), dtype=int), attributes)
+        topology.flip()
+
+        self.assertEqual(topology.get_attributes(0).dtype, np.float32)
+        self.assertEqual(topology.get_attributes(1).dtype, np.uint8)
+        self.assertTrue(np.array_equal(topology.get_attributes(), attributes))
+
+    def test_three_states(self):
+        """
+        Este metodo testea el motor con una regla de 3 estados
+        """
+        self.assert_same_generations(
+            {"rule_number": 3**27 - 123456789, "states_number": 3}
+        )
+
+    def test_radius_2(self):
+        """
+        Este metodo testea el motor con una vecindad de radio 2
+        """
+        self.assert_same_generations(
+            {"rule_number": 2**32 - 987654321, "neighborhood_radius": 2}
+        )
+
+    def test_ten_states(self):
+        """
+        Este metodo testea el motor con una regla de 10 estados, los estados
+        se almacenan en uint8 y el indice de las configuraciones no cabe en
+        ese tipo
+        """
+        self.assert_same_generations(
+            {"rule_number": 10**1000 // 7, "states_number": 10}
+        )
+
+
+class TestPackedWolframCodeEngine(TestWolframCodeEngine):
+    """
+    Tests para la clase PackedWolframCodeEngine, se usan los mismos tests de
+    WolframCodeEngine (excepto el de 3 estados)
+    """
+
+    engine = PackedWolframCodeEngine
+
+    @unittest.skip("Este motor solo acepta reglas de 2 estados")
+    def test_three_states(self):
+        """
+        Este metodo testea el motor con una regla de 3 estados
+        """
+
+    @unittest.skip("Este motor solo acepta reglas de 2 estados")
+    def test_ten_states(self):
+        """
+        Este metodo testea el motor con una regla de 10 estados
+        """
+
+    def test_all_elementary_rules(self):
+        """
+        Este metodo testea el motor con una muestra de las 256 reglas
+        elementales en una linea que ocupa varias palabras
+        """
+        for rule_number in range(0, 256, 15):
+            self.assert_same_generations(
+                {"rule_number": rule_number}, size=150, generations=2
+            )
+
+    def test_radius_3(self):
+        """
+        Este metodo testea el motor con una vecindad de radio 3
+        """
+        self.assert_same_generations(
+            {"rule_number": 2**128 - 3**80, "neighborhood_radius": 3}, size=130
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
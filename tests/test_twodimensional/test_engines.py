@@ -0,0 +1,822 @@
+"""
+En este script se testean los motores implementados para los casos
+bidimensionales, cada motor debe producir las mismas generaciones que el
+motor celula por celula
+"""
+
+import unittest
+
+import numpy as np
+
+from pycellslib.cells import AttributesCell, LifeLikeCell, StandardCell
+from pycellslib.core import (
+    Automaton,
+    FiniteNGridTopology,
+    SparseTopology,
+    UnboundedNGridTopology,
+)
+from pycellslib.core.convolution import correlate, spectrum_cache
+from pycellslib.core.engine import CellByCellEngine
+from pycellslib.core.parallel import ThreadedEngine, get_threads
+from pycellslib.errors import InvalidParameterError
+from pycellslib.twodimensional.engines import (
+    BSNotationEngine,
+    ContinuousEngine,
+    OuterTotalisticEngine,
+    PackedBSNotationEngine,
+    SparseBSNotationEngine,
+    WeightedSumEngine,
+)
+from pycellslib.twodimensional.rules import (
+    BriansBrainRule,
+    BSNotationRule,
+    CyclicRule,
+    GenerationsRule,
+    GreenbergHastingsRule,
+    LeniaRule,
+    WeightedSumRule,
+    WireworldRule,
+)
+from pycellslib.twodimensional.topologies import FinitePlaneTopology
+
+
+def create_automaton(rule, configuration, border, engine=None):
+    """
+    Esta funcion crea un automata con la configuracion inicial dada, los
+    bordes del buffer de escritura tienen celulas vivas y los del buffer de
+    lectura celulas muertas
+    """
+    height, width = configuration.shape
+    topology = FinitePlaneTopology(0, width, height, border, border)
+    topology.set_values_from_configuration(configuration)
+    topology.set_border_values(1)
+
+    return Automaton(LifeLikeCell(), rule, topology, engine=engine)
+
+
+class TestBSNotationEngine(unittest.TestCase):
+    """
+    Tests para la clase BSNotationEngine
+    """
+
+    engine = BSNotationEngine
+
+    def assert_same_generations(
+        self, rule_parameters, border=1, generations=6, shape=(17, 23)
+    ):
+        """
+        Este metodo revisa que el motor produzca las mismas generaciones que
+        el motor celula por celula
+        """
+        configuration = np.random.default_rng(0).integers(0, 2, shape)
+
+        reference = create_automaton(
+            BSNotationRule(**rule_parameters), configuration, border, CellByCellEngine
+        )
+        automaton = create_automaton(
+            BSNotationRule(**rule_parameters), configuration, border, self.engine
+        )
+
+        for _ in range(generations):
+            reference.next_step()
+            automaton.next_step()
+
+            self.assertTrue(
+                np.array_equal(reference.topology.states, automaton.topology.states)
+            )
+
+        # el metodo run debe producir las mismas generaciones en los 2 buffers
+        automaton = create_automaton(
+            BSNotationRule(**rule_parameters), configuration, border, self.engine
+        )
+        automaton.run(generations)
+        automaton.synchronize()
+        self.assertTrue(
+            np.array_equal(reference.topology.states, automaton.topology.states)
+        )
+
+    def test_engine_selection(self):
+        """
+        Este metodo testea que el automata use el motor empaquetado con radio
+        1 y el motor de conteo con radios mayores
+        """
+        configuration = np.zeros((5, 5), dtype=int)
+
+        automaton = create_automaton(BSNotationRule([3], [2, 3]), configuration, 1)
+        self.assertIsInstance(automaton.engine, PackedBSNotationEngine)
+        # el motor empaquetado usa un solo hilo aunque se pidan varios
+        self.assertEqual(get_threads(automaton.engine, 4), 1)
+
+        automaton = create_automaton(BSNotationRule([3], [2, 3], 2), configuration, 2)
+        self.assertIsInstance(automaton.engine, BSNotationEngine)
+
+    def test_game_of_life(self):
+        """
+        Este metodo testea el motor con el juego de la vida
+        """
+        self.assert_same_generations({"B": [3], "S": [2, 3]})
+
+    def test_highlife(self):
+        """
+        Este metodo testea el motor con la regla HighLife
+        """
+        self.assert_same_generations({"B": [3, 6], "S": [2, 3]}, border=3)
+
+    def test_larger_than_life(self):
+        """
+        Este metodo testea el motor con reglas Larger than Life, cuyas
+        vecindades se suman con tablas de sumas acumuladas (Moore) y sumas
+        diagonales (Neumann)
+        """
+        self.assert_same_generations(
+            {"B": list(range(34, 46)), "S": list(range(33, 58)), "radius": 5},
+            border=5,
+            generations=3,
+        )
+        self.assert_same_generations(
+            {"B": [9, 10, 11], "S": list(range(8, 15)), "radius": 5},
+            border=5,
+            generations=3,
+        )
+        self.assert_same_generations(
+            {
+                "B": list(range(14, 20)),
+                "S": list(range(12, 26)),
+                "radius": 5,
+                "neighborhood": "neumann",
+            },
+            border=5,
+            generations=3,
+        )
+        # las vecindades circulares grandes se suman con la transformada de
+        # Fourier
+        self.assert_same_generations(
+            {
+                "B": list(range(30, 40)),
+                "S": list(range(28, 50)),
+                "radius": 5,
+                "neighborhood": "circular",
+            },
+            border=5,
+            generations=3,
+        )
+
+    def test_states_dtype(self):
+        """
+        Este metodo testea que el automata almacene los estados en uint8, y
+        que las sumas de vecindades grandes en un plano grande (cuyas sumas
+        acumuladas no caben en el tipo de los conteos) produzcan las mismas
+        generaciones que con estados int64
+        """
+        configuration = np.random.default_rng(0).integers(0, 2, (200, 200))
+
+        for neighborhood in ("moore", "neumann"):
+            rule = BSNotationRule(
+                list(range(14, 20)), list(range(12, 26)), 5, neighborhood
+            )
+
+            topology = FinitePlaneTopology(0, 200, 200, 5, 5)
+            topology.set_values_from_configuration(configuration)
+            automaton = Automaton(LifeLikeCell(), rule, topology, engine=self.engine)
+            self.assertEqual(topology.states_dtype, np.uint8)
+
+            topology = FinitePlaneTopology(0, 200, 200, 5, 5, states_dtype=int)
+            topology.set_values_from_configuration(configuration)
+            reference = Automaton(LifeLikeCell(), rule, topology, engine=self.engine)
+            self.assertEqual(topology.states_dtype, int)
+
+            for _ in range(3):
+                automaton.next_step()
+                reference.next_step()
+
+                self.assertTrue(
+                    np.array_equal(reference.topology.states, automaton.topology.states)
+                )
+
+    def test_empty_birth_and_survival_lists(self):
+        """
+        Este metodo testea el motor con listas B y S vacias, cuando B es vacia
+        toda celula muerta nace
+        """
+        self.assert_same_generations({"B": [2], "S": []})
+        self.assert_same_generations({"B": [], "S": [2]})
+
+    def test_radius_2(self):
+        """
+        Este metodo testea el motor con una vecindad de radio 2
+        """
+        self.assert_same_generations({"B": [2, 4], "S": [0], "radius": 2}, border=2)
+
+    def test_glider(self):
+        """
+        Este metodo testea que un glider se desplace una celula en diagonal
+        cada 4 generaciones
+        """
+        configuration = np.zeros((10, 10), dtype=int)
+        configuration[1:4, 1:4] = [[0, 1, 0], [0, 0, 1], [1, 1, 1]]
+
+        topology = FinitePlaneTopology(0, 10, 10, 1, 1)
+        topology.set_values_from_configuration(configuration)
+        automaton = Automaton(
+            LifeLikeCell(), BSNotationRule([3], [2, 3]), topology, engine=self.engine
+        )
+
+        for _ in range(4):
+            automaton.next_step()
+
+        # el estado mas reciente se encuentra en el buffer de escritura
+        states = topology.states[topology.write_buffer][topology.subshape]
+        self.assertTrue(np.array_equal(states, np.roll(configuration, (1, 1), (0, 1))))
+
+    def test_glider_on_torus(self):
+        """
+        Este metodo testea que un glider atraviese la frontera periodica y
+        vuelva a su posicion inicial
+        """
+        configuration = np.zeros((10, 12), dtype=int)
+        configuration[1:4, 1:4] = [[0, 1, 0], [0, 0, 1], [1, 1, 1]]
+
+        topology = FinitePlaneTopology(0, 12, 10, 1, 1, "periodic")
+        topology.set_values_from_configuration(configuration)
+        topology.set_tile_shape((4, 4))
+        automaton = Automaton(
+            LifeLikeCell(), BSNotationRule([3], [2, 3]), topology, engine=self.engine
+        )
+
+        for generation in range(1, 61):
+            automaton.next_step()
+
+            if generation % 4 == 0:
+                shift = generation // 4
+                expected = np.roll(configuration, (shift, shift), (0, 1))
+                self.assertTrue(np.array_equal(automaton.get_states(), expected))
+
+        # el glider vuelve a su posicion inicial cada 4 * 60 generaciones
+        automaton.run(180)
+        self.assertTrue(np.array_equal(automaton.get_states(), configuration))
+
+    def test_run_with_callback(self):
+        """
+        Este metodo testea que el callback reciba la topologia actualizada
+        """
+        configuration = np.zeros((10, 10), dtype=int)
+        configuration[1:4, 1:4] = [[0, 1, 0], [0, 0, 1], [1, 1, 1]]
+
+        topology = FinitePlaneTopology(0, 10, 10, 1, 1)
+        topology.set_values_from_configuration(configuration)
+        automaton = Automaton(
+            LifeLikeCell(), BSNotationRule([3], [2, 3]), topology, engine=self.engine
+        )
+
+        displacements = []
+
+        def callback(automaton):
+            # cada 4 generaciones el glider se desplaza una celula en diagonal
+            shift = automaton.generation // 4
+            expected = np.roll(configuration, (shift, shift), (0, 1))
+            displacements.append(np.array_equal(automaton.get_states(), expected))
+
+        automaton.run(17, 4, callback)
+
+        self.assertEqual(displacements, [True] * 4)
+        self.assertEqual(automaton.generation, 17)
+
+
+class TestPackedBSNotationEngine(TestBSNotationEngine):
+    """
+    Tests para la clase PackedBSNotationEngine, se usan los mismos tests de
+    BSNotationEngine (excepto los de radios mayores a 1)
+    """
+
+    engine = PackedBSNotationEngine
+
+    @unittest.skip("Este motor solo acepta reglas de radio 1")
+    def test_radius_2(self):
+        """
+        Este metodo testea el motor con una vecindad de radio 2
+        """
+
+    @unittest.skip("Este motor solo acepta reglas de radio 1")
+    def test_larger_than_life(self):
+        """
+        Este metodo testea el motor con reglas Larger than Life
+        """
+
+    @unittest.skip("Este motor solo acepta reglas de radio 1")
+    def test_states_dtype(self):
+        """
+        Este metodo testea el tipo de los estados con reglas Larger than Life
+        """
+
+    def test_wide_plane(self):
+        """
+        Este metodo testea el motor en un plano cuyas filas ocupan varias
+        palabras, con reglas que usan todos los posibles numeros de vecinos
+        """
+        self.assert_same_generations(
+            {"B": [0, 1, 3, 5, 7], "S": [2, 4, 6, 8]}, generations=3, shape=(5, 150)
+        )
+        self.assert_same_generations(
+            {"B": [3, 6, 7, 8], "S": [3, 4, 6, 7, 8]}, generations=3, shape=(5, 150)
+        )
+
+
+class TestActiveTiles(unittest.TestCase):
+    """
+    Tests de los motores vectorizados cuando solo se calculan los bloques
+    cuya vecindad cambio
+    """
+
+    def test_sparse_plane(self):
+        """
+        Este metodo testea que omitir bloques produzca las mismas generaciones
+        que calcular todo el plano, con un glider, un oscilador, una
+        estructura estable y una region aleatoria
+        """
+        configuration = np.zeros((40, 50), dtype=int)
+        configuration[1:4, 1:4] = [[0, 1, 0], [0, 0, 1], [1, 1, 1]]
+        configuration[20, 30:33] = 1
+        configuration[30:32, 10:12] = 1
+        configuration[28:36, 36:44] = np.random.default_rng(0).integers(0, 2, (8, 8))
+
+        for rule_parameters, border in (
+            ({"B": [3], "S": [2, 3]}, 1),
+            ({"B": [5, 6], "S": [4, 5, 6, 7, 8], "radius": 2}, 2),
+        ):
+            automata = []
+            for skip_tiles in (False, True):
+                topology = FinitePlaneTopology(0, 50, 40, border, border)
+                topology.set_values_from_configuration(configuration)
+                topology.set_tile_shape((4, 4))
+
+                automaton = Automaton(
+                    LifeLikeCell(),
+                    BSNotationRule(**rule_parameters),
+                    topology,
+                    engine=BSNotationEngine,
+                )
+                automaton.engine.skip_tiles = skip_tiles
+                automata.append(automaton)
+
+            reference, automaton = automata
+            for _ in range(12):
+                reference.next_step()
+                automaton.next_step()
+
+                self.assertTrue(
+                    np.array_equal(reference.topology.states, automaton.topology.states)
+                )
+
+            self.assertTrue(automaton.get_states().any())
+            self.assertGreater(automaton.engine.get_skipped_fraction(), 0.5)
+
+    def test_threads(self):
+        """
+        Este metodo testea que el motor con hilos omita bloques y produzca
+        las mismas generaciones que el motor en un solo hilo
+        """
+        configuration = np.zeros((40, 50), dtype=int)
+        configuration[1:4, 1:4] = [[0, 1, 0], [0, 0, 1], [1, 1, 1]]
+        configuration[28:36, 36:44] = np.random.default_rng(0).integers(0, 2, (8, 8))
+
+        automata = []
+        for threads in (1, 3):
+            topology = FinitePlaneTopology(0, 50, 40, 2, 2)
+            topology.set_values_from_configuration(configuration)
+            topology.set_tile_shape((4, 4))
+
+            automata.append(
+                Automaton(
+                    LifeLikeCell(),
+                    BSNotationRule([5, 6], [4, 5, 6, 7, 8], 2),
+                    topology,
+                    threads=threads,
+                )
+            )
+
+        reference, automaton = automata
+        self.assertIsInstance(automaton.engine, ThreadedEngine)
+        self.assertIsInstance(automaton.engine.engine, BSNotationEngine)
+
+        for _ in range(12):
+            reference.next_step()
+            automaton.next_step()
+
+            self.assertTrue(
+                np.array_equal(reference.topology.states, automaton.topology.states)
+            )
+
+        self.assertTrue(automaton.get_states().any())
+        self.assertGreater(automaton.engine.engine.get_skipped_fraction(), 0.5)
+        automaton.engine.close()
+
+
+class TestOuterTotalisticEngine(unittest.TestCase):
+    """
+    Tests para la clase OuterTotalisticEngine
+    """
+
+    def assert_same_generations(self, rule, border=1, boundary="constant"):
+        """
+        Este metodo revisa que el motor produzca las mismas generaciones que
+        el motor celula por celula
+        """
+        configuration = np.random.default_rng(0).integers(
+            0, rule.states_number, (17, 23)
+        )
+
+        automata = []
+        for engine in (CellByCellEngine, None):
+            topology = FiniteNGridTopology(0, (17, 23), (border, border), boundary)
+            topology.set_values_from_configuration(configuration)
+            automata.append(
+                Automaton(
+                    StandardCell(rule.states_number), rule, topology, engine=engine
+                )
+            )
+
+        reference, automaton = automata
+        self.assertIsInstance(automaton.engine, OuterTotalisticEngine)
+
+        for _ in range(6):
+            reference.next_step()
+            automaton.next_step()
+
+            self.assertTrue(
+                np.array_equal(reference.topology.states, automaton.topology.states)
+            )
+
+    def test_generations(self):
+        """
+        Este metodo testea el motor con reglas de la familia Generations
+        """
+        self.assert_same_generations(BriansBrainRule())
+        self.assert_same_generations(GenerationsRule.from_notation("B3/S23/C8"))
+        self.assert_same_generations(GenerationsRule([5, 6], [4, 5, 6], 4, 2), 2)
+
+    def test_game_of_life(self):
+        """
+        Este metodo testea que la regla B3/S23/C2 sea el juego de la vida
+        """
+        configuration = np.random.default_rng(0).integers(0, 2, (17, 23))
+
+        automata = []
+        for rule in (BSNotationRule([3], [2, 3]), GenerationsRule([3], [2, 3], 2)):
+            topology = FiniteNGridTopology(0, (17, 23), (1, 1), "periodic")
+            topology.set_values_from_configuration(configuration)
+            automata.append(Automaton(LifeLikeCell(), rule, topology))
+
+        for automaton in automata:
+            automaton.run(10)
+
+        self.assertTrue(
+            np.array_equal(automata[0].get_states(), automata[1].get_states())
+        )
+
+    def test_excitable_and_cyclic_media(self):
+        """
+        Este metodo testea el motor con medios excitables de
+        Greenberg-Hastings y automatas ciclicos, con vecindades que no son
+        rectangulares
+        """
+        self.assert_same_generations(GreenbergHastingsRule(5, 2), 1, "periodic")
+        self.assert_same_generations(CyclicRule(4), 1, "periodic")
+        self.assert_same_generations(CyclicRule(6, 3, 2, "moore"), 2)
+
+    def test_wireworld(self):
+        """
+        Este metodo testea el motor con Wireworld, y que un electron recorra
+        un conductor
+        """
+        self.assert_same_generations(WireworldRule())
+
+        topology = FiniteNGridTopology(0, (3, 10), (1, 1))
+        configuration = np.zeros((3, 10), dtype=int)
+        configuration[1] = [2, 1] + [3] * 8
+        topology.set_values_from_configuration(configuration)
+        automaton = Automaton(StandardCell(4), WireworldRule(), topology)
+
+        automaton.run(5)
+        self.assertTrue(
+            np.array_equal(automaton.get_states()[1], [3] * 5 + [2, 1] + [3] * 3)
+        )
+
+
+class TestWeightedSumEngine(unittest.TestCase):
+    """
+    Tests para la clase WeightedSumEngine
+    """
+
+    def create_automata(self, rule, states_number):
+        """
+        Este metodo crea un automata con el motor de la regla y otro con el
+        motor celula por celula, con la misma configuracion inicial
+        """
+        radius = max(rule.get_neighborhood().get_mask().shape) // 2
+        configuration = np.random.default_rng(0).integers(0, states_number, (17, 23))
+
+        automata = []
+        for engine in (CellByCellEngine, None):
+            topology = FiniteNGridTopology(0, (17, 23), (radius, radius), "periodic")
+            topology.set_values_from_configuration(configuration)
+            automata.append(
+                Automaton(StandardCell(states_number), rule, topology, engine=engine)
+            )
+
+        return automata
+
+    def assert_same_generations(self, rule, states_number):
+        """
+        Este metodo revisa que el motor produzca las mismas generaciones que
+        el motor celula por celula
+        """
+        reference, automaton = self.create_automata(rule, states_number)
+        self.assertIsInstance(automaton.engine, WeightedSumEngine)
+
+        for _ in range(4):
+            reference.next_step()
+            automaton.next_step()
+
+            self.assertTrue(
+                np.array_equal(reference.topology.states, automaton.topology.states)
+            )
+
+    def test_integer_and_float_kernels(self):
+        """
+        Este metodo testea el motor con nucleos enteros pequenos (correlacion
+        directa) y nucleos reales grandes (transformada de Fourier)
+        """
+        rng = np.random.default_rng(1)
+
+        weights = rng.integers(-2, 3, (3, 5))
+        self.assert_same_generations(
+            WeightedSumRule(weights, lambda states, sums: (states + sums) % 3), 3
+        )
+
+        weights = rng.random((11, 11))
+        self.assert_same_generations(
+            WeightedSumRule(weights, lambda states, sums: sums > 15 + 5 * states), 2
+        )
+
+    def test_correlation_methods(self):
+        """
+        Este metodo testea que la correlacion directa y con la transformada
+        de Fourier produzcan las mismas sumas
+        """
+        rng = np.random.default_rng(2)
+        array = rng.integers(0, 5, (30, 40))
+        region = (slice(3, 27), slice(4, 36))
+
+        weights = rng.integers(-3, 4, (7, 9))
+        direct = correlate(array, weights, (-3, -4), region, method="direct")
+        fft = correlate(array, weights, (-3, -4), region, method="fft")
+        self.assertEqual(fft.dtype, np.int64)
+        self.assertTrue(np.array_equal(direct, fft))
+
+        weights = rng.random((7, 9))
+        direct = correlate(array, weights, (-3, -4), region, method="direct")
+        fft = correlate(array, weights, (-3, -4), region, method="fft")
+        self.assertTrue(np.allclose(direct, fft))
+
+    def test_spectrum_cache(self):
+        """
+        Este metodo testea que el espectro del nucleo solo se calcule en la
+        primera generacion
+        """
+        rule = WeightedSumRule(np.ones((15, 15)), lambda states, sums: sums % 2)
+        _, automaton = self.create_automata(rule, 2)
+
+        spectrum_cache.clear()
+        automaton.run(3)
+
+        self.assertEqual(spectrum_cache.misses, 1)
+        self.assertEqual(spectrum_cache.hits, 2)
+
+
+class TestContinuousEngine(unittest.TestCase):
+    """
+    Tests para la clase ContinuousEngine
+    """
+
+    def create_automaton(self, rule, engine=None, attributes_dtype=float):
+        """
+        Este metodo crea un automata con 2 atributos por celula, con valores
+        aleatorios entre 0 y 1
+        """
+        configuration = np.random.default_rng(0).random((17, 23, 2))
+
+        topology = FiniteNGridTopology(
+            2, (17, 23), (4, 4), "periodic", attributes_dtype
+        )
+        topology.set_values_from_configuration(
+            np.zeros((17, 23), dtype=int), configuration
+        )
+
+        return Automaton(StandardCell(2), rule, topology, engine=engine)
+
+    def test_same_generations_as_cell_by_cell_engine(self):
+        """
+        Este metodo testea que el motor produzca las mismas generaciones que
+        el motor celula por celula, y que solo cambie el atributo de la regla
+        """
+        rule = LeniaRule(4, mu=0.2, sigma=0.05, attribute=1)
+
+        reference = self.create_automaton(rule, CellByCellEngine)
+        automaton = self.create_automaton(rule)
+        self.assertIsInstance(automaton.engine, ContinuousEngine)
+        self.assertEqual(get_threads(automaton.engine), 1)
+
+        # configuracion inicial (ver create_automaton)
+        initial = np.random.default_rng(0).random((17, 23, 2))
+        for _ in range(4):
+            reference.next_step()
+            automaton.next_step()
+
+            self.assertTrue(
+                np.allclose(
+                    reference.topology.get_attributes(),
+                    automaton.topology.get_attributes(),
+                )
+            )
+
+        self.assertTrue(
+            np.array_equal(automaton.topology.get_attributes()[..., 0], initial[..., 0])
+        )
+        self.assertFalse(
+            np.allclose(automaton.topology.get_attributes()[..., 1], initial[..., 1])
+        )
+
+        # los valores se mantienen entre 0 y 1
+        self.assertTrue(np.all((automaton.topology.get_attributes() >= 0)))
+        self.assertTrue(np.all((automaton.topology.get_attributes() <= 1)))
+
+    def test_float32(self):
+        """
+        Este metodo testea el motor con atributos de tipo float32
+        """
+        reference = self.create_automaton(LeniaRule(4, mu=0.2, sigma=0.05))
+        automaton = self.create_automaton(
+            LeniaRule(4, mu=0.2, sigma=0.05, dtype=np.float32),
+            attributes_dtype=np.float32,
+        )
+
+        reference.run(4)
+        automaton.run(4)
+
+        self.assertEqual(automaton.topology.get_attributes().dtype, np.float32)
+        self.assertTrue(
+            np.allclose(
+                reference.topology.get_attributes(),
+                automaton.topology.get_attributes(),
+                atol=1e-4,
+            )
+        )
+
+    def test_attributes_fields(self):
+        """
+        Este metodo testea el motor con atributos de distintos tipos, el
+        atributo de la regla se lee de su propio arreglo y los demas atributos
+        se conservan
+        """
+        reference = self.create_automaton(LeniaRule(4, mu=0.2, sigma=0.05))
+
+        configuration = np.random.default_rng(0).random((17, 23, 2))
+        configuration[..., 1] = np.arange(17 * 23).reshape(17, 23) % 256
+        topology = FiniteNGridTopology(2, (17, 23), (4, 4), "periodic")
+        topology.set_values_from_configuration(
+            np.zeros((17, 23), dtype=int), configuration
+        )
+        cell = AttributesCell([("valor", np.float32), ("edad", np.uint8)])
+        automaton = Automaton(
+            cell, LeniaRule(4, mu=0.2, sigma=0.05, dtype=np.float32), topology
+        )
+        self.assertIsInstance(automaton.engine, ContinuousEngine)
+
+        reference.run(4)
+        automaton.run(4)
+
+        self.assertEqual(automaton.get_attributes("valor").dtype, np.float32)
+        self.assertTrue(
+            np.allclose(
+                reference.get_attributes(0), automaton.get_attributes(0), atol=1e-4
+            )
+        )
+        self.assertTrue(
+            np.array_equal(automaton.get_attributes("edad"), configuration[..., 1])
+        )
+
+    def test_invalid_attribute(self):
+        """
+        Este metodo testea que las celulas deban tener el atributo de la regla,
+        y que sea de tipo real
+        """
+        with self.assertRaises(InvalidParameterError):
+            self.create_automaton(LeniaRule(4, attribute=2))
+
+        with self.assertRaises(InvalidParameterError):
+            self.create_automaton(LeniaRule(4), attributes_dtype=[np.int16, float])
+
+
+class TestChunkedEngine(unittest.TestCase):
+    """
+    Tests del motor de la topologia no acotada con reglas BSNotationRule
+    """
+
+    def test_glider_crosses_chunks(self):
+        """
+        Este metodo testea que un glider atraviese varios bloques, y que los
+        bloques que deja atras se eliminen
+        """
+        glider = np.array([[0, 1, 0], [0, 0, 1], [1, 1, 1]])
+        topology = UnboundedNGridTopology(0, 2, (8, 8))
+        topology.set_values_from_configuration(glider, origin=(-4, -4))
+        automaton = Automaton(LifeLikeCell(), BSNotationRule([3], [2, 3]), topology)
+        self.assertIsInstance(automaton.engine.engine, PackedBSNotationEngine)
+
+        automaton.run(80)
+
+        topology.flip()
+        lower, _ = topology.get_bounds()
+        self.assertTrue(np.array_equal(lower, [16, 16]))
+        self.assertTrue(np.array_equal(topology.get_states(), glider))
+        self.assertLessEqual(len(topology.chunks), 4)
+
+
+class TestSparseBSNotationEngine(unittest.TestCase):
+    """
+    Tests para la clase SparseBSNotationEngine
+    """
+
+    def test_same_generations_as_dense_engine(self):
+        """
+        Este metodo testea que el motor produzca las mismas generaciones que
+        el motor de conteo, mientras el patron no alcanza la frontera
+        """
+        configuration = np.zeros((60, 60), dtype=int)
+        configuration[25:35, 25:35] = np.random.default_rng(0).integers(0, 2, (10, 10))
+
+        for rule_parameters in (
+            {"B": [3], "S": [2, 3]},
+            {"B": [3, 6], "S": []},
+            {"B": [5, 6], "S": [4, 5, 6, 7, 8], "radius": 2},
+        ):
+            radius = rule_parameters.get("radius", 1)
+            topology = FinitePlaneTopology(0, 60, 60, radius, radius)
+            topology.set_values_from_configuration(configuration)
+            reference = Automaton(
+                LifeLikeCell(), BSNotationRule(**rule_parameters), topology
+            )
+
+            sparse = SparseTopology(0, 2)
+            sparse.set_values_from_configuration(configuration)
+            automaton = Automaton(
+                LifeLikeCell(), BSNotationRule(**rule_parameters), sparse
+            )
+            self.assertIsInstance(automaton.engine, SparseBSNotationEngine)
+
+            for _ in range(8):
+                reference.next_step()
+                automaton.next_step()
+
+                # se comparan los buffers de lectura de las 2 topologias
+                states = reference.topology.get_states()
+                positions, _, _ = sparse.get_stored_cells()
+                expected = np.argwhere(states)
+
+                self.assertTrue(
+                    np.array_equal(
+                        positions[np.lexsort(positions.T[::-1])],
+                        expected,
+                    )
+                )
+
+    def test_glider_far_from_origin(self):
+        """
+        Este metodo testea un glider en coordenadas muy grandes
+        """
+        origin = np.array([-(10**15), 10**15])
+        topology = SparseTopology(0, 2)
+        topology.set_values_from_configuration(
+            [[0, 1, 0], [0, 0, 1], [1, 1, 1]], origin=origin
+        )
+        automaton = Automaton(LifeLikeCell(), BSNotationRule([3], [2, 3]), topology)
+
+        automaton.run(40)
+
+        topology.flip()
+        lower, _ = topology.get_bounds()
+        self.assertTrue(np.array_equal(lower, origin + 10))
+        self.assertEqual(len(topology.cells[topology.read_buffer]), 5)
+
+    def test_invalid_rules(self):
+        """
+        Este metodo testea que no se acepten reglas en las que el espacio
+        vacio no permanece vacio
+        """
+        for B in ([], [0, 3]):
+            with self.assertRaises(InvalidParameterError):
+                Automaton(LifeLikeCell(), BSNotationRule(B, [2]), SparseTopology(0, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
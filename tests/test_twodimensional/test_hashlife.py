@@ -0,0 +1,179 @@
+"""
+En este script se testea el algoritmo HashLife, las generaciones deben ser
+las mismas que las del motor de conteo sobre un plano suficientemente grande
+"""
+
+import unittest
+
+import numpy as np
+
+from pycellslib.cells import LifeLikeCell
+from pycellslib.core import Automaton
+from pycellslib.errors import InvalidParameterError
+from pycellslib.twodimensional.engines import BSNotationEngine
+from pycellslib.twodimensional.hashlife import HashLife
+from pycellslib.twodimensional.rules import BSNotationRule
+from pycellslib.twodimensional.topologies import FinitePlaneTopology
+
+GLIDER = np.array([[0, 1, 0], [0, 0, 1], [1, 1, 1]])
+
+
+class TestHashLife(unittest.TestCase):
+    """
+    Tests para la clase HashLife
+    """
+
+    def test_invalid_rules(self):
+        """
+        Este metodo testea que no se acepten reglas en las que el espacio
+        vacio no permanece vacio, ni reglas de radio mayor a 1
+        """
+        with self.assertRaises(InvalidParameterError):
+            HashLife(BSNotationRule([0, 3], [2, 3]))
+
+        with self.assertRaises(InvalidParameterError):
+            HashLife(BSNotationRule([], [2, 3]))
+
+        with self.assertRaises(InvalidParameterError):
+            HashLife(BSNotationRule([3], [2, 3], 2))
+
+    def test_soup(self):
+        """
+        Este metodo testea que HashLife produzca las mismas generaciones que
+        el motor de conteo, con una sopa aleatoria en el centro de un plano
+        que la sopa no alcanza a tocar
+        """
+        for B, S in [([3], [2, 3]), ([3, 6], [2, 3]), ([2], [])]:
+            configuration = np.zeros((60, 60), dtype=int)
+            configuration[25:35, 25:35] = np.random.default_rng(1).integers(
+                0, 2, (10, 10)
+            )
+
+            topology = FinitePlaneTopology(0, 60, 60, 1, 1)
+            topology.set_values_from_configuration(configuration)
+            automaton = Automaton(
+                LifeLikeCell(), BSNotationRule(B, S), topology, BSNotationEngine
+            )
+
+            hashlife = HashLife(BSNotationRule(B, S))
+            hashlife.load_topology(automaton.topology)
+
+            for _ in range(16):
+                automaton.next_step()
+            hashlife.advance(4)
+
+            # el estado mas reciente se encuentra en el buffer de escritura
+            states = topology.states[topology.write_buffer][topology.subshape]
+            self.assertTrue(np.array_equal(hashlife.get_region(0, 0, 60, 60), states))
+            self.assertEqual(hashlife.generation, 16)
+
+    def test_glider(self):
+        """
+        Este metodo testea que un glider se desplace 2^k / 4 celulas en
+        diagonal despues de 2^k generaciones
+        """
+        hashlife = HashLife(BSNotationRule([3], [2, 3]))
+        hashlife.set_states(GLIDER)
+
+        hashlife.advance(10)
+
+        self.assertEqual(hashlife.get_population(), 5)
+        self.assertTrue(np.array_equal(hashlife.get_region(256, 256, 3, 3), GLIDER))
+
+        # 1000 = 1024 - 16 - 8, se avanza hasta la generacion 2024
+        hashlife.run(1000)
+        self.assertEqual(hashlife.generation, 2024)
+        self.assertTrue(np.array_equal(hashlife.get_region(506, 506, 3, 3), GLIDER))
+
+    def test_store_topology(self):
+        """
+        Este metodo testea que la region visible se escriba en los dos
+        buffers de la topologia
+        """
+        hashlife = HashLife(BSNotationRule([3], [2, 3]))
+        hashlife.set_states(GLIDER, 1, 1)
+        hashlife.advance(2)
+
+        topology = FinitePlaneTopology(0, 8, 8, 1, 1)
+        hashlife.store_topology(topology)
+
+        expected = np.zeros((8, 8), dtype=int)
+        expected[2:5, 2:5] = GLIDER
+        self.assertTrue(np.array_equal(topology.get_states(), expected))
+        self.assertTrue(
+            np.array_equal(
+                topology.states[topology.write_buffer][topology.subshape], expected
+            )
+        )
+
+    def test_statistics(self):
+        """
+        Este metodo testea las estadisticas de la cache y el limite en el
+        numero de resultados memorizados
+        """
+        hashlife = HashLife(BSNotationRule([3], [2, 3]), max_cache_size=50)
+        hashlife.set_states(np.random.default_rng(2).integers(0, 2, (16, 16)))
+
+        hashlife.advance(3)
+        hashlife.advance(3)
+        statistics = hashlife.get_statistics()
+
+        self.assertLessEqual(statistics["cached_results"], 50)
+        self.assertGreater(statistics["hits"], 0)
+        self.assertAlmostEqual(
+            statistics["hit_rate"],
+            statistics["hits"] / (statistics["hits"] + statistics["misses"]),
+        )
+        self.assertGreater(statistics["memory"], 0)
+
+    def test_collect_garbage(self):
+        """
+        Este metodo testea que la eliminacion de macroceldas no cambie el
+        patron
+        """
+        configuration = np.random.default_rng(3).integers(0, 2, (16, 16))
+
+        reference = HashLife(BSNotationRule([3], [2, 3]))
+        reference.set_states(configuration)
+        hashlife = HashLife(BSNotationRule([3], [2, 3]), max_nodes=100)
+        hashlife.set_states(configuration)
+
+        for _ in range(4):
+            reference.advance(3)
+            hashlife.advance(3)
+
+        self.assertLess(len(hashlife.nodes), len(reference.nodes))
+        self.assertTrue(
+            np.array_equal(
+                reference.get_region(-40, -40, 100, 100),
+                hashlife.get_region(-40, -40, 100, 100),
+            )
+        )
+
+    def test_collect_garbage_with_large_root(self):
+        """
+        Este metodo testea que advance termine cuando las macroceldas de la
+        raiz superan por si solas max_nodes, y que el patron no cambie
+        """
+        configuration = np.random.default_rng(4).integers(0, 2, (32, 32))
+
+        reference = HashLife(BSNotationRule([3], [2, 3]))
+        reference.set_states(configuration)
+        hashlife = HashLife(BSNotationRule([3], [2, 3]), max_nodes=50)
+        hashlife.set_states(configuration)
+        self.assertGreater(len(hashlife.nodes), 50)
+
+        for _ in range(3):
+            reference.advance(3)
+            hashlife.advance(3)
+
+        self.assertTrue(
+            np.array_equal(
+                reference.get_region(-60, -60, 160, 160),
+                hashlife.get_region(-60, -60, 160, 160),
+            )
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
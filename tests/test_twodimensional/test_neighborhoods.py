@@ -7,9 +7,13 @@ import unittest
 
 import numpy as np
 
+from pycellslib.errors import InvalidParameterError
 from pycellslib.twodimensional.neighborhoods import (
+    CircularNeighborhood,
+    L2Neighborhood,
     MooreNeighborhood,
     NeumannNeighborhood,
+    WeightedNeighborhood,
 )
 
 
@@ -64,21 +68,50 @@ class TestCircularNeighborhood(unittest.TestCase):
         """
         Este metodo testea el metodo get_mask con radio 1
         """
+        neighborhood = CircularNeighborhood(1, inclusive=False)
+        mask = np.array([[1, 1, 1], [1, 0, 1], [1, 1, 1]], dtype=bool)
+
+        self.assertTrue(np.array_equal(neighborhood.get_mask(), mask))
 
     def test_get_mask_case_2(self):
         """
         Este metodo testea el metodo get_mask con radio 4
         """
+        neighborhood = CircularNeighborhood(4, inclusive=True)
+        mask = np.array(
+            [
+                [0, 0, 1, 1, 1, 1, 1, 0, 0],
+                [0, 1, 1, 1, 1, 1, 1, 1, 0],
+                [1, 1, 1, 1, 1, 1, 1, 1, 1],
+                [1, 1, 1, 1, 1, 1, 1, 1, 1],
+                [1, 1, 1, 1, 1, 1, 1, 1, 1],
+                [1, 1, 1, 1, 1, 1, 1, 1, 1],
+                [1, 1, 1, 1, 1, 1, 1, 1, 1],
+                [0, 1, 1, 1, 1, 1, 1, 1, 0],
+                [0, 0, 1, 1, 1, 1, 1, 0, 0],
+            ],
+            dtype=bool,
+        )
+
+        self.assertTrue(np.array_equal(neighborhood.get_mask(), mask))
 
     def test_get_offset_case_1(self):
         """
         Este metodo testea el metodo get_offset con radio 1
         """
+        neighborhood = CircularNeighborhood(1)
+        offset = (-1, -1)
+
+        self.assertEqual(neighborhood.get_offset(), offset)
 
     def test_get_offset_case_2(self):
         """
         Este metodo testea el metodo get_offset con radio 4
         """
+        neighborhood = CircularNeighborhood(4)
+        offset = (-4, -4)
+
+        self.assertEqual(neighborhood.get_offset(), offset)
 
 
 class TestL2Neighborhood(unittest.TestCase):
@@ -90,21 +123,50 @@ class TestL2Neighborhood(unittest.TestCase):
         """
         Este metodo testea el metodo get_mask con radio 1
         """
+        neighborhood = L2Neighborhood(1, inclusive=False)
+        mask = np.array([[0, 1, 0], [1, 0, 1], [0, 1, 0]], dtype=bool)
+
+        self.assertTrue(np.array_equal(neighborhood.get_mask(), mask))
 
     def test_get_mask_case_2(self):
         """
         Este metodo testea el metodo get_mask con radio 4
         """
+        neighborhood = L2Neighborhood(4, inclusive=True)
+        mask = np.array(
+            [
+                [0, 0, 0, 0, 1, 0, 0, 0, 0],
+                [0, 0, 1, 1, 1, 1, 1, 0, 0],
+                [0, 1, 1, 1, 1, 1, 1, 1, 0],
+                [0, 1, 1, 1, 1, 1, 1, 1, 0],
+                [1, 1, 1, 1, 1, 1, 1, 1, 1],
+                [0, 1, 1, 1, 1, 1, 1, 1, 0],
+                [0, 1, 1, 1, 1, 1, 1, 1, 0],
+                [0, 0, 1, 1, 1, 1, 1, 0, 0],
+                [0, 0, 0, 0, 1, 0, 0, 0, 0],
+            ],
+            dtype=bool,
+        )
+
+        self.assertTrue(np.array_equal(neighborhood.get_mask(), mask))
 
     def test_get_offset_case_1(self):
         """
         Este metodo testea el metodo get_offset con radio 1
         """
+        neighborhood = L2Neighborhood(1)
+        offset = (-1, -1)
+
+        self.assertEqual(neighborhood.get_offset(), offset)
 
     def test_get_offset_case_2(self):
         """
         Este metodo testea el metodo get_offset con radio 4
         """
+        neighborhood = L2Neighborhood(4)
+        offset = (-4, -4)
+
+        self.assertEqual(neighborhood.get_offset(), offset)
 
 
 class TestNeumannNeighborhood(unittest.TestCase):
@@ -178,3 +240,48 @@ class TestNeumannNeighborhood(unittest.TestCase):
         offset = (-4, -4)
 
         self.assertEqual(neighborhood.get_offset(), offset)
+
+
+class TestWeightedNeighborhood(unittest.TestCase):
+    """
+    Test para la clase WeightedNeighborhood
+    """
+
+    def test_get_mask_and_get_weights(self):
+        """
+        Este metodo testea que la mascara sean los pesos distintos de 0 mas
+        la celula del centro
+        """
+        weights = np.array([[0.5, 0, 0.5], [1, 0, 1], [0, 2, 0]])
+        neighborhood = WeightedNeighborhood(weights)
+        mask = np.array([[1, 0, 1], [1, 1, 1], [0, 1, 0]], dtype=bool)
+
+        self.assertTrue(np.array_equal(neighborhood.get_mask(), mask))
+        self.assertTrue(np.array_equal(neighborhood.get_weights(), weights))
+        self.assertEqual(neighborhood.get_offset(), (-1, -1))
+
+        neighborhood = WeightedNeighborhood(np.ones((3, 5), dtype=bool))
+        self.assertEqual(neighborhood.get_weights().dtype, int)
+        self.assertEqual(neighborhood.get_offset(), (-1, -2))
+
+    def test_default_weights(self):
+        """
+        Este metodo testea que los pesos de las vecindades sin pesos sean la
+        mascara
+        """
+        neighborhood = NeumannNeighborhood(2, inclusive=False)
+
+        self.assertTrue(
+            np.array_equal(neighborhood.get_weights(), neighborhood.get_mask())
+        )
+
+    def test_invalid_weights(self):
+        """
+        Este metodo testea que los pesos deban ser un arreglo bidimensional
+        con dimensiones impares
+        """
+        with self.assertRaises(InvalidParameterError):
+            WeightedNeighborhood(np.ones((2, 3)))
+
+        with self.assertRaises(InvalidParameterError):
+            WeightedNeighborhood(np.ones(3))
@@ -6,8 +6,24 @@ import unittest
 
 import numpy as np
 
-from pycellslib.twodimensional.neighborhoods import MooreNeighborhood
-from pycellslib.twodimensional.rules import BSNotationRule
+from pycellslib.errors import InvalidParameterError
+from pycellslib.twodimensional.neighborhoods import (
+    CircularNeighborhood,
+    L2Neighborhood,
+    LeniaNeighborhood,
+    MooreNeighborhood,
+    NeumannNeighborhood,
+)
+from pycellslib.twodimensional.rules import (
+    BriansBrainRule,
+    BSNotationRule,
+    CyclicRule,
+    GenerationsRule,
+    LeniaRule,
+    OuterTotalisticRule,
+    WeightedSumRule,
+    WireworldRule,
+)
 
 
 class TestBSNotationRule(unittest.TestCase):
@@ -248,3 +264,204 @@ class TestBSNotationRule(unittest.TestCase):
         neighborhoods = np.array([0, 0, 0, 0, 1, 0, 1, 0, 0], dtype=int)
         state, _ = rule.apply_rule(neighborhoods, None)
         self.assertEqual(state, 0)
+
+
+class TestLargerThanLife(unittest.TestCase):
+    """
+    Tests de las reglas BSNotationRule con vecindades grandes
+    """
+
+    def test_from_larger_than_life(self):
+        """
+        Este metodo testea la creacion de reglas a partir de la notacion
+        Larger than Life
+        """
+        rule = BSNotationRule.from_larger_than_life("R5,C0,M1,S34..58,B34..45,NM")
+        self.assertEqual(rule.radius, 5)
+        self.assertEqual(rule.S, list(range(33, 58)))
+        self.assertEqual(rule.B, list(range(34, 46)))
+        self.assertIsInstance(rule.get_neighborhood(), MooreNeighborhood)
+
+        rule = BSNotationRule.from_larger_than_life("R2,C2,M0,S3..5,B4..4,NN")
+        self.assertEqual(rule.S, [3, 4, 5])
+        self.assertEqual(rule.B, [4])
+        self.assertIsInstance(rule.get_neighborhood(), NeumannNeighborhood)
+
+        rule = BSNotationRule.from_larger_than_life("R7,C0,M1,S65..94,B75..86,NC")
+        self.assertIsInstance(rule.get_neighborhood(), CircularNeighborhood)
+
+        rule = BSNotationRule.from_larger_than_life("R7,C0,M1,S65..94,B75..86,N2")
+        self.assertIsInstance(rule.get_neighborhood(), L2Neighborhood)
+
+        for notation in ("C0,M1,S34..58,B34..45", "R5,C3,S1..2,B1..2", "R5,S1,B2"):
+            with self.assertRaises(InvalidParameterError):
+                BSNotationRule.from_larger_than_life(notation)
+
+    def test_neumann_neighborhood(self):
+        """
+        Este metodo testea el metodo apply_rule con la vecindad de Neumann
+        """
+        rule = BSNotationRule([2], [1], neighborhood="neumann")
+
+        neighborhoods = np.array([1, 0, 0, 1, 0], dtype=int)
+        state, _ = rule.apply_rule(neighborhoods, None)
+        self.assertEqual(state, 1)
+
+        neighborhoods = np.array([1, 0, 1, 1, 0], dtype=int)
+        state, _ = rule.apply_rule(neighborhoods, None)
+        self.assertEqual(state, 0)
+
+        with self.assertRaises(InvalidParameterError):
+            BSNotationRule([2], [1], neighborhood="hexagonal")
+
+
+class TestWeightedSumRule(unittest.TestCase):
+    """
+    Tests para la clase WeightedSumRule
+    """
+
+    def test_apply_rule(self):
+        """
+        Este metodo testea el metodo apply_rule con un nucleo cuyo centro
+        tiene peso 0
+        """
+        weights = np.array([[0, 2, 0], [1, 0, 1], [0, 0.5, 0]])
+        rule = WeightedSumRule(weights, lambda states, sums: states + sums)
+
+        # la vecindad son los pesos distintos de 0 y la celula del centro
+        state, _ = rule.apply_rule(np.array([1, 1, 3, 0, 2]), None)
+        self.assertEqual(state, 3 + 2 + 1 + 0 + 1)
+
+    def test_invalid_neighborhood(self):
+        """
+        Este metodo testea que la vecindad deba incluir a la celula
+        """
+        with self.assertRaises(InvalidParameterError):
+            WeightedSumRule(NeumannNeighborhood(1, inclusive=False), np.add)
+
+
+class TestLeniaRule(unittest.TestCase):
+    """
+    Tests para la clase LeniaRule
+    """
+
+    def test_kernel(self):
+        """
+        Este metodo testea que el nucleo este normalizado y tenga su maximo
+        en la mitad del radio
+        """
+        weights = LeniaNeighborhood(10).get_weights()
+
+        self.assertAlmostEqual(weights.sum(), 1)
+        self.assertEqual(weights[10, 10], 0)
+        self.assertEqual(weights[10, 15], weights.max())
+
+        weights = LeniaNeighborhood(10, peaks=(0.5, 1)).get_weights()
+        self.assertGreater(weights[10, 17], weights[10, 12])
+
+    def test_apply_rule(self):
+        """
+        Este metodo testea el metodo apply_rule, una celula cuyo potencial es
+        mu crece dt, y el valor se mantiene entre 0 y 1
+        """
+        rule = LeniaRule(2, mu=0.5, dt=0.25)
+        neighbors = np.count_nonzero(rule.get_neighborhood().get_mask())
+
+        attributes = np.full((neighbors, 1), 0.5)
+        state, new_attributes = rule.apply_rule(
+            np.zeros(neighbors, dtype=int), attributes
+        )
+        self.assertEqual(state, 0)
+        self.assertAlmostEqual(new_attributes[0], 0.75)
+
+        attributes = np.full((neighbors, 1), 1.0)
+        _, new_attributes = rule.apply_rule(np.zeros(neighbors, dtype=int), attributes)
+        self.assertAlmostEqual(new_attributes[0], 0.75)
+
+        attributes = np.full((neighbors, 1), 0.0)
+        _, new_attributes = rule.apply_rule(np.zeros(neighbors, dtype=int), attributes)
+        self.assertEqual(new_attributes[0], 0)
+
+        with self.assertRaises(InvalidParameterError):
+            LeniaRule(dtype=int)
+
+
+class TestOuterTotalisticRule(unittest.TestCase):
+    """
+    Tests para la clase OuterTotalisticRule y sus familias de reglas
+    """
+
+    def test_table(self):
+        """
+        Este metodo testea la creacion de la tabla de transicion y la
+        validacion de sus dimensiones
+        """
+        rule = OuterTotalisticRule([1, 1], lambda state, count: count % 2)
+        self.assertIsInstance(rule.get_neighborhood(), MooreNeighborhood)
+        self.assertEqual(rule.table.shape, (2, 9))
+
+        rule = CyclicRule(4)
+        self.assertIsInstance(rule.get_neighborhood(), NeumannNeighborhood)
+        self.assertTrue(np.array_equal(rule.firing, [1, 2, 3, 0]))
+        self.assertEqual(rule.table.shape, (4, 5))
+
+        with self.assertRaises(InvalidParameterError):
+            OuterTotalisticRule([1, 1], np.zeros((2, 5)))
+
+        with self.assertRaises(InvalidParameterError):
+            OuterTotalisticRule([1, 1], np.zeros((2, 9)), neighborhood="hexagonal")
+
+    def test_generations(self):
+        """
+        Este metodo testea el metodo apply_rule de Brian's Brain
+        """
+        rule = BriansBrainRule()
+
+        # nace con 2 vecinos vivos, las celulas que estan muriendo no cuentan
+        neighborhoods = np.array([1, 0, 2, 0, 0, 2, 1, 0, 0], dtype=int)
+        state, _ = rule.apply_rule(neighborhoods, None)
+        self.assertEqual(state, 1)
+
+        # las celulas vivas nunca sobreviven
+        neighborhoods = np.array([1, 0, 0, 0, 1, 0, 1, 0, 0], dtype=int)
+        state, _ = rule.apply_rule(neighborhoods, None)
+        self.assertEqual(state, 2)
+
+        neighborhoods = np.array([1, 0, 0, 0, 2, 0, 1, 0, 0], dtype=int)
+        state, _ = rule.apply_rule(neighborhoods, None)
+        self.assertEqual(state, 0)
+
+    def test_from_notation(self):
+        """
+        Este metodo testea la creacion de reglas a partir de la notacion
+        B/S/C
+        """
+        rule = GenerationsRule.from_notation("B2/S/C3")
+        self.assertTrue(np.array_equal(rule.table, BriansBrainRule().table))
+
+        rule = GenerationsRule.from_notation("b3/s23/c2")
+        self.assertEqual((rule.B, rule.S, rule.C), ([3], [2, 3], 2))
+
+        for notation in ("B3/S23", "B3/S2a/C4", "S23/B3/C2", "B3/S23/C"):
+            with self.assertRaises(InvalidParameterError):
+                GenerationsRule.from_notation(notation)
+
+    def test_wireworld(self):
+        """
+        Este metodo testea el metodo apply_rule de Wireworld
+        """
+        rule = WireworldRule()
+
+        for center, heads, expected in (
+            (0, 2, 0),
+            (1, 0, 2),
+            (2, 0, 3),
+            (3, 0, 3),
+            (3, 1, 1),
+            (3, 2, 1),
+            (3, 3, 3),
+        ):
+            neighborhoods = np.array([1] * heads + [3] * (8 - heads), dtype=int)
+            neighborhoods = np.insert(neighborhoods, 4, center)
+            state, _ = rule.apply_rule(neighborhoods, None)
+            self.assertEqual(state, expected)
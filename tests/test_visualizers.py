@@ -0,0 +1,35 @@
+"""
+En este script se testean las funciones de los visualizadores que no
+requieren una ventana
+"""
+
+import unittest
+
+import numpy as np
+
+try:
+    from pycellslib.visualizers.matplotlib_visualizer import get_image
+except ImportError:
+    get_image = None
+
+
+@unittest.skipIf(get_image is None, "matplotlib no esta instalado")
+class TestMatplotlibVisualizer(unittest.TestCase):
+    """
+    Tests para las funciones de matplotlib_visualizer
+    """
+
+    def test_get_image(self):
+        """
+        Este metodo testea que los estados almacenados en uint8 se escalen sin
+        dar la vuelta, con mas de 2 estados y sin celulas vivas
+        """
+        states = np.array([[0, 1, 2, 3]], dtype=np.uint8)
+        self.assertTrue(np.allclose(get_image(states), [[0, 85, 170, 255]]))
+
+        states = np.zeros((3, 3), dtype=np.uint8)
+        self.assertTrue(np.array_equal(get_image(states), np.zeros((3, 3))))
+
+
+if __name__ == "__main__":
+    unittest.main()